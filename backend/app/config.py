@@ -18,6 +18,13 @@ AUTHORIZATION_ENDPOINT = os.getenv("OAUTH_AUTHORIZATION_ENDPOINT", "https://conn
 TOKEN_ENDPOINT = os.getenv("OAUTH_TOKEN_ENDPOINT", "https://connect.linux.do/oauth2/token")
 USER_ENDPOINT = os.getenv("OAUTH_USER_ENDPOINT", "https://connect.linux.do/api/user")
 
+# OAuth 出站请求（应用级共享连接池）
+OAUTH_HTTP2 = os.getenv("OAUTH_HTTP2", "true").lower() in ("true", "1", "yes")
+OAUTH_CONNECT_TIMEOUT = float(os.getenv("OAUTH_CONNECT_TIMEOUT", "5"))
+OAUTH_READ_TIMEOUT = float(os.getenv("OAUTH_READ_TIMEOUT", "10"))
+OAUTH_MAX_CONNECTIONS = int(os.getenv("OAUTH_MAX_CONNECTIONS", "20"))
+OAUTH_MAX_CONCURRENCY = int(os.getenv("OAUTH_MAX_CONCURRENCY", "50"))  # 同时进行的出站请求数，超出的请求排队
+
 # CORS配置
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",") if os.getenv("ALLOWED_ORIGINS") else [
     "http://localhost:3000",
@@ -30,6 +37,64 @@ ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",") if os.getenv("ALL
 # Mock登录开关（仅用于开发环境，生产环境必须关闭）
 ENABLE_MOCK_LOGIN = os.getenv("ENABLE_MOCK_LOGIN", "false").lower() in ("true", "1", "yes")
 
+# 排行榜内存索引开关（关闭后排行榜直接查询数据库）
+ENABLE_LEADERBOARD_INDEX = os.getenv("ENABLE_LEADERBOARD_INDEX", "true").lower() in ("true", "1", "yes")
+
+# CPU 型号统计内存索引开关（关闭后 /cpu-stats 直接查询 cpu_model_stats 表），与排行榜索引相互独立
+ENABLE_CPU_STATS_INDEX = os.getenv("ENABLE_CPU_STATS_INDEX", "true").lower() in ("true", "1", "yes")
+
+# 排行榜响应缓存容量（缓存的页面数，0 表示关闭）
+LEADERBOARD_CACHE_SIZE = int(os.getenv("LEADERBOARD_CACHE_SIZE", "256"))
+
+# 排行榜快照进程内调度（多进程部署时只应在一个实例上开启，或改用命令行定时执行）
+ENABLE_SNAPSHOT_SCHEDULER = os.getenv("ENABLE_SNAPSHOT_SCHEDULER", "false").lower() in ("true", "1", "yes")
+SNAPSHOT_HOUR = int(os.getenv("SNAPSHOT_HOUR", "0"))  # 每天执行的时刻（UTC）
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "90"))
+
+# 认证用户缓存（进程内，TTL 秒数为 0 表示关闭；多进程部署时资料更新最多延迟一个 TTL 生效）
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+# 排行榜实时推送（SSE）：合并窗口秒数、每个连接的待发送队列长度、最大连接数、心跳间隔
+LEADERBOARD_STREAM_COALESCE_SECONDS = float(os.getenv("LEADERBOARD_STREAM_COALESCE_SECONDS", "0.5"))
+LEADERBOARD_STREAM_QUEUE_SIZE = int(os.getenv("LEADERBOARD_STREAM_QUEUE_SIZE", "32"))
+LEADERBOARD_STREAM_MAX_CLIENTS = int(os.getenv("LEADERBOARD_STREAM_MAX_CLIENTS", "1000"))
+LEADERBOARD_STREAM_HEARTBEAT_SECONDS = float(os.getenv("LEADERBOARD_STREAM_HEARTBEAT_SECONDS", "15"))
+
+# 响应压缩：JSON 响应体达到该字节数才压缩；gzip 压缩级别与 brotli 压缩质量（动态压缩取较低值）
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# system_config 配置缓存的版本检查间隔（秒）
+SETTINGS_REFRESH_SECONDS = float(os.getenv("SETTINGS_REFRESH_SECONDS", "30"))
+
+# 排行榜数据版本检查间隔（秒）：其他 worker 或批量任务写入后，本进程的排行榜与 CPU 型号统计索引最多延迟该时间同步
+DATA_VERSION_REFRESH_SECONDS = float(os.getenv("DATA_VERSION_REFRESH_SECONDS", "5"))
+
+# 数据变更日志（data_changes）保留秒数：落后超过该时间的 worker 无法增量同步，改为全量重新加载
+DATA_CHANGE_RETENTION_SECONDS = float(os.getenv("DATA_CHANGE_RETENTION_SECONDS", "3600"))
+
+# 一次增量同步最多重新读取的记录数，超过时（如批量任务大量写入）全量重新加载
+DATA_CHANGE_MAX_RECORDS = int(os.getenv("DATA_CHANGE_MAX_RECORDS", "20000"))
+
+# Prometheus 指标（/metrics）；gunicorn 多进程时指标文件写入 PROMETHEUS_MULTIPROC_DIR（见 gunicorn.conf.py）
+ENABLE_METRICS = os.getenv("ENABLE_METRICS", "true").lower() in ("true", "1", "yes")
+
+# 慢查询日志（默认关闭）：超过阈值毫秒数的 SQL 连同参数、路由记入进程内环形缓冲区，后台线程执行 EXPLAIN
+ENABLE_SLOW_QUERY_LOG = os.getenv("ENABLE_SLOW_QUERY_LOG", "false").lower() in ("true", "1", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+
+# 调试：响应头 X-Query-Count 返回每个请求执行的 SQL 语句数（生产环境请关闭）
+DEBUG_QUERY_COUNT = os.getenv("DEBUG_QUERY_COUNT", "false").lower() in ("true", "1", "yes")
+
+# 管理员用户名（逗号分隔，linux.do 用户名），可访问 /api/v1/admin 下的接口
+ADMIN_USERNAMES = frozenset(name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip())
+
+# Phase 1 每次运行测试的密钥总数（用于计算吞吐量，须与基准测试程序的固定工作量一致）
+PHASE1_TOTAL_KEYS = int(os.getenv("PHASE1_TOTAL_KEYS", str(2 ** 24)))
+
 # 前端URL获取函数
 def get_frontend_url():
     """获取前端URL
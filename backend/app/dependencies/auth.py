@@ -1,16 +1,33 @@
 # -*- coding: utf-8 -*-
 """
 认证依赖注入 - 使用 ORM
+
+- get_current_user_from_token: 需要用户资料（用户名、头像等）的路由使用，命中用户缓存时不查询数据库
+- get_token_user: 只需要用户 ID 的路由使用，仅校验 JWT，不访问数据库
+- get_admin_user: 管理接口使用，要求用户名在 ADMIN_USERNAMES 中
 """
+from dataclasses import dataclass
+from typing import Optional
+
 from fastapi import HTTPException, status, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.jwt_utils import verify_token
-from app.dependencies.database import get_db
+from app.dependencies.database import get_async_db
 from app.models import User
+from app.services.user_cache import user_cache, CachedUser
+from app.config import ADMIN_USERNAMES
 
 
-def get_current_user_from_token(request: Request, db: Session = Depends(get_db)):
-    """从请求中获取当前用户"""
+@dataclass(frozen=True)
+class TokenUser:
+    """JWT 声明中的用户身份"""
+    id: int
+    username: Optional[str]
+
+
+def _get_token_payload(request: Request) -> dict:
+    """从请求中取出并校验 JWT，返回包含 user_id 的声明"""
     # 首先尝试从cookie获取token
     token = request.cookies.get("auth_token")
 
@@ -34,26 +51,53 @@ def get_current_user_from_token(request: Request, db: Session = Depends(get_db))
             detail="无效的认证令牌"
         )
 
-    user_id = payload.get("user_id")
-    if not user_id:
+    if not payload.get("user_id"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="令牌中缺少用户信息"
         )
 
-    # 从数据库获取用户信息 - 使用 ORM
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
+    return payload
+
+
+async def get_token_user(request: Request) -> TokenUser:
+    """只根据 JWT 声明获取当前用户（不查询数据库）"""
+    payload = _get_token_payload(request)
+    return TokenUser(id=int(payload["user_id"]), username=payload.get("username"))
+
+
+async def get_current_user_from_token(request: Request, db: AsyncSession = Depends(get_async_db)) -> CachedUser:
+    """从请求中获取当前用户"""
+    user_id = int(_get_token_payload(request)["user_id"])
 
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="用户不存在"
-            )
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
 
-        return user
-    except Exception as e:
+    # 从数据库获取用户信息 - 使用 ORM
+    generation = user_cache.generation
+    try:
+        user = await db.get(User, user_id)
+    except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"数据库错误: {str(e)}"
         )
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="用户不存在"
+        )
+
+    return user_cache.put(user, generation)
+
+
+async def get_admin_user(current_user: CachedUser = Depends(get_current_user_from_token)) -> CachedUser:
+    """要求当前用户为管理员"""
+    if current_user.username not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要管理员权限"
+        )
+    return current_user
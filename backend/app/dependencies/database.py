@@ -1,14 +1,28 @@
 # -*- coding: utf-8 -*-
 """
 数据库连接依赖 - 使用 SQLAlchemy 连接池
+
+同时提供同步引擎（脚本、后台任务使用）和异步引擎（路由使用）：
+- MySQL: 同步使用 pymysql，异步使用 aiomysql
+- SQLite: 同步使用 sqlite3，异步使用 aiosqlite（仅用于本地测试）
+
+引擎在导入本模块时创建。多进程部署（gunicorn.conf.py）不预加载应用，每个 worker 在 fork
+之后才导入本模块，各自创建引擎和连接池，不会共享父进程的连接。
+设置 DB_POOL_BUDGET 后按 worker 数（WEB_CONCURRENCY）平分连接总预算，见 pool_limits()。
+ENABLE_METRICS 开启时为两个引擎注册查询耗时与连接池指标（app/services/metrics.py），
+ENABLE_SLOW_QUERY_LOG 开启时注册慢查询日志（app/services/slow_query_log.py），
+DEBUG_QUERY_COUNT 开启时注册请求级 SQL 计数（app/services/query_counter.py）。
 """
 import os
 import re
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import AsyncGenerator, Generator, Optional, Tuple
+from sqlalchemy import create_engine, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 
+from app.config import ENABLE_METRICS, ENABLE_SLOW_QUERY_LOG, DEBUG_QUERY_COUNT
+
 # 数据库配置 - 从环境变量读取
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -24,24 +38,85 @@ if not DATABASE_URL:
 if DATABASE_URL and DATABASE_URL.startswith("mysql://"):
     DATABASE_URL = DATABASE_URL.replace("mysql://", "mysql+pymysql://", 1)
 
-# 创建数据库引擎（带连接池）
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=10,              # 连接池大小
-    max_overflow=20,           # 超过pool_size后最多创建的连接数
-    pool_timeout=30,           # 获取连接的超时时间
-    pool_recycle=3600,         # 连接回收时间（秒）
-    pool_pre_ping=True,        # 连接前检查连接是否有效
-    echo=False,                # 不打印SQL语句（生产环境）
-    connect_args={
-        'charset': 'utf8mb4'
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# 数据库连接总预算：所有 worker 进程的连接数之和上限（0 为不限制，每个进程使用默认连接池大小）
+DB_POOL_BUDGET = int(os.getenv("DB_POOL_BUDGET", "0"))
+# worker 进程数（gunicorn.conf.py 启动时写入环境变量）
+WEB_CONCURRENCY = max(int(os.getenv("WEB_CONCURRENCY") or "1"), 1)
+
+# 同步引擎在服务进程中只用于启动检查和快照等后台任务，设置预算时只保留 2 个连接
+SYNC_POOL_LIMITS = (1, 1)
+
+# 异步驱动：pymysql -> aiomysql，sqlite -> aiosqlite
+ASYNC_DATABASE_URL = re.sub(r"^mysql\+pymysql://", "mysql+aiomysql://", DATABASE_URL)
+ASYNC_DATABASE_URL = re.sub(r"^sqlite(\+pysqlite)?://", "sqlite+aiosqlite://", ASYNC_DATABASE_URL)
+
+
+def pool_limits(budget: int, workers: int) -> Tuple[int, int]:
+    """
+    按连接总预算计算每个 worker 异步引擎的 (pool_size, max_overflow)
+
+    每个 worker 分得 budget // workers 个连接，扣除同步引擎的连接后，一半常驻连接池，
+    其余作为溢出连接；预算过小时每个 worker 至少保留 1 + 1 个连接。
+    """
+    per_worker = max(budget // workers - sum(SYNC_POOL_LIMITS), 2)
+    pool_size = per_worker // 2
+    return pool_size, per_worker - pool_size
+
+
+def _engine_options(limits: Tuple[int, int], **pool_options) -> dict:
+    """连接池参数（SQLite 使用驱动默认连接池）"""
+    if IS_SQLITE:
+        return {"echo": False}
+    pool_size, max_overflow = limits
+    return {
+        **pool_options,
+        "pool_size": pool_size,         # 连接池大小
+        "max_overflow": max_overflow,   # 超过pool_size后最多创建的连接数
+        "pool_timeout": 30,           # 获取连接的超时时间
+        "pool_recycle": 3600,         # 连接回收时间（秒）
+        "pool_pre_ping": True,        # 连接前检查连接是否有效
+        "echo": False,                # 不打印SQL语句（生产环境）
+        "connect_args": {
+            'charset': 'utf8mb4'
+        }
     }
-)
+
+
+# 连接池大小：未设置预算时沿用默认值（10 + 20 溢出）
+if DB_POOL_BUDGET > 0:
+    SYNC_LIMITS, ASYNC_LIMITS = SYNC_POOL_LIMITS, pool_limits(DB_POOL_BUDGET, WEB_CONCURRENCY)
+else:
+    SYNC_LIMITS = ASYNC_LIMITS = (10, 20)
+
+# 创建数据库引擎（带连接池）
+engine = create_engine(DATABASE_URL, **_engine_options(SYNC_LIMITS, poolclass=QueuePool))
+
+# 创建异步数据库引擎（路由处理函数使用，不阻塞事件循环）
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_LIMITS))
+
+if ENABLE_METRICS:
+    from app.services.metrics import instrument_engine
+    instrument_engine(engine, "sync")
+    instrument_engine(async_engine.sync_engine, "async")
+
+if ENABLE_SLOW_QUERY_LOG:
+    from app.services.slow_query_log import slow_query_log
+    # 执行计划由后台线程通过同步引擎获取，不占用请求的连接
+    slow_query_log.install([engine, async_engine.sync_engine], explain_engine=engine)
+
+if DEBUG_QUERY_COUNT:
+    from app.services import query_counter
+    query_counter.install([engine, async_engine.sync_engine])
 
 # 创建 Session 工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 创建 AsyncSession 工厂
+# expire_on_commit=False：提交后仍可访问已加载属性，避免在异步上下文中触发隐式懒加载
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -58,3 +133,33 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    依赖注入：获取异步数据库会话
+
+    使用方法:
+        @app.get("/items")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def increment_returning(db: AsyncSession, statement, column, delta: int, **values) -> Optional[int]:
+    """
+    执行 column 加 delta 的 UPDATE（statement 的条件至多命中一行），一次往返取回更新后的值；未命中时返回 None
+
+    MySQL 用 LAST_INSERT_ID(expr) 把新值写入 OK 包的 insert_id（即结果的 lastrowid），
+    SQLite 用 UPDATE ... RETURNING；是否命中取 UPDATE 的 rowcount。values 为同时更新的其他列。
+    """
+    new_value = column + delta
+    if db.get_bind().dialect.name == "mysql":
+        result = await db.execute(statement.values({column.key: func.last_insert_id(new_value), **values}))
+        return result.lastrowid if result.rowcount else None
+
+    result = await db.execute(statement.values({column.key: new_value, **values}).returning(column))
+    return result.scalar()
@@ -12,10 +12,10 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 
 
-def create_jwt_token(data: dict) -> str:
+def create_jwt_token(data: dict, expire_hours: float = 24) -> str:
     """创建标准JWT令牌"""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(hours=24)
+    expire = datetime.now(timezone.utc) + timedelta(hours=expire_hours)
     to_encode.update({"exp": expire})
 
     # 使用python-jose创建标准JWT token
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+数据库版本化迁移
+
+迁移脚本位于 backend/migrations，文件名为 V<版本号>__<说明>.sql，按版本号顺序执行。
+已执行的版本记录在 schema_migrations 表中，每次启动只执行尚未执行的版本。
+
+- 脚本按完整的 SQL 词法切分语句（引号、注释、DELIMITER 块），不会被字符串或存储过程中的分号截断
+- MySQL 的 DDL 会隐式提交，迁移失败时已执行的语句不会回滚：修复后需手动补齐该版本剩余的语句，
+  再用 stamp 标记该版本
+- 升级前没有 schema_migrations 表的旧库，按表结构推断已执行到的版本（见 _BASELINE_PROBES）
+
+使用方法（在 backend 目录下）:
+    python -m app.dependencies.migrations status
+    python -m app.dependencies.migrations upgrade
+    python -m app.dependencies.migrations stamp 4
+"""
+import argparse
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "migrations")
+
+VERSION_TABLE = "schema_migrations"
+
+_FILE_PATTERN = re.compile(r"^V(\d+)__(\w+)\.sql$")
+_DELIMITER_PATTERN = re.compile(r"^\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """单个迁移脚本"""
+    version: int
+    name: str
+    path: str
+
+    def statements(self) -> List[str]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            return split_sql(f.read())
+
+
+def load_migrations(migrations_dir: str = MIGRATIONS_DIR) -> List[Migration]:
+    """按版本号顺序读取迁移脚本"""
+    migrations = {}
+    for filename in os.listdir(migrations_dir):
+        match = _FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"迁移版本号重复: V{version}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(migrations_dir, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_sql(script: str) -> List[str]:
+    """
+    把 SQL 脚本切分为单条语句
+
+    识别单/双/反引号字符串、-- 与 # 行注释、/* */ 块注释，以及 mysql 客户端的
+    DELIMITER 指令（存储过程体内的分号不会切分语句）。
+    """
+    statements = []
+    current = []
+    delimiter = ";"
+    i = 0
+    length = len(script)
+    at_line_start = True
+
+    while i < length:
+        # DELIMITER 指令只在行首出现，单独占一行
+        if at_line_start:
+            line_end = script.find("\n", i)
+            line_end = length if line_end == -1 else line_end
+            match = _DELIMITER_PATTERN.match(script[i:line_end])
+            if match and not "".join(current).strip():
+                delimiter = match.group(1)
+                current = []
+                i = line_end + 1
+                continue
+
+        char = script[i]
+        at_line_start = char == "\n"
+
+        if char in ("'", '"', "`"):
+            end = i + 1
+            while end < length:
+                if script[end] == "\\" and char != "`":
+                    end += 2
+                    continue
+                if script[end] == char:
+                    # 连续两个引号表示转义
+                    if end + 1 < length and script[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(script[i:end + 1])
+            i = end + 1
+        elif script.startswith("--", i) and (i + 2 >= length or script[i + 2] in " \t\r\n") or char == "#":
+            end = script.find("\n", i)
+            i = length if end == -1 else end
+        elif script.startswith("/*", i):
+            end = script.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+        elif script.startswith(delimiter, i):
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+            i += len(delimiter)
+        else:
+            current.append(char)
+            i += 1
+
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def _has_column(inspector, table: str, column: str) -> bool:
+    return column in {c["name"] for c in inspector.get_columns(table)}
+
+
+def _has_index(inspector, table: str, index: str) -> bool:
+    return index in {i["name"] for i in inspector.get_indexes(table)}
+
+
+# 引入版本化迁移之前手动执行的脚本：版本号 -> 判断该脚本已执行的条件
+_BASELINE_PROBES = {
+    1: lambda inspector: inspector.has_table("users"),
+    2: lambda inspector: _has_column(inspector, "benchmark_results", "device_type"),
+    3: lambda inspector: _has_index(inspector, "leaderboard_snapshots", "uk_snapshot_device_rank"),
+    4: lambda inspector: _has_column(inspector, "benchmark_results", "performance_per_core"),
+}
+
+
+def _ensure_version_table(conn: Connection):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS `{VERSION_TABLE}` ("
+        "`version` INT NOT NULL PRIMARY KEY, "
+        "`name` VARCHAR(255) NOT NULL, "
+        "`applied_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+        ")"
+    ))
+
+
+def _record_version(conn: Connection, migration: Migration):
+    conn.execute(
+        text(f"INSERT INTO `{VERSION_TABLE}` (`version`, `name`) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name}
+    )
+
+
+def _baseline(conn: Connection, migrations: List[Migration]):
+    """为旧库补记已手动执行过的版本"""
+    inspector = inspect(conn)
+    for migration in migrations:
+        probe = _BASELINE_PROBES.get(migration.version)
+        if probe is None or not probe(inspector):
+            break
+        _record_version(conn, migration)
+        print(f"[INFO] 检测到已有表结构，标记迁移 V{migration.version:03d} 为已执行")
+
+
+def applied_versions(conn: Connection, migrations: Optional[List[Migration]] = None) -> List[int]:
+    """查询已执行的版本（首次运行时创建版本表，并为旧库补记版本）"""
+    first_run = not inspect(conn).has_table(VERSION_TABLE)
+    _ensure_version_table(conn)
+    if first_run:
+        _baseline(conn, migrations if migrations is not None else load_migrations())
+    return sorted(row[0] for row in conn.execute(text(f"SELECT `version` FROM `{VERSION_TABLE}`")))
+
+
+def upgrade(engine: Engine, migrations_dir: str = MIGRATIONS_DIR) -> List[int]:
+    """
+    执行全部未执行的迁移
+
+    Returns:
+        List[int]: 本次执行的版本号
+    """
+    migrations = load_migrations(migrations_dir)
+    with engine.begin() as conn:
+        applied = set(applied_versions(conn, migrations))
+
+    executed = []
+    for migration in migrations:
+        if migration.version in applied:
+            continue
+        print(f"[INFO] 执行迁移 V{migration.version:03d}__{migration.name}")
+        with engine.begin() as conn:
+            # 脚本中的 LIKE '%...%' 等原样交给驱动，不做参数格式化
+            raw = conn.execution_options(no_parameters=True)
+            for statement in migration.statements():
+                raw.exec_driver_sql(statement)
+            _record_version(conn, migration)
+        executed.append(migration.version)
+    return executed
+
+
+def stamp(engine: Engine, version: int, migrations_dir: str = MIGRATIONS_DIR) -> List[int]:
+    """不执行脚本，直接把 version 及之前的版本标记为已执行"""
+    migrations = load_migrations(migrations_dir)
+    stamped = []
+    with engine.begin() as conn:
+        applied = set(applied_versions(conn, migrations))
+        for migration in migrations:
+            if migration.version <= version and migration.version not in applied:
+                _record_version(conn, migration)
+                stamped.append(migration.version)
+    return stamped
+
+
+if __name__ == "__main__":
+    from app.dependencies.database import engine
+
+    parser = argparse.ArgumentParser(description="数据库版本化迁移")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="查看迁移状态")
+    subparsers.add_parser("upgrade", help="执行全部未执行的迁移")
+    stamp_parser = subparsers.add_parser("stamp", help="把指定版本及之前的版本标记为已执行")
+    stamp_parser.add_argument("version", type=int)
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        executed = upgrade(engine)
+        print(f"迁移完成: 执行 {len(executed)} 个版本" if executed else "数据库已是最新版本")
+    elif args.command == "stamp":
+        print(f"已标记版本: {stamp(engine, args.version) or '无'}")
+    else:
+        migrations = load_migrations()
+        with engine.begin() as conn:
+            applied = set(applied_versions(conn, migrations))
+        for migration in migrations:
+            state = "已执行" if migration.version in applied else "未执行"
+            print(f"V{migration.version:03d}__{migration.name:<40}{state}")
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+ASGI 中间件
+"""
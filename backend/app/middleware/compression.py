@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+API 响应压缩
+
+对 application/json 响应按客户端的 Accept-Encoding 做 brotli（优先）或 gzip 压缩：
+
+- 只压缩一次性发送的响应体，且长度不小于 COMPRESSION_MIN_SIZE；流式响应（SSE 推送、
+  NDJSON 批量解析）原样转发，避免压缩缓冲导致事件延迟
+- 已带 Content-Encoding 的响应（预压缩的静态文件）不再处理
+- 压缩后的响应把强 ETag 改为弱 ETag（内容编码不同），If-None-Match 比较时两者等价
+
+未安装 brotli 时只使用 gzip。
+"""
+import gzip
+from typing import FrozenSet, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import COMPRESSION_MIN_SIZE, GZIP_COMPRESS_LEVEL, BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:
+    # brotli 为可选依赖
+    brotli = None
+
+# 需要压缩的响应类型
+COMPRESSIBLE_TYPES = ("application/json",)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> FrozenSet[str]:
+    """解析 Accept-Encoding，返回客户端接受的编码（忽略 q=0）"""
+    encodings = set()
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        encodings.add(name)
+    return frozenset(encodings)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """选择响应使用的压缩编码"""
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+
+
+class CompressionMiddleware:
+    """JSON 响应压缩中间件"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size))
+
+
+class _CompressingSender:
+    """缓存响应头，拿到第一段响应体后决定是否压缩（客户端不接受压缩时只补充 Vary）"""
+
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            if media_type in COMPRESSIBLE_TYPES and "content-encoding" not in headers:
+                self.start_message = message
+                return
+        elif message["type"] == "http.response.body" and self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if self.encoding and not message.get("more_body", False) and len(body) >= self.minimum_size:
+                body = compress(body, self.encoding)
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                message = {**message, "body": body}
+
+            await self.send(start_message)
+        await self.send(message)
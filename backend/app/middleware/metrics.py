@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 请求指标
+
+记录每个请求的耗时、状态码和响应体字节数（按路由模板聚合），以及进行中的请求数。
+注册在最外层，耗时包含压缩等全部中间件，响应体大小为实际发送的（压缩后的）字节数。
+"""
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.request_context import route_template
+from app.services.metrics import HTTP_REQUEST_SECONDS, HTTP_RESPONSE_BYTES, HTTP_REQUESTS_IN_FLIGHT
+
+
+class MetricsMiddleware:
+    """请求耗时、响应大小与并发数指标中间件"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sender = _MeasuringSender(send)
+        started = perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, sender)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # 路由匹配后 scope 中才有 route；未返回响应（异常）按 500 记录
+            route = route_template(scope)
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.labels(method, route, str(sender.status)).observe(perf_counter() - started)
+            HTTP_RESPONSE_BYTES.labels(method, route).observe(sender.body_size)
+
+
+class _MeasuringSender:
+    """记录状态码和响应体字节数"""
+
+    def __init__(self, send: Send):
+        self.send = send
+        self.status = 500
+        self.body_size = 0
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            self.body_size += len(message.get("body", b""))
+        await self.send(message)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+请求 SQL 计数（调试用，DEBUG_QUERY_COUNT 开启时注册）
+
+在响应头 X-Query-Count 中返回处理该请求执行的 SQL 语句数。
+响应开始发送之后执行的语句（流式响应）不计入。
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.query_counter import QueryCounter, request_counter, QUERY_COUNT_HEADER
+
+
+class QueryCountMiddleware:
+    """请求 SQL 计数中间件"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = request_counter.set(counter)
+
+        async def send_with_count(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"]).append(QUERY_COUNT_HEADER, str(counter.count))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            request_counter.reset(token)
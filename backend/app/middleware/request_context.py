@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+请求上下文
+
+RequestContextMiddleware 把当前请求的 ASGI scope 放入上下文变量，数据库事件等
+不经过路由参数的代码可以通过 current_route() 取得发起查询的路由模板。
+路由匹配后 FastAPI 把 APIRoute 写入 scope["route"]，取其 path（如 /api/v1/benchmarks/{benchmark_id}），
+不展开路径参数，指标标签的取值数量有限。
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# 不在请求中执行（启动加载、后台任务）
+BACKGROUND_ROUTE = "background"
+# 没有匹配的路由（404）
+UNMATCHED_ROUTE = "unmatched"
+
+request_scope: ContextVar[Optional[Scope]] = ContextVar("request_scope", default=None)
+
+
+def route_template(scope: Scope) -> str:
+    """请求匹配的路由模板"""
+    route = scope.get("route")
+    return route.path if route is not None else UNMATCHED_ROUTE
+
+
+def current_route() -> str:
+    """当前上下文所在请求的路由模板"""
+    scope = request_scope.get()
+    return route_template(scope) if scope is not None else BACKGROUND_ROUTE
+
+
+class RequestContextMiddleware:
+    """在请求处理期间设置 request_scope"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
@@ -7,6 +7,9 @@ from app.models.user import User
 from app.models.benchmark import BenchmarkResult, DeviceType
 from app.models.leaderboard import LeaderboardSnapshot
 from app.models.system_config import SystemConfig
+from app.models.cpu_model import CpuModel
+from app.models.cpu_stats import CpuModelStats
+from app.models.data_version import DataVersion, DataChange
 
 __all__ = [
     'Base',
@@ -14,5 +17,9 @@ __all__ = [
     'BenchmarkResult',
     'DeviceType',
     'LeaderboardSnapshot',
-    'SystemConfig'
+    'SystemConfig',
+    'CpuModel',
+    'CpuModelStats',
+    'DataVersion',
+    'DataChange'
 ]
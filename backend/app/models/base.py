@@ -2,6 +2,14 @@
 """
 ORM 基类
 """
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_sqlite(type_, compiler, **kw):
+    """SQLite 只有 INTEGER PRIMARY KEY 会自增（本地测试使用 SQLite 时需要）"""
+    return "INTEGER"
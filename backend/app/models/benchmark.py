@@ -2,10 +2,11 @@
 """
 基准测试结果模型
 """
-from sqlalchemy import Column, BigInteger, String, Integer, DECIMAL, Text, Boolean, TIMESTAMP, ForeignKey, Enum
+from sqlalchemy import Column, BigInteger, String, Integer, DECIMAL, Text, Boolean, TIMESTAMP, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.models.base import Base
+from app.utils.serialization import RowSerializer
 import enum
 
 
@@ -19,14 +20,28 @@ class DeviceType(str, enum.Enum):
 class BenchmarkResult(Base):
     """基准测试结果表"""
     __tablename__ = 'benchmark_results'
+    __table_args__ = (
+        # 按设备类型筛选后按 (overall_wall_time, id) 排序的排行榜与游标分页
+        Index('idx_device_time', 'device_type', 'overall_wall_time', 'id'),
+        # 用户记录列表与提交数量统计
+        Index('idx_user_submitted', 'user_id', 'submitted_at'),
+        # 按设备类型筛选后按分数排序的排行榜
+        Index('idx_device_score', 'device_type', 'performance_score'),
+        Index('idx_device_per_core', 'device_type', 'performance_per_core'),
+        # 按 (CPU 型号, 设备类型) 分组统计与重新计算最佳耗时（覆盖索引）
+        Index('idx_cpu_model_device', 'cpu_model_id', 'device_type',
+              'overall_wall_time', 'phase1_wall_time', 'phase2_wall_time'),
+    )
 
     # 主键和外键
     id = Column(BigInteger, primary_key=True, autoincrement=True, comment='结果ID')
     user_id = Column(BigInteger, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True, comment='用户ID')
     username = Column(String(100), nullable=False, index=True, comment='用户名（冗余字段）')
+    avatar_url = Column(String(500), nullable=True, comment='用户头像URL（冗余字段，排行榜查询无需关联 users）')
 
     # 系统信息
     cpu_model = Column(String(255), nullable=True, comment='CPU型号')
+    cpu_model_id = Column(Integer, ForeignKey('cpu_models.id'), nullable=True, comment='规范化的CPU型号ID')
     cpu_cores = Column(Integer, nullable=True, comment='逻辑核心数')
     memory_gb = Column(DECIMAL(10, 2), nullable=True, comment='内存大小(GB)')
 
@@ -43,6 +58,7 @@ class BenchmarkResult(Base):
     # 计算得出的性能指标
     throughput_keys_per_sec = Column(BigInteger, nullable=True, comment='Phase 1 吞吐量(密钥/秒)')
     performance_score = Column(DECIMAL(15, 6), nullable=True, index=True, comment='综合性能分数')
+    performance_per_core = Column(DECIMAL(15, 6), nullable=True, index=True, comment='单核性能分数')
 
     # 元数据
     raw_result_text = Column(Text, nullable=True, comment='原始基准测试结果文本')
@@ -63,28 +79,8 @@ class BenchmarkResult(Base):
         return f"<BenchmarkResult(id={self.id}, username='{self.username}', overall_time={self.overall_wall_time})>"
 
     def to_dict(self):
-        """转换为字典"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'username': self.username,
-            'cpu_model': self.cpu_model,
-            'cpu_cores': self.cpu_cores,
-            'memory_gb': float(self.memory_gb) if self.memory_gb else None,
-            'device_type': self.device_type.value if self.device_type else None,
-            'device_type_confidence': float(self.device_type_confidence) if self.device_type_confidence else None,
-            'device_type_manually_corrected': self.device_type_manually_corrected,
-            'phase1_wall_time': float(self.phase1_wall_time) if self.phase1_wall_time else None,
-            'phase2_wall_time': float(self.phase2_wall_time) if self.phase2_wall_time else None,
-            'overall_wall_time': float(self.overall_wall_time) if self.overall_wall_time else None,
-            'throughput_keys_per_sec': self.throughput_keys_per_sec,
-            'performance_score': float(self.performance_score) if self.performance_score else None,
-            'raw_result_text': self.raw_result_text,
-            'ip_address': self.ip_address,
-            'user_agent': self.user_agent,
-            'submission_source': self.submission_source,
-            'is_verified': self.is_verified,
-            'notes': self.notes,
-            'submitted_at': self.submitted_at.isoformat() if self.submitted_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        """转换为字典（全部列）"""
+        return _dict_serializer.from_object(self)
+
+
+_dict_serializer = RowSerializer(BenchmarkResult.__table__.columns)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+CPU 型号维度模型
+"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP
+from datetime import datetime, timezone
+from app.models.base import Base
+from app.utils.serialization import RowSerializer
+
+
+class CpuModel(Base):
+    """CPU 型号维度表（规范化后的型号，benchmark_results.cpu_model_id 引用）"""
+    __tablename__ = 'cpu_models'
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='型号ID')
+    model_key = Column(String(255), unique=True, nullable=False, comment='规范名称的小写形式（唯一键）')
+    name = Column(String(255), nullable=False, comment='规范名称')
+    created_at = Column(TIMESTAMP, default=lambda: datetime.now(timezone.utc), nullable=False, comment='创建时间')
+
+    def __repr__(self):
+        return f"<CpuModel(id={self.id}, name='{self.name}')>"
+
+    def to_dict(self):
+        """转换为字典（全部列）"""
+        return _dict_serializer.from_object(self)
+
+
+_dict_serializer = RowSerializer(CpuModel.__table__.columns)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+CPU 型号统计模型
+"""
+from sqlalchemy import Column, BigInteger, Integer, Double, TIMESTAMP, Enum, Index, ForeignKey
+from datetime import datetime, timezone
+from app.models.base import Base
+from app.models.benchmark import DeviceType
+from app.utils.serialization import RowSerializer
+
+
+class CpuModelStats(Base):
+    """按 (CPU 型号ID, 设备类型) 汇总的耗时统计，提交、更新、删除记录时增量维护"""
+    __tablename__ = 'cpu_model_stats'
+    __table_args__ = (
+        Index('uk_cpu_model_device', 'cpu_model_id', 'device_type', unique=True),
+        # 按记录数取前 N 个型号
+        Index('idx_device_sample_count', 'device_type', 'sample_count'),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True, comment='统计ID')
+    cpu_model_id = Column(Integer, ForeignKey('cpu_models.id'), nullable=False, comment='CPU型号ID')
+    device_type = Column(Enum(DeviceType), nullable=False, comment='设备类型')
+    sample_count = Column(Integer, default=0, nullable=False, comment='记录数')
+
+    # 各阶段耗时：最佳值、均值、离差平方和（Welford 算法增量维护）
+    overall_best = Column(Double, nullable=True, comment='总耗时最佳值(秒)')
+    overall_mean = Column(Double, default=0, nullable=False, comment='总耗时均值(秒)')
+    overall_m2 = Column(Double, default=0, nullable=False, comment='总耗时离差平方和')
+    phase1_best = Column(Double, nullable=True, comment='Phase 1 耗时最佳值(秒)')
+    phase1_mean = Column(Double, default=0, nullable=False, comment='Phase 1 耗时均值(秒)')
+    phase1_m2 = Column(Double, default=0, nullable=False, comment='Phase 1 耗时离差平方和')
+    phase2_best = Column(Double, nullable=True, comment='Phase 2 耗时最佳值(秒)')
+    phase2_mean = Column(Double, default=0, nullable=False, comment='Phase 2 耗时均值(秒)')
+    phase2_m2 = Column(Double, default=0, nullable=False, comment='Phase 2 耗时离差平方和')
+
+    updated_at = Column(TIMESTAMP, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False, comment='更新时间')
+
+    def __repr__(self):
+        return f"<CpuModelStats(cpu_model_id={self.cpu_model_id}, device_type={self.device_type}, count={self.sample_count})>"
+
+    def to_dict(self):
+        """转换为字典（全部列）"""
+        return _dict_serializer.from_object(self)
+
+
+_dict_serializer = RowSerializer(CpuModelStats.__table__.columns)
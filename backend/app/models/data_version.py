@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+数据版本模型
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, BigInteger, Integer, String, TIMESTAMP
+from app.models.base import Base
+
+
+class DataVersion(Base):
+    """数据版本号（写入时加一，多进程部署时各 worker 据此判断进程内索引是否过期）"""
+    __tablename__ = 'data_versions'
+
+    name = Column(String(50), primary_key=True, comment='数据名称')
+    version = Column(BigInteger, nullable=False, default=0, comment='版本号，每次写入加一')
+
+    def __repr__(self):
+        return f"<DataVersion(name='{self.name}', version={self.version})>"
+
+
+class DataChange(Base):
+    """数据变更日志（每个版本涉及的记录、用户和型号统计分组，四列均为空表示整表变更）"""
+    __tablename__ = 'data_changes'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True, comment='日志ID')
+    version = Column(BigInteger, nullable=False, index=True, comment='变更所属的数据版本')
+    benchmark_id = Column(BigInteger, nullable=True, comment='变更的记录ID')
+    user_id = Column(BigInteger, nullable=True, comment='资料变更的用户ID（重新读取该用户的全部记录）')
+    cpu_model_id = Column(Integer, nullable=True, comment='变更的统计分组：CPU型号ID')
+    device_type = Column(String(20), nullable=True, comment='变更的统计分组：设备类型')
+    created_at = Column(TIMESTAMP, default=lambda: datetime.now(timezone.utc), nullable=False, index=True, comment='写入时间')
+
+    def __repr__(self):
+        return f"<DataChange(version={self.version}, benchmark_id={self.benchmark_id})>"
@@ -2,15 +2,22 @@
 """
 排行榜快照模型
 """
-from sqlalchemy import Column, BigInteger, Integer, String, Date, DECIMAL, TIMESTAMP, Enum
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DECIMAL, TIMESTAMP, Enum, Index
 from datetime import datetime, timezone
 from app.models.base import Base
+from app.utils.serialization import RowSerializer
 from app.models.benchmark import DeviceType
 
 
 class LeaderboardSnapshot(Base):
-    """排行榜快照表"""
+    """排行榜快照表（device_type 为空表示总榜）"""
     __tablename__ = 'leaderboard_snapshots'
+    __table_args__ = (
+        # 按日期查询某榜单前 N 名
+        Index('uk_snapshot_device_rank', 'snapshot_date', 'device_type', 'rank_position', unique=True),
+        # 查询用户排名历史
+        Index('idx_user_snapshot', 'user_id', 'snapshot_date'),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, comment='快照ID')
     snapshot_date = Column(Date, nullable=False, index=True, comment='快照日期')
@@ -28,17 +35,8 @@ class LeaderboardSnapshot(Base):
         return f"<LeaderboardSnapshot(id={self.id}, date={self.snapshot_date}, rank={self.rank_position})>"
 
     def to_dict(self):
-        """转换为字典"""
-        return {
-            'id': self.id,
-            'snapshot_date': self.snapshot_date.isoformat() if self.snapshot_date else None,
-            'rank_position': self.rank_position,
-            'user_id': self.user_id,
-            'username': self.username,
-            'benchmark_result_id': self.benchmark_result_id,
-            'overall_wall_time': float(self.overall_wall_time) if self.overall_wall_time else None,
-            'performance_score': float(self.performance_score) if self.performance_score else None,
-            'device_type': self.device_type.value if self.device_type else None,
-            'cpu_model': self.cpu_model,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        """转换为字典（全部列）"""
+        return _dict_serializer.from_object(self)
+
+
+_dict_serializer = RowSerializer(LeaderboardSnapshot.__table__.columns)
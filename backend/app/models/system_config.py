@@ -5,6 +5,7 @@
 from sqlalchemy import Column, Integer, String, Text, TIMESTAMP
 from datetime import datetime, timezone
 from app.models.base import Base
+from app.utils.serialization import RowSerializer
 
 
 class SystemConfig(Base):
@@ -23,13 +24,8 @@ class SystemConfig(Base):
         return f"<SystemConfig(key='{self.config_key}', value='{self.config_value}')>"
 
     def to_dict(self):
-        """转换为字典"""
-        return {
-            'id': self.id,
-            'config_key': self.config_key,
-            'config_value': self.config_value,
-            'config_type': self.config_type,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        """转换为字典（全部列）"""
+        return _dict_serializer.from_object(self)
+
+
+_dict_serializer = RowSerializer(SystemConfig.__table__.columns)
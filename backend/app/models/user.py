@@ -2,10 +2,11 @@
 """
 用户模型
 """
-from sqlalchemy import Column, BigInteger, String, TIMESTAMP
+from sqlalchemy import Column, BigInteger, Integer, String, TIMESTAMP
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.models.base import Base
+from app.utils.serialization import RowSerializer
 
 
 class User(Base):
@@ -17,6 +18,7 @@ class User(Base):
     user_id = Column(String(100), unique=True, nullable=False, index=True, comment='linux.do 用户ID')
     email = Column(String(255), nullable=True, comment='邮箱地址')
     avatar_url = Column(String(500), nullable=True, comment='头像URL')
+    result_count = Column(Integer, default=0, server_default='0', nullable=False, comment='已提交的基准测试记录数（限额计数器）')
     created_at = Column(TIMESTAMP, default=lambda: datetime.now(timezone.utc), nullable=False, index=True, comment='创建时间')
     updated_at = Column(TIMESTAMP, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False, comment='更新时间')
 
@@ -27,13 +29,8 @@ class User(Base):
         return f"<User(id={self.id}, username='{self.username}')>"
 
     def to_dict(self):
-        """转换为字典"""
-        return {
-            'id': self.id,
-            'username': self.username,
-            'user_id': self.user_id,
-            'email': self.email,
-            'avatar_url': self.avatar_url,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        """转换为字典（全部列）"""
+        return _dict_serializer.from_object(self)
+
+
+_dict_serializer = RowSerializer(User.__table__.columns)
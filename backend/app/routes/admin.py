@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+管理路由 - 仅 ADMIN_USERNAMES 中的用户可访问
+"""
+from fastapi import APIRouter, Depends
+
+from app.dependencies.auth import get_admin_user
+from app.services.user_cache import CachedUser
+from app.services.slow_query_log import slow_query_log, SLOW_QUERY_LOG_SIZE
+
+router = APIRouter(prefix="/api/v1/admin", tags=["管理"])
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = 50,
+    admin: CachedUser = Depends(get_admin_user)
+):
+    """本进程最近的慢查询（新的在前），包含参数、发起查询的路由和执行计划"""
+    limit = min(max(limit, 1), SLOW_QUERY_LOG_SIZE)
+    return {
+        "success": True,
+        "data": {
+            "enabled": slow_query_log.enabled,
+            "threshold_ms": slow_query_log.threshold_ms,
+            "entries": slow_query_log.entries(limit)
+        },
+        "message": "获取慢查询记录成功" if slow_query_log.enabled else "慢查询日志未启用（ENABLE_SLOW_QUERY_LOG）"
+    }
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(admin: CachedUser = Depends(get_admin_user)):
+    """清空本进程的慢查询记录"""
+    count = slow_query_log.clear()
+    return {
+        "success": True,
+        "data": {"cleared": count},
+        "message": f"已清除 {count} 条慢查询记录"
+    }
@@ -10,12 +10,20 @@ from datetime import datetime, timezone, timedelta
 import httpx
 import secrets
 from urllib.parse import urlencode
-from sqlalchemy.orm import Session
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies.database import get_db
+from app.dependencies.database import get_async_db
 from app.dependencies.jwt_utils import create_jwt_token, verify_token
 from app.dependencies.auth import get_current_user_from_token
 from app.models import User
+from app.services.user_cache import user_cache, CachedUser
+from app.services.leaderboard_index import leaderboard_index, sync_user_profile
+from app.services.response_cache import leaderboard_cache
+from app.services.data_version import data_version, bump_data_version
+from app.services.oauth_client import oauth_http_client
+from app.services.metrics import time_oauth_request
+from app.services.system_settings import system_settings
 from app.config import (
     CLIENT_ID, CLIENT_SECRET, REDIRECT_URI,
     AUTHORIZATION_ENDPOINT, TOKEN_ENDPOINT, USER_ENDPOINT,
@@ -70,18 +78,18 @@ async def login():
 
 
 @router.post("/linuxdo/callback")
-async def linuxdo_callback_post(request: CallbackRequest, db: Session = Depends(get_db)):
+async def linuxdo_callback_post(request: CallbackRequest, db: AsyncSession = Depends(get_async_db)):
     """处理OAuth回调 - POST方法"""
     return await _process_oauth_callback(request.code, db)
 
 
 @router.get("/linuxdo/callback")
-async def linuxdo_callback_get(code: str, state: str = None, db: Session = Depends(get_db)):
+async def linuxdo_callback_get(code: str, state: str = None, db: AsyncSession = Depends(get_async_db)):
     """处理OAuth回调 - GET方法"""
     return await _process_oauth_callback(code, db)
 
 
-async def _process_oauth_callback(code: str, db: Session):
+async def _process_oauth_callback(code: str, db: AsyncSession):
     """处理OAuth回调的通用逻辑"""
     try:
         # 交换访问令牌
@@ -96,10 +104,10 @@ async def _process_oauth_callback(code: str, db: Session):
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data, headers=headers)
+        with time_oauth_request("token"):
+            response = await oauth_http_client.post(token_url, data=data, headers=headers)
             response.raise_for_status()
-            token_data = response.json()
+        token_data = response.json()
 
         # 获取用户信息
         access_token = token_data.get("access_token")
@@ -110,15 +118,12 @@ async def _process_oauth_callback(code: str, db: Session):
             )
 
         user_info_url = USER_ENDPOINT
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "User-Agent": "Benchmark-Platform/1.0"
-        }
+        headers = {"Authorization": f"Bearer {access_token}"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(user_info_url, headers=headers)
+        with time_oauth_request("user_info"):
+            response = await oauth_http_client.get(user_info_url, headers=headers)
             response.raise_for_status()
-            user_data = response.json()
+        user_data = response.json()
 
         # linux.do API 直接返回用户信息
         user = user_data
@@ -132,17 +137,26 @@ async def _process_oauth_callback(code: str, db: Session):
         linux_do_user_id = str(user.get("id"))
         username = user.get("username")
 
-        existing_user = db.query(User).filter(
-            (User.user_id == linux_do_user_id) | (User.username == username)
-        ).first()
+        existing_user = await db.scalar(
+            select(User).where(or_(User.user_id == linux_do_user_id, User.username == username)).limit(1)
+        )
 
+        profile_synced = 0
         if existing_user:
             # 更新现有用户
+            avatar_url = user.get("avatar_template", "").replace("{size}", "120")
+            profile_changed = (existing_user.username, existing_user.avatar_url) != (username, avatar_url)
             existing_user.username = username
             existing_user.email = user.get("email")
-            existing_user.avatar_url = user.get("avatar_template", "").replace("{size}", "120")
+            existing_user.avatar_url = avatar_url
             existing_user.updated_at = datetime.now(timezone.utc)
             user_record = existing_user
+
+            # 用户名或头像变化时，同一事务内同步到该用户记录上的冗余字段
+            if profile_changed:
+                profile_synced = await sync_user_profile(db, existing_user.id, username, avatar_url)
+                if profile_synced:
+                    version = await bump_data_version(db, user_ids=[existing_user.id])
         else:
             # 创建新用户
             user_record = User(
@@ -155,8 +169,13 @@ async def _process_oauth_callback(code: str, db: Session):
             )
             db.add(user_record)
 
-        db.commit()
-        db.refresh(user_record)
+        await db.commit()
+        await db.refresh(user_record)
+        user_cache.invalidate(user_record.id)
+        if profile_synced:
+            leaderboard_index.update_user(user_record.id, user_record.username, user_record.avatar_url)
+            leaderboard_cache.invalidate()
+            data_version.observe(version)
 
         # 创建JWT令牌
         token_data = {
@@ -164,7 +183,8 @@ async def _process_oauth_callback(code: str, db: Session):
             "username": str(user_record.username),
             "user_do_id": str(user_record.user_id)
         }
-        access_token = create_jwt_token(token_data)
+        session_hours = system_settings.current.session_expire_hours
+        access_token = create_jwt_token(token_data, session_hours)
 
         # 重定向到前端OAuth回调页面
         frontend_url = f"{get_frontend_url()}/oauth/callback"
@@ -175,8 +195,8 @@ async def _process_oauth_callback(code: str, db: Session):
         response.set_cookie(
             key="auth_token",
             value=access_token,
-            max_age=24*60*60,
-            expires=datetime.now(timezone.utc) + timedelta(hours=24),
+            max_age=session_hours * 60 * 60,
+            expires=datetime.now(timezone.utc) + timedelta(hours=session_hours),
             path="/",
             domain=None,
             secure=False,  # 生产环境应设为True
@@ -190,6 +210,13 @@ async def _process_oauth_callback(code: str, db: Session):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"OAuth认证失败: {e.response.text}"
         )
+    except httpx.TimeoutException:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="OAuth 服务响应超时"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_detail = f"认证处理失败: {str(e)}\n详细错误: {traceback.format_exc()}"
@@ -201,7 +228,7 @@ async def _process_oauth_callback(code: str, db: Session):
 
 
 @router.get("/me")
-async def get_current_user_info(current_user: User = Depends(get_current_user_from_token)):
+async def get_current_user_info(current_user: CachedUser = Depends(get_current_user_from_token)):
     """获取当前用户信息"""
     return {
         "id": current_user.id,
@@ -226,7 +253,7 @@ async def logout():
 
 
 @router.post("/mock-login")
-async def mock_login(request: MockLoginRequest, db: Session = Depends(get_db)):
+async def mock_login(request: MockLoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Mock登录 - 仅用于本地测试"""
     if not ENABLE_MOCK_LOGIN:
         raise HTTPException(
@@ -236,7 +263,7 @@ async def mock_login(request: MockLoginRequest, db: Session = Depends(get_db)):
 
     try:
         # 查找现有用户
-        existing_user = db.query(User).filter(User.username == request.username).first()
+        existing_user = await db.scalar(select(User).where(User.username == request.username).limit(1))
 
         if existing_user:
             # 更新现有用户
@@ -257,15 +284,17 @@ async def mock_login(request: MockLoginRequest, db: Session = Depends(get_db)):
             )
             db.add(user_record)
 
-        db.commit()
-        db.refresh(user_record)
+        await db.commit()
+        await db.refresh(user_record)
+        user_cache.invalidate(user_record.id)
 
         token_data = {
             "user_id": int(user_record.id),
             "username": str(user_record.username),
             "user_do_id": str(user_record.user_id)
         }
-        access_token = create_jwt_token(token_data)
+        session_hours = system_settings.current.session_expire_hours
+        access_token = create_jwt_token(token_data, session_hours)
 
         response = JSONResponse(content={
             "success": True,
@@ -282,8 +311,8 @@ async def mock_login(request: MockLoginRequest, db: Session = Depends(get_db)):
         response.set_cookie(
             key="auth_token",
             value=access_token,
-            max_age=24*60*60,
-            expires=datetime.now(timezone.utc) + timedelta(hours=24),
+            max_age=session_hours * 60 * 60,
+            expires=datetime.now(timezone.utc) + timedelta(hours=session_hours),
             path="/",
             domain=None,
             secure=False,
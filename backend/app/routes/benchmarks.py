@@ -2,21 +2,55 @@
 """
 基准测试相关路由 - 使用 ORM
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Header, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List
-import re
+from typing import Optional, Dict, AsyncIterator
+import asyncio
+import json
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-
-from app.dependencies.database import get_db
-from app.dependencies.auth import get_current_user_from_token
-from app.models import User, BenchmarkResult, DeviceType
+from decimal import Decimal
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies.database import get_async_db
+from app.dependencies.auth import get_current_user_from_token, get_token_user, TokenUser
+from app.models import BenchmarkResult, DeviceType, CpuModel, CpuModelStats
+from app.services.user_cache import CachedUser
+from app.utils.benchmark_parser import parse_benchmark_output
+from app.utils.benchmark_scoring import apply_benchmark_metrics
 from app.utils.device_classifier import DeviceTypeClassifier
+from app.services.leaderboard_index import (
+    leaderboard_index, build_entry, BoardRank, LEADERBOARD_SORTS, LEADERBOARD_COLUMNS, ENTRY_DEFAULTS, DEFAULT_SORT
+)
+from app.services.response_cache import leaderboard_cache
+from app.services.submission_quota import reserve_slot, release_slot
+from app.services.system_settings import system_settings
+from app.services.cpu_models import cpu_model_registry
+from app.services.cpu_stats import cpu_stats_index, apply_stats_change, stats_sample, stats_entry
+from app.services.data_version import data_version, bump_data_version
+from app.services.leaderboard_events import (
+    leaderboard_events, format_event, StreamLimitExceeded, StreamClosed, CLOSE
+)
+from app.config import LEADERBOARD_STREAM_HEARTBEAT_SECONDS
+from app.utils.leaderboard_cursor import encode_cursor, decode_cursor, CURSOR_NEXT, CURSOR_PREV, CURSOR_AT
+from app.utils.serialization import RowSerializer, FastJSONResponse
 
 router = APIRouter(prefix="/api/v1/benchmarks", tags=["基准测试"])
 
+# 批量解析时单行（单条原始输出）的最大字节数
+MAX_BATCH_LINE_BYTES = 1024 * 1024
+
+# 排行榜每页最多返回的条数
+LEADERBOARD_MAX_LIMIT = 100
+
+# 型号统计一次最多返回的型号数
+CPU_STATS_MAX_LIMIT = 100
+
+# 我的记录与记录详情读取的列（只取这些列，不加载整个 ORM 对象）
+RECORD_COLUMNS = LEADERBOARD_COLUMNS + (BenchmarkResult.updated_at,)
+_record_serializer = RowSerializer(RECORD_COLUMNS, exclude=("user_id",), defaults=ENTRY_DEFAULTS)
+
 
 class BenchmarkSubmitRequest(BaseModel):
     cpu_model: str
@@ -42,40 +76,7 @@ async def parse_benchmark_text(request: Request):
                 detail="缺少基准测试结果文本"
             )
 
-        parsed_data = {
-            "cpu_model": "",
-            "cpu_cores": None,
-            "memory_gb": None,
-            "phase1_wall_time": None,
-            "phase2_wall_time": None,
-            "overall_wall_time": None
-        }
-
-        # 解析系统信息
-        cpu_match = re.search(r'CPU\s*[:\s]\s*(.+?)(?:\n|$)', text, re.IGNORECASE)
-        if cpu_match:
-            parsed_data["cpu_model"] = cpu_match.group(1).strip()
-
-        cores_match = re.search(r'(?:Cores|cores?|Cores?_logical)\s*[:\s]\s*(\d+)', text, re.IGNORECASE)
-        if cores_match:
-            parsed_data["cpu_cores"] = int(cores_match.group(1))
-
-        memory_match = re.search(r'Memory\s*[:\s]\s*([\d.]+)\s*(?:GB|gb|GiB|gib)', text, re.IGNORECASE)
-        if memory_match:
-            parsed_data["memory_gb"] = float(memory_match.group(1))
-
-        # 解析时间信息
-        phase1_match = re.search(r'\[Phase\s*1\][\s\S]*?wall_time\s*[:\s]\s*([\d.]+)\s*s', text, re.IGNORECASE)
-        if phase1_match:
-            parsed_data["phase1_wall_time"] = float(phase1_match.group(1))
-
-        phase2_match = re.search(r'\[Phase\s*2\][\s\S]*?wall_time\s*[:\s]\s*([\d.]+)\s*s', text, re.IGNORECASE)
-        if phase2_match:
-            parsed_data["phase2_wall_time"] = float(phase2_match.group(1))
-
-        total_match = re.search(r'\[Overall\][\s\S]*?wall_time\s*[:\s]\s*([\d.]+)\s*s', text, re.IGNORECASE)
-        if total_match:
-            parsed_data["overall_wall_time"] = float(total_match.group(1))
+        parsed_data = parse_benchmark_output(text)
 
         return {
             "success": True,
@@ -90,6 +91,95 @@ async def parse_benchmark_text(request: Request):
         )
 
 
+class _RequestBodyStreamingResponse(StreamingResponse):
+    """边读请求体边输出的流式响应
+
+    StreamingResponse 会并发调用 receive() 监听断开连接，与 request.stream() 争抢请求体消息；
+    这里只负责输出，断开连接由 request.stream() 抛出 ClientDisconnect 感知。
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post("/parse/batch")
+async def parse_benchmark_batch(request: Request):
+    """批量解析基准测试文本（NDJSON 流）
+
+    请求体每行一个 JSON 对象 {"text": "...", "id": 可选标识}，
+    响应为 application/x-ndjson，按输入顺序逐行返回解析结果，边读边解析。
+    """
+    return _RequestBodyStreamingResponse(_parse_ndjson_stream(request.stream()), media_type="application/x-ndjson")
+
+
+async def _parse_ndjson_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """逐行解析 NDJSON 请求体并输出 NDJSON 结果"""
+    index = 0
+    async for line in _iter_ndjson_lines(chunks):
+        if line is not None and not line.strip():
+            continue
+        result = _parse_batch_line(index, line)
+        yield (json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8")
+        index += 1
+
+
+async def _iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[bytes]]:
+    """按换行切分字节流；超过 MAX_BATCH_LINE_BYTES 的行以 None 表示并丢弃其内容"""
+    buffer = bytearray()
+    skipping = False
+    async for chunk in chunks:
+        # 只在新数据中查找换行，避免长行被重复扫描
+        search_from = len(buffer)
+        buffer.extend(chunk)
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", max(start, search_from))
+            if newline < 0:
+                break
+            line = bytes(buffer[start:newline])
+            start = newline + 1
+            if skipping:
+                skipping = False
+                continue
+            yield line if len(line) <= MAX_BATCH_LINE_BYTES else None
+        del buffer[:start]
+
+        if len(buffer) > MAX_BATCH_LINE_BYTES:
+            if not skipping:
+                yield None
+            skipping = True
+            buffer.clear()
+
+    if buffer and not skipping:
+        yield bytes(buffer)
+
+
+def _parse_batch_line(index: int, line: Optional[bytes]) -> dict:
+    """解析批量请求中的一行"""
+    if line is None:
+        return {"index": index, "success": False, "message": "单条数据超过大小限制"}
+
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return {"index": index, "success": False, "message": "JSON 格式错误"}
+
+    if not isinstance(item, dict):
+        return {"index": index, "success": False, "message": "每行必须是 JSON 对象"}
+
+    result = {"index": index, "id": item.get("id")}
+    text = item.get("text")
+    if not text or not isinstance(text, str):
+        return {**result, "success": False, "message": "缺少基准测试结果文本"}
+
+    try:
+        return {**result, "success": True, "data": parse_benchmark_output(text)}
+    except ValueError as e:
+        return {**result, "success": False, "message": f"解析失败: {str(e)}"}
+
+
 @router.post("/classify-device-type")
 async def classify_device_type(request: Dict[str, str]):
     """设备类型分类API"""
@@ -101,8 +191,7 @@ async def classify_device_type(request: Dict[str, str]):
                 "message": "CPU型号不能为空"
             }
 
-        classifier = DeviceTypeClassifier()
-        device_type, confidence = classifier.classify_cpu(cpu_model)
+        device_type, confidence = DeviceTypeClassifier.classify_cpu(cpu_model)
 
         return {
             "success": True,
@@ -110,6 +199,7 @@ async def classify_device_type(request: Dict[str, str]):
                 "cpu_model": cpu_model,
                 "device_type": device_type,
                 "device_type_confidence": confidence,
+                "is_confident": confidence >= system_settings.current.device_type_confidence_threshold,
                 "classification_text": f"设备类型: {device_type.upper()} (置信度: {confidence:.2f})"
             }
         }
@@ -121,42 +211,65 @@ async def classify_device_type(request: Dict[str, str]):
         )
 
 
+def _user_results_query(user_id: int):
+    """用户的全部记录，按提交时间倒序（走 idx_user_submitted）"""
+    return select(*RECORD_COLUMNS).where(
+        BenchmarkResult.user_id == user_id
+    ).order_by(BenchmarkResult.submitted_at.desc())
+
+
+def _my_ranks_query(user_id: int):
+    """用户每条记录在总榜和设备类型榜单中的排名（排行榜索引未就绪时使用，需扫描并排序全表）"""
+    wall_time = BenchmarkResult.overall_wall_time
+
+    # 窗口函数在一次扫描中计算全部榜单的位置与总数；与排行榜分页相同按 (总耗时, id) 编号
+    ranked = select(
+        BenchmarkResult.id,
+        BenchmarkResult.user_id,
+        BenchmarkResult.device_type,
+        BenchmarkResult.cpu_model,
+        wall_time.label("overall_wall_time"),
+        func.count().over().label("total_all"),
+        func.row_number().over(order_by=(wall_time.asc(), BenchmarkResult.id.asc())).label("position_all"),
+        func.count().over(partition_by=BenchmarkResult.device_type).label("total_device"),
+        func.row_number().over(
+            partition_by=BenchmarkResult.device_type, order_by=(wall_time.asc(), BenchmarkResult.id.asc())
+        ).label("position_device")
+    ).where(wall_time.isnot(None)).subquery()
+
+    return select(ranked).where(
+        ranked.c.user_id == user_id
+    ).order_by(ranked.c.overall_wall_time.asc(), ranked.c.id.asc())
+
+
 @router.post("/submit")
 async def submit_benchmark_result(
     request: BenchmarkSubmitRequest,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    current_user: CachedUser = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """提交基准测试结果"""
     try:
-        # 检查用户已有结果数量 - 使用 ORM
-        user_result_count = db.query(BenchmarkResult).filter(
-            BenchmarkResult.user_id == current_user.id
-        ).count()
-
-        # 如果用户已经有3条记录，拒绝提交
-        if user_result_count >= 3:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="每个用户最多只能提交3条基准测试记录"
-            )
+        # 登记规范化的 CPU 型号（新型号单独提交，须在本请求的其他写入之前）
+        cpu_model_ref = await cpu_model_registry.intern(db, request.cpu_model)
 
         # 如果未提供设备类型，使用CPU型号进行分类
         device_type_str = request.device_type
         device_type_confidence = request.device_type_confidence
 
-        if not device_type_str:
-            classifier = DeviceTypeClassifier()
-            device_type_str, device_type_confidence = classifier.classify_cpu(request.cpu_model)
+        if not device_type_str and system_settings.current.enable_device_classification:
+            device_type_str, device_type_confidence = DeviceTypeClassifier.classify_cpu(request.cpu_model)
 
         # 转换设备类型字符串为枚举
         device_type_enum = DeviceType[device_type_str] if device_type_str in ['server', 'consumer', 'unknown'] else DeviceType.unknown
+        manually_corrected = bool(request.device_type) and _is_manual_device_type(request.cpu_model, device_type_enum)
 
-        # 插入新结果 - 使用 ORM
         new_result = BenchmarkResult(
             user_id=current_user.id,
             username=current_user.username,
+            avatar_url=current_user.avatar_url,
             cpu_model=request.cpu_model,
+            cpu_model_id=cpu_model_ref.id if cpu_model_ref else None,
             cpu_cores=request.cpu_cores,
             memory_gb=request.memory_gb,
             phase1_wall_time=request.phase1_wall_time,
@@ -164,28 +277,50 @@ async def submit_benchmark_result(
             overall_wall_time=request.overall_wall_time,
             device_type=device_type_enum,
             device_type_confidence=device_type_confidence,
+            device_type_manually_corrected=manually_corrected,
             submitted_at=datetime.now(timezone.utc)
         )
+        apply_benchmark_metrics(new_result)
 
+        # 占用提交名额（条件更新用户行上的计数器），与插入在同一事务中提交
+        max_results = system_settings.current.max_results_per_user
+        user_result_count = await reserve_slot(db, current_user.id, max_results)
+        if user_result_count is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"每个用户最多只能提交{max_results}条基准测试记录"
+            )
+
+        # 插入新结果 - 使用 ORM（Python 端默认值在 flush 时已写入对象，提交后无需 refresh）
         db.add(new_result)
-        db.commit()
-        db.refresh(new_result)
+        stats_changes = await apply_stats_change(db, None, stats_sample(new_result))
+        # 写入记录以获得 ID，供变更日志使用
+        await db.flush()
+        version = await bump_data_version(
+            db, record_ids=[new_result.id], stats_groups=[group for group, _ in stats_changes]
+        )
+        await db.commit()
+
+        _apply_leaderboard_change(new_result.id, new_result)
+        cpu_stats_index.apply(stats_changes)
+        data_version.observe(version)
 
         return {
             "success": True,
-            "message": f"基准测试结果提交成功（这是您的第{user_result_count + 1}条记录）",
+            "message": f"基准测试结果提交成功（这是您的第{user_result_count}条记录）",
             "data": {
                 "id": new_result.id,
                 "action": "created",
-                "user_result_count": user_result_count + 1,
-                "remaining_slots": 3 - (user_result_count + 1)
+                "user_result_count": user_result_count,
+                "remaining_slots": max(0, max_results - user_result_count)
             }
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"提交基准测试结果失败: {str(e)}"
@@ -195,57 +330,90 @@ async def submit_benchmark_result(
 @router.get("/leaderboard")
 async def get_leaderboard(
     device_type: Optional[str] = None,
-    limit: int = 20,
-    page: int = 1,
+    limit: int = Query(20, ge=1, le=LEADERBOARD_MAX_LIMIT),
+    page: int = Query(1, ge=1),
     reverse: bool = False,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    sort: str = DEFAULT_SORT,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """获取排行榜数据"""
-    try:
-        # 计算偏移量
-        offset = (page - 1) * limit
+    """获取排行榜数据
+
+    支持两种分页方式：page/limit 偏移分页，或使用响应中的 next_cursor/prev_cursor
+    （以及 /my-ranks 返回的 cursor）进行游标分页。
 
-        # 构建查询
-        query = db.query(BenchmarkResult, User).join(
-            User, BenchmarkResult.user_id == User.id
-        ).filter(BenchmarkResult.overall_wall_time.isnot(None))
+    sort 指定排序方式：time（总耗时升序，默认）、score（性能分数降序）、
+    per_core（单核性能分数降序）；reverse 反转所选排序。
 
-        if device_type:
-            query = query.filter(BenchmarkResult.device_type == device_type)
+    响应按查询参数缓存为序列化后的字节，并带 ETag；数据变更前重复请求直接命中缓存，
+    携带 If-None-Match 的请求返回 304。
+    """
+    try:
+        device_type = device_type or None
+        if sort not in LEADERBOARD_SORTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="无效的排序方式"
+            )
 
-        # 根据 reverse 参数决定排序方向
-        if reverse:
-            query = query.order_by(BenchmarkResult.overall_wall_time.desc())
+        # 读取响应缓存
+        cache_key = (device_type, page, limit, reverse, cursor, sort)
+        cached = leaderboard_cache.get(cache_key)
+        if cached is not None:
+            return cached.to_response(if_none_match)
+        cache_version = leaderboard_cache.version
+
+        # 解析分页游标
+        position = None
+        if cursor:
+            try:
+                position = decode_cursor(cursor, device_type, reverse, sort)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"无效的分页游标: {str(e)}"
+                )
+
+        if leaderboard_index.ready:
+            # 优先使用内存排名索引
+            if position:
+                offset, page_limit = leaderboard_index.cursor_window(
+                    device_type, position.key, position.direction, limit, reverse, sort
+                )
+            else:
+                offset, page_limit = (page - 1) * limit, limit
+            total, leaderboard = leaderboard_index.page(device_type, offset, page_limit, reverse, sort)
+            has_more = offset + len(leaderboard) < total
+        elif position:
+            # 游标分页：基于 (device_type, 排序列) 索引的 keyset 查询，不统计总数
+            total = None
+            leaderboard, has_more = await _keyset_page(db, device_type, position, limit, reverse, sort)
         else:
-            query = query.order_by(BenchmarkResult.overall_wall_time.asc())
-
-        # 获取总数
-        total = query.count()
-
-        # 应用分页
-        results = query.limit(limit).offset(offset).all()
-
-        # 格式化数据
-        leaderboard = []
-        rank = offset + 1
-        for benchmark, user in results:
-            leaderboard.append({
-                "rank": rank,
-                "username": user.username,
-                "avatar_url": user.avatar_url,
-                "cpu_model": benchmark.cpu_model,
-                "cpu_cores": benchmark.cpu_cores,
-                "memory_gb": float(benchmark.memory_gb) if benchmark.memory_gb else None,
-                "phase1_wall_time": float(benchmark.phase1_wall_time) if benchmark.phase1_wall_time else None,
-                "phase2_wall_time": float(benchmark.phase2_wall_time) if benchmark.phase2_wall_time else None,
-                "overall_wall_time": float(benchmark.overall_wall_time) if benchmark.overall_wall_time else None,
-                "device_type": benchmark.device_type.value if benchmark.device_type else "unknown",
-                "device_type_confidence": float(benchmark.device_type_confidence) if benchmark.device_type_confidence else 0.0,
-                "submitted_at": benchmark.submitted_at.isoformat() if benchmark.submitted_at else None
-            })
-            rank += 1
+            # 计算偏移量
+            offset = (page - 1) * limit
 
-        return {
+            query = _leaderboard_query(device_type, reverse, sort)
+
+            # 获取总数
+            total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+            # 应用分页
+            results = (await db.execute(query.limit(limit).offset(offset))).all()
+
+            # 格式化数据
+            leaderboard = []
+            rank = offset + 1
+            for row in results:
+                leaderboard.append({"rank": rank, **build_entry(row)})
+                rank += 1
+            has_more = offset + len(leaderboard) < total
+
+        # 游标模式下页码由首条记录的排名推算
+        if position and leaderboard:
+            page = (leaderboard[0]["rank"] - 1) // limit + 1
+
+        content = {
             "success": True,
             "data": {
                 "leaderboard": leaderboard,
@@ -253,11 +421,16 @@ async def get_leaderboard(
                     "page": page,
                     "limit": limit,
                     "total": total,
-                    "total_pages": (total + limit - 1) // limit
+                    "total_pages": (total + limit - 1) // limit if total is not None else None,
+                    "next_cursor": _entry_cursor(leaderboard[-1], CURSOR_NEXT, device_type, reverse, sort) if leaderboard and has_more else None,
+                    "prev_cursor": _entry_cursor(leaderboard[0], CURSOR_PREV, device_type, reverse, sort) if leaderboard and leaderboard[0]["rank"] > 1 else None
                 }
             }
         }
+        return leaderboard_cache.put(cache_key, content, cache_version).to_response(if_none_match)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -265,21 +438,173 @@ async def get_leaderboard(
         )
 
 
+@router.get("/stream")
+async def stream_leaderboard(device_type: Optional[str] = None):
+    """排行榜实时推送（Server-Sent Events）
+
+    device_type 为空时订阅总榜，否则订阅对应设备类型的榜单。每个合并窗口推送一条
+    leaderboard 事件（变更记录及其新旧排名，格式见 app/services/leaderboard_events.py），
+    客户端处理过慢导致积压时改为推送 reset 事件，收到后重新拉取当前页即可。
+    """
+    device_type = device_type or None
+    if device_type and device_type not in DeviceType.__members__:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的设备类型"
+        )
+
+    try:
+        subscriber = leaderboard_events.subscribe(device_type)
+    except StreamClosed:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="服务正在重启，请稍后重连"
+        )
+    except StreamLimitExceeded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="实时连接数已达上限"
+        )
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        try:
+            ready = json.dumps({"channel": subscriber.channel, "seq": leaderboard_events.seq})
+            yield f"retry: 3000\nevent: ready\ndata: {ready}\n\n".encode("utf-8")
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), LEADERBOARD_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # 心跳注释行，防止代理因空闲断开连接
+                    yield b": ping\n\n"
+                    continue
+                if message is CLOSE:
+                    break
+                yield format_event(message)
+        finally:
+            leaderboard_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _is_manual_device_type(cpu_model: Optional[str], device_type: DeviceType) -> bool:
+    """
+    用户指定的设备类型是否为手动修正
+
+    前端总会回传设备类型（默认为自动分类结果），只有与当前分类器结果不同时才算手动修正，
+    重新分类任务（app/services/device_reclassify.py）会跳过手动修正的记录。
+    """
+    classified, _ = DeviceTypeClassifier.classify_cpu(cpu_model)
+    return device_type != DeviceType[classified]
+
+
+def _apply_leaderboard_change(benchmark_id: int, record: Optional[BenchmarkResult] = None,
+                              previous_device_type: Optional[str] = None):
+    """
+    事务提交后同步排行榜：更新内存索引、使响应缓存失效并推送实时变更
+
+    Args:
+        benchmark_id: 记录 ID
+        record: 新增或更新后的记录，删除时为 None
+        previous_device_type: 变更前的设备类型（更新和删除时传入）
+    """
+    previous_ranks = leaderboard_index.ranks_of(benchmark_id)
+    device_types = {previous_device_type}
+    if record is None:
+        leaderboard_index.remove(benchmark_id)
+    else:
+        leaderboard_index.upsert(record)
+        device_types.add(record.device_type.value if record.device_type else "unknown")
+    leaderboard_cache.invalidate()
+    leaderboard_events.publish(benchmark_id, device_types, removed=record is None, previous_ranks=previous_ranks)
+
+
+def _ranking_ascending(sort: str, reverse: bool) -> bool:
+    """榜单顺序是否为 (排序列, id) 升序"""
+    return LEADERBOARD_SORTS[sort][1] == reverse
+
+
+def _leaderboard_query(device_type: Optional[str], reverse: bool, sort: str = DEFAULT_SORT):
+    """构建按 (排序列, id) 排序的排行榜查询（只取排行榜列，用户名和头像取自记录上的冗余字段）"""
+    column = getattr(BenchmarkResult, LEADERBOARD_SORTS[sort][0])
+    query = select(*LEADERBOARD_COLUMNS).where(column.isnot(None))
+
+    if device_type:
+        query = query.where(BenchmarkResult.device_type == device_type)
+
+    # 排序列与 id 同向排序，可直接按 (device_type, 排序列) 索引顺序或逆序扫描
+    if _ranking_ascending(sort, reverse):
+        return query.order_by(column.asc(), BenchmarkResult.id.asc())
+    return query.order_by(column.desc(), BenchmarkResult.id.desc())
+
+
+def _keyset_condition(column, key, greater: bool, inclusive: bool):
+    """(column, id) 与游标排序键比较的展开形式，便于 MySQL 使用索引做范围扫描"""
+    value, record_id = key
+    if greater:
+        return or_(column > value, and_(column == value,
+                                        BenchmarkResult.id >= record_id if inclusive else BenchmarkResult.id > record_id))
+    return or_(column < value, and_(column == value,
+                                    BenchmarkResult.id <= record_id if inclusive else BenchmarkResult.id < record_id))
+
+
+async def _keyset_page(db: AsyncSession, device_type: Optional[str], position, limit: int, reverse: bool,
+                       sort: str = DEFAULT_SORT):
+    """
+    按游标取一页数据（keyset 分页），排名由游标中携带的排名推算
+
+    Returns:
+        Tuple[List[dict], bool]: (带排名的条目列表, 游标方向之后是否还有记录)
+    """
+    column = getattr(BenchmarkResult, LEADERBOARD_SORTS[sort][0])
+    ascending = _ranking_ascending(sort, reverse)
+
+    if position.direction == CURSOR_PREV:
+        # 反向扫描取游标之前的记录，再恢复为榜单顺序
+        condition = _keyset_condition(column, position.key, not ascending, inclusive=False)
+        query = _leaderboard_query(device_type, not reverse, sort).where(condition)
+        results = list(reversed((await db.execute(query.limit(limit))).all()))
+        first_rank, has_more = position.rank - len(results), True
+    else:
+        inclusive = position.direction == CURSOR_AT
+        first_rank = position.rank if inclusive else position.rank + 1
+        condition = _keyset_condition(column, position.key, ascending, inclusive)
+        query = _leaderboard_query(device_type, reverse, sort).where(condition)
+        results = (await db.execute(query.limit(limit + 1))).all()
+        has_more = len(results) > limit
+        results = results[:limit]
+
+    leaderboard = []
+    for rank, row in enumerate(results, start=max(first_rank, 1)):
+        leaderboard.append({"rank": rank, **build_entry(row)})
+    return leaderboard, has_more
+
+
+def _entry_cursor(entry: dict, direction: str, device_type: Optional[str], reverse: bool,
+                  sort: str = DEFAULT_SORT) -> str:
+    """为排行榜条目生成游标"""
+    return encode_cursor(
+        Decimal(str(entry[LEADERBOARD_SORTS[sort][0]])), entry["id"], entry["rank"], direction,
+        device_type, reverse, sort
+    )
+
+
 @router.get("/my-result")
 async def get_my_benchmark_result(
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    current_user: CachedUser = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取当前用户的基准测试结果"""
     try:
         # 查询用户的所有基准测试结果
-        results = db.query(BenchmarkResult).filter(
-            BenchmarkResult.user_id == current_user.id
-        ).order_by(BenchmarkResult.submitted_at.desc()).all()
+        results = (await db.execute(_user_results_query(current_user.id))).all()
 
         # 获取用户总记录数
         total_count = len(results)
-        remaining_slots = max(0, 3 - total_count)
+        remaining_slots = max(0, system_settings.current.max_results_per_user - total_count)
 
         if not results:
             return {
@@ -287,31 +612,14 @@ async def get_my_benchmark_result(
                 "data": {
                     "results": [],
                     "total_count": 0,
-                    "remaining_slots": 3
+                    "remaining_slots": remaining_slots
                 },
                 "message": "用户还没有上传基准测试结果"
             }
 
-        # 格式化结果
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "id": result.id,
-                "username": current_user.username,
-                "avatar_url": current_user.avatar_url,
-                "cpu_model": result.cpu_model,
-                "cpu_cores": result.cpu_cores,
-                "memory_gb": float(result.memory_gb) if result.memory_gb else None,
-                "phase1_wall_time": float(result.phase1_wall_time) if result.phase1_wall_time else None,
-                "phase2_wall_time": float(result.phase2_wall_time) if result.phase2_wall_time else None,
-                "overall_wall_time": float(result.overall_wall_time) if result.overall_wall_time else None,
-                "device_type": result.device_type.value if result.device_type else "unknown",
-                "device_type_confidence": float(result.device_type_confidence) if result.device_type_confidence else 0.0,
-                "submitted_at": result.submitted_at.isoformat() if result.submitted_at else None,
-                "updated_at": result.updated_at.isoformat() if result.updated_at else None
-            })
+        formatted_results = [_record_serializer(row) for row in results]
 
-        return {
+        return FastJSONResponse({
             "success": True,
             "data": {
                 "results": formatted_results,
@@ -319,7 +627,7 @@ async def get_my_benchmark_result(
                 "remaining_slots": remaining_slots
             },
             "message": f"找到 {total_count} 条基准测试记录，还可提交 {remaining_slots} 条"
-        }
+        })
 
     except Exception as e:
         raise HTTPException(
@@ -332,92 +640,180 @@ async def get_my_benchmark_result(
 async def get_my_ranks(
     device_type: Optional[str] = None,
     reverse: bool = False,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    current_user: TokenUser = Depends(get_token_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """获取当前用户在排行榜中的所有排名信息"""
-    try:
-        # 构建查询条件
-        query = db.query(BenchmarkResult).filter(
-            BenchmarkResult.user_id == current_user.id,
-            BenchmarkResult.overall_wall_time.isnot(None)
-        )
+    """获取当前用户在排行榜中的所有排名信息
 
-        if device_type:
-            query = query.filter(BenchmarkResult.device_type == device_type)
+    同时返回用户每条记录在总榜和所属设备类型榜单中的正序/倒序排名，
+    结果按榜单分组返回（boards），records 仍按 device_type/reverse 参数返回当前榜单。
+    排行榜索引就绪时由索引二分查找得出，否则用一次窗口函数查询计算。
+    """
+    try:
+        # 每条记录：(设备类型, CPU 型号, 总耗时, 记录 ID, {榜单: BoardRank})，按总耗时升序
+        if leaderboard_index.ready:
+            user_records = [
+                (entry["device_type"], entry["cpu_model"], wall_time, entry["id"], ranks)
+                for entry, wall_time, ranks in leaderboard_index.user_ranks(current_user.id)
+            ]
+        else:
+            user_records = []
+            for row in (await db.execute(_my_ranks_query(current_user.id))).all():
+                row_device_type = row.device_type.value if row.device_type else "unknown"
+                user_records.append((row_device_type, row.cpu_model, row.overall_wall_time, row.id, {
+                    None: BoardRank(row.position_all, row.total_all),
+                    row_device_type: BoardRank(row.position_device, row.total_device)
+                }))
+
+        # 按榜单分组：all 为总榜，其余为设备类型榜单
+        boards = {"all": []}
+        for row_device_type, cpu_model, wall_time, record_id, ranks in user_records:
+            base = {
+                "device_type": row_device_type,
+                "cpu_model": cpu_model,
+                "overall_wall_time": float(wall_time) if wall_time else None,
+                "record_id": record_id
+            }
+            boards["all"].append(_format_rank(base, wall_time, None, ranks[None]))
+            boards.setdefault(row_device_type, []).append(
+                _format_rank(base, wall_time, row_device_type, ranks[row_device_type])
+            )
 
-        # 获取用户的所有记录
-        user_records = query.order_by(BenchmarkResult.overall_wall_time.asc()).all()
+        # 当前榜单（兼容旧版调用方式）
+        records = []
+        for record in boards.get(device_type or "all", []):
+            records.append({
+                **record,
+                "rank": record["reverse_rank"] if reverse else record["rank"],
+                "page": record["reverse_page"] if reverse else record["page"],
+                "cursor": record["reverse_cursor"] if reverse else record["cursor"]
+            })
 
         if not user_records:
             return {
                 "success": True,
-                "data": {"records": []},
+                "data": {"records": [], "boards": boards},
                 "message": "用户没有符合条件的记录"
             }
 
-        # 为每条记录计算排名
-        records_with_ranks = []
-        for record in user_records:
-            # 构建排名查询条件
-            rank_query = db.query(func.count(BenchmarkResult.id)).filter(
-                BenchmarkResult.overall_wall_time.isnot(None)
-            )
+        return FastJSONResponse({
+            "success": True,
+            "data": {"records": records, "boards": boards}
+        })
 
-            if device_type:
-                rank_query = rank_query.filter(BenchmarkResult.device_type == device_type)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"获取用户排名失败: {str(e)}"
+        )
 
-            # 根据reverse参数决定排名计算方式
-            if reverse:
-                rank = rank_query.filter(BenchmarkResult.overall_wall_time > record.overall_wall_time).scalar() + 1
-            else:
-                rank = rank_query.filter(BenchmarkResult.overall_wall_time < record.overall_wall_time).scalar() + 1
 
-            # 获取总数
-            total_query = db.query(func.count(BenchmarkResult.id)).filter(
-                BenchmarkResult.overall_wall_time.isnot(None)
+def _format_rank(base: dict, wall_time, device_type: Optional[str], board_rank: BoardRank) -> dict:
+    """组装单条记录在某个榜单中的排名信息
+
+    排名、页码与排行榜分页一致按位置计算；cursor/reverse_cursor 可直接传给 /leaderboard 的 cursor 参数，
+    定位到该记录所在位置。
+    """
+    page_size = max(system_settings.current.my_ranks_page_size, 1)
+    position, total = board_rank
+    reverse_position = total - position + 1
+    record_id = base["record_id"]
+    return {
+        **base,
+        "rank": position,
+        "reverse_rank": reverse_position,
+        "total": total,
+        "page": (position - 1) // page_size + 1,
+        "reverse_page": (reverse_position - 1) // page_size + 1,
+        "cursor": encode_cursor(wall_time, record_id, position, CURSOR_AT, device_type, False),
+        "reverse_cursor": encode_cursor(wall_time, record_id, reverse_position, CURSOR_AT, device_type, True)
+    }
+
+
+@router.get("/cpu-stats")
+async def get_cpu_stats(
+    cpu_model: Optional[str] = None,
+    device_type: Optional[str] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """CPU 型号耗时统计
+
+    指定 cpu_model 时返回该型号（按规范化型号匹配）各设备类型的统计，否则返回记录数最多的
+    前 limit 个型号；device_type 限定设备类型。每个统计包含记录数以及总耗时、Phase 1、Phase 2
+    耗时的最佳值、均值和标准差。
+    """
+    device_type = device_type or None
+    if device_type and device_type not in DeviceType.__members__:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的设备类型"
+        )
+    limit = min(max(limit, 1), CPU_STATS_MAX_LIMIT)
+
+    try:
+        if cpu_model is not None and not cpu_model.strip():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CPU型号不能为空"
             )
+        cpu_model_ref = await cpu_model_registry.find(db, cpu_model) if cpu_model else None
+
+        if cpu_model and cpu_model_ref is None:
+            stats = []
+        elif cpu_stats_index.ready:
+            # 内存索引：按型号查询为字典查找，前 N 个型号为有序索引切片
+            if cpu_model_ref:
+                stats = cpu_stats_index.get(cpu_model_ref.id, device_type)
+            else:
+                stats = cpu_stats_index.top(device_type, limit)
+        else:
+            query = select(CpuModelStats, CpuModel.name).join(CpuModel, CpuModel.id == CpuModelStats.cpu_model_id)
+            if cpu_model_ref:
+                query = query.where(CpuModelStats.cpu_model_id == cpu_model_ref.id)
             if device_type:
-                total_query = total_query.filter(BenchmarkResult.device_type == device_type)
-            total = total_query.scalar()
-
-            # 计算所在页码
-            page = (rank - 1) // 20 + 1
-
-            records_with_ranks.append({
-                "rank": rank,
-                "total": total,
-                "page": page,
-                "device_type": record.device_type.value if record.device_type else "unknown",
-                "cpu_model": record.cpu_model,
-                "overall_wall_time": float(record.overall_wall_time) if record.overall_wall_time else None,
-                "record_id": record.id
-            })
+                query = query.where(CpuModelStats.device_type == device_type)
+            if not cpu_model_ref:
+                query = query.order_by(CpuModelStats.sample_count.desc()).limit(limit)
+            stats = [stats_entry(row, name) for row, name in (await db.execute(query)).all()]
 
-        return {
+        if cpu_model and not stats:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="暂无该CPU型号的统计数据"
+            )
+
+        return FastJSONResponse({
             "success": True,
-            "data": {"records": records_with_ranks}
-        }
+            "data": {
+                "stats": stats
+            },
+            "message": "获取CPU型号统计成功"
+        })
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"获取用户排名失败: {str(e)}"
+            detail=f"获取CPU型号统计失败: {str(e)}"
         )
 
 
 @router.get("/{benchmark_id}")
 async def get_benchmark_detail(
     benchmark_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    current_user: TokenUser = Depends(get_token_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取单个基准测试记录详情"""
     try:
-        record = db.query(BenchmarkResult).filter(
-            BenchmarkResult.id == benchmark_id,
-            BenchmarkResult.user_id == current_user.id
-        ).first()
+        record = (await db.execute(
+            select(*RECORD_COLUMNS).where(
+                BenchmarkResult.id == benchmark_id,
+                BenchmarkResult.user_id == current_user.id
+            )
+        )).first()
 
         if not record:
             raise HTTPException(
@@ -425,23 +821,11 @@ async def get_benchmark_detail(
                 detail="记录不存在或无权限访问"
             )
 
-        return {
+        return FastJSONResponse({
             "success": True,
-            "data": {
-                "id": record.id,
-                "cpu_model": record.cpu_model,
-                "cpu_cores": record.cpu_cores,
-                "memory_gb": float(record.memory_gb) if record.memory_gb else None,
-                "phase1_wall_time": float(record.phase1_wall_time) if record.phase1_wall_time else None,
-                "phase2_wall_time": float(record.phase2_wall_time) if record.phase2_wall_time else None,
-                "overall_wall_time": float(record.overall_wall_time) if record.overall_wall_time else None,
-                "device_type": record.device_type.value if record.device_type else "unknown",
-                "device_type_confidence": float(record.device_type_confidence) if record.device_type_confidence else 0.0,
-                "submitted_at": record.submitted_at.isoformat() if record.submitted_at else None,
-                "updated_at": record.updated_at.isoformat() if record.updated_at else None
-            },
+            "data": _record_serializer(record),
             "message": "获取记录详情成功"
-        }
+        })
 
     except HTTPException:
         raise
@@ -456,16 +840,23 @@ async def get_benchmark_detail(
 async def update_benchmark(
     benchmark_id: int,
     request: Dict,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    current_user: CachedUser = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """更新基准测试记录"""
     try:
+        # 登记新的 CPU 型号（新型号单独提交，须在加载记录之前）
+        cpu_model_ref = None
+        if "cpu_model" in request:
+            cpu_model_ref = await cpu_model_registry.intern(db, request["cpu_model"])
+
         # 检查记录是否存在且属于当前用户
-        record = db.query(BenchmarkResult).filter(
-            BenchmarkResult.id == benchmark_id,
-            BenchmarkResult.user_id == current_user.id
-        ).first()
+        record = await db.scalar(
+            select(BenchmarkResult).where(
+                BenchmarkResult.id == benchmark_id,
+                BenchmarkResult.user_id == current_user.id
+            )
+        )
 
         if not record:
             raise HTTPException(
@@ -473,8 +864,13 @@ async def update_benchmark(
                 detail="记录不存在或无权限修改"
             )
 
+        previous_device_type = record.device_type.value if record.device_type else None
+        previous_sample = stats_sample(record)
+
         # 更新记录字段
-        record.cpu_model = request.get("cpu_model", record.cpu_model)
+        if "cpu_model" in request:
+            record.cpu_model = request["cpu_model"]
+            record.cpu_model_id = cpu_model_ref.id if cpu_model_ref else None
         record.cpu_cores = request.get("cpu_cores", record.cpu_cores)
         record.memory_gb = request.get("memory_gb", record.memory_gb)
         record.phase1_wall_time = request.get("phase1_wall_time", record.phase1_wall_time)
@@ -483,12 +879,27 @@ async def update_benchmark(
 
         device_type_str = request.get("device_type")
         if device_type_str:
+            if device_type_str != previous_device_type and not system_settings.current.enable_manual_device_type_correction:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="当前不允许手动修改设备类型"
+                )
             record.device_type = DeviceType[device_type_str] if device_type_str in ['server', 'consumer', 'unknown'] else DeviceType.unknown
+            record.device_type_manually_corrected = _is_manual_device_type(record.cpu_model, record.device_type)
 
         record.device_type_confidence = request.get("device_type_confidence", record.device_type_confidence)
+        apply_benchmark_metrics(record)
         record.updated_at = datetime.now(timezone.utc)
 
-        db.commit()
+        stats_changes = await apply_stats_change(db, previous_sample, stats_sample(record))
+        version = await bump_data_version(
+            db, record_ids=[record.id], stats_groups=[group for group, _ in stats_changes]
+        )
+        await db.commit()
+
+        _apply_leaderboard_change(record.id, record, previous_device_type)
+        cpu_stats_index.apply(stats_changes)
+        data_version.observe(version)
 
         return {
             "success": True,
@@ -501,7 +912,7 @@ async def update_benchmark(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"更新记录失败: {str(e)}"
@@ -511,16 +922,18 @@ async def update_benchmark(
 @router.delete("/{benchmark_id}")
 async def delete_benchmark(
     benchmark_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    current_user: TokenUser = Depends(get_token_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """删除基准测试记录"""
     try:
         # 检查记录是否存在且属于当前用户
-        record = db.query(BenchmarkResult).filter(
-            BenchmarkResult.id == benchmark_id,
-            BenchmarkResult.user_id == current_user.id
-        ).first()
+        record = await db.scalar(
+            select(BenchmarkResult).where(
+                BenchmarkResult.id == benchmark_id,
+                BenchmarkResult.user_id == current_user.id
+            )
+        )
 
         if not record:
             raise HTTPException(
@@ -529,14 +942,21 @@ async def delete_benchmark(
             )
 
         # 删除记录
-        db.delete(record)
-        db.commit()
+        device_type = record.device_type.value if record.device_type else None
+        await db.delete(record)
+        # 同一事务内释放提交名额
+        user_result_count = await release_slot(db, current_user.id)
+        stats_changes = await apply_stats_change(db, stats_sample(record), None)
+        version = await bump_data_version(
+            db, record_ids=[benchmark_id], stats_groups=[group for group, _ in stats_changes]
+        )
+        await db.commit()
+
+        _apply_leaderboard_change(benchmark_id, None, device_type)
+        cpu_stats_index.apply(stats_changes)
+        data_version.observe(version)
 
-        # 获取用户更新后的记录数量
-        user_result_count = db.query(BenchmarkResult).filter(
-            BenchmarkResult.user_id == current_user.id
-        ).count()
-        remaining_slots = 3 - user_result_count
+        remaining_slots = max(0, system_settings.current.max_results_per_user - user_result_count)
 
         return {
             "success": True,
@@ -551,7 +971,7 @@ async def delete_benchmark(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"删除记录失败: {str(e)}"
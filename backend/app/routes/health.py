@@ -2,22 +2,24 @@
 """
 健康检查和基础路由 - 使用 ORM
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.dependencies.database import get_db
-from app.config import CLIENT_ID, CLIENT_SECRET
+from app.dependencies.database import get_async_db
+from app.config import CLIENT_ID, CLIENT_SECRET, ENABLE_METRICS
 
 router = APIRouter(tags=["基础"])
 
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """健康检查"""
     try:
         # 使用 ORM 测试数据库连接
-        result = db.execute(text("SELECT 1 as test")).fetchone()
+        result = (await db.execute(text("SELECT 1 as test"))).fetchone()
         return {
             "status": "healthy",
             "database": "connected",
@@ -29,3 +31,18 @@ async def health_check(db: Session = Depends(get_db)):
             "database": "disconnected",
             "error": str(e)
         }
+
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus 指标"""
+    if not ENABLE_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="未启用指标"
+        )
+    from app.services.metrics import render_metrics
+
+    # 多进程模式需读取全部进程的指标文件，放到线程池中执行
+    content, content_type = await run_in_threadpool(render_metrics)
+    return Response(content=content, headers={"Content-Type": content_type})
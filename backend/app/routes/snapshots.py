@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜快照路由 - 历史排名查询
+"""
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import Optional
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies.database import get_async_db
+from app.dependencies.auth import get_token_user, TokenUser
+from app.models import LeaderboardSnapshot, DeviceType
+
+router = APIRouter(prefix="/api/v1/benchmarks/snapshots", tags=["排行榜快照"])
+
+# 快照前 N 名的最大条数（与排行榜每页上限一致）、历史排名的最大天数
+SNAPSHOT_MAX_LIMIT = 100
+HISTORY_MAX_DAYS = 365
+
+
+def _device_type_filter(device_type: Optional[str]):
+    """榜单过滤条件：未指定设备类型时为总榜（device_type 为 NULL）"""
+    if not device_type:
+        return LeaderboardSnapshot.device_type.is_(None)
+    if device_type not in DeviceType.__members__:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的设备类型"
+        )
+    return LeaderboardSnapshot.device_type == DeviceType[device_type]
+
+
+@router.get("/top")
+async def get_snapshot_top(
+    snapshot_date: Optional[date] = None,
+    device_type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=SNAPSHOT_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取某天快照中榜单前 N 名（默认最近一次快照）"""
+    try:
+        board_filter = _device_type_filter(device_type)
+
+        if snapshot_date is None:
+            snapshot_date = await db.scalar(select(func.max(LeaderboardSnapshot.snapshot_date)))
+            if snapshot_date is None:
+                return {
+                    "success": True,
+                    "data": {"snapshot_date": None, "leaderboard": []},
+                    "message": "暂无排行榜快照"
+                }
+
+        # 走 (snapshot_date, device_type, rank_position) 索引的范围扫描
+        snapshots = (await db.scalars(
+            select(LeaderboardSnapshot).where(
+                LeaderboardSnapshot.snapshot_date == snapshot_date,
+                board_filter,
+                LeaderboardSnapshot.rank_position <= limit
+            ).order_by(LeaderboardSnapshot.rank_position.asc())
+        )).all()
+
+        return {
+            "success": True,
+            "data": {
+                "snapshot_date": snapshot_date.isoformat(),
+                "device_type": device_type or None,
+                "leaderboard": [snapshot.to_dict() for snapshot in snapshots]
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"获取排行榜快照失败: {str(e)}"
+        )
+
+
+@router.get("/my-history")
+async def get_my_rank_history(
+    device_type: Optional[str] = None,
+    days: int = Query(30, ge=1, le=HISTORY_MAX_DAYS),
+    current_user: TokenUser = Depends(get_token_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取当前用户在某榜单中的历史排名"""
+    try:
+        board_filter = _device_type_filter(device_type)
+        since = datetime.now(timezone.utc).date() - timedelta(days=days)
+
+        snapshots = (await db.scalars(
+            select(LeaderboardSnapshot).where(
+                LeaderboardSnapshot.user_id == current_user.id,
+                LeaderboardSnapshot.snapshot_date >= since,
+                board_filter
+            ).order_by(LeaderboardSnapshot.snapshot_date.asc(), LeaderboardSnapshot.rank_position.asc())
+        )).all()
+
+        history = []
+        for snapshot in snapshots:
+            history.append({
+                "snapshot_date": snapshot.snapshot_date.isoformat(),
+                "rank_position": snapshot.rank_position,
+                "benchmark_result_id": snapshot.benchmark_result_id,
+                "overall_wall_time": float(snapshot.overall_wall_time) if snapshot.overall_wall_time else None,
+                "cpu_model": snapshot.cpu_model
+            })
+
+        return {
+            "success": True,
+            "data": {
+                "device_type": device_type or None,
+                "history": history
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"获取历史排名失败: {str(e)}"
+        )
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+服务进程
+
+- DrainingServer: 收到 SIGTERM / SIGINT 时先结束排行榜实时推送连接，再进入 uvicorn 的
+  优雅退出流程（停止接受新连接、等待进行中的请求完成、执行 lifespan 关闭）。
+  SSE 长连接不会自行结束，不先关闭会一直占用到优雅退出超时
+- ProductionWorker: gunicorn worker，固定使用 uvloop + httptools，并使用 DrainingServer
+
+本模块会被 gunicorn 主进程导入（加载 worker 类），不能在模块级导入数据库等应用模块。
+"""
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn import Config, Server
+from uvicorn.workers import UvicornWorker
+
+
+class DrainingServer(Server):
+    """退出前先关闭实时推送连接的 uvicorn Server"""
+
+    def handle_exit(self, sig, frame):
+        if not self.should_exit:
+            from app.services.leaderboard_events import leaderboard_events
+            leaderboard_events.close()
+        super().handle_exit(sig, frame)
+
+
+class ProductionWorker(UvicornWorker):
+    """gunicorn 使用的 uvicorn worker"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    async def _serve(self):
+        self.config.app = self.wsgi
+        # 比 gunicorn 的 graceful_timeout 少留 2 秒执行 lifespan 关闭，超时后取消仍未完成的请求
+        self.config.timeout_graceful_shutdown = max(self.cfg.graceful_timeout - 2, 1)
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+
+def run(app, host: str, port: int):
+    """单进程启动（python app_main.py）"""
+    DrainingServer(Config(app, host=host, port=port, log_level="info")).run()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+业务服务模块
+"""
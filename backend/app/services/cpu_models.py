@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+CPU 型号登记（cpu_models 维度表）
+
+提交和更新记录时把原始型号规范化（app/utils/cpu_model.py）后登记到 cpu_models，
+记录上保存整数外键 cpu_model_id，按型号分组、统计和关联都使用整数键。
+
+CpuModelRegistry 在进程内缓存全部型号（唯一键 -> 型号、ID -> 型号），已登记的型号
+不再访问数据库。规范化只用于生成登记的唯一键，设备类型分类仍按原始型号进行
+（DeviceTypeClassifier 自带缓存），分类结果不随规范化规则变化。型号行只增不改，
+多进程各自缓存不会读到过期数据；新型号用 INSERT IGNORE 登记，并发登记同一型号时
+各进程读到同一个 ID。
+
+已有记录回填（迁移 V010 执行后，在 backend 目录下）:
+    python -m app.services.cpu_models --batch-size 2000
+"""
+import argparse
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, insert, update, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BenchmarkResult, CpuModel
+from app.utils.cpu_model import canonicalize_cpu_model
+
+
+@dataclass(frozen=True)
+class CpuModelRef:
+    """已登记的型号"""
+    id: int
+    name: str
+
+
+_insert_missing = insert(CpuModel).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+
+class CpuModelRegistry:
+    """进程内 CPU 型号缓存"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, CpuModelRef] = {}
+        self._by_id: Dict[int, CpuModelRef] = {}
+
+    async def load(self, db: AsyncSession) -> int:
+        """读取全部型号，返回型号数"""
+        rows = (await db.execute(select(CpuModel.id, CpuModel.model_key, CpuModel.name))).all()
+        for row in rows:
+            self._remember(row.id, row.model_key, row.name)
+        return len(rows)
+
+    def get(self, cpu_model: Optional[str]) -> Optional[CpuModelRef]:
+        """按原始型号查找已缓存的型号（不访问数据库）"""
+        canonical = canonicalize_cpu_model(cpu_model)
+        return self._by_key.get(canonical[1]) if canonical else None
+
+    def by_id(self, cpu_model_id: Optional[int]) -> Optional[CpuModelRef]:
+        return self._by_id.get(cpu_model_id)
+
+    async def resolve(self, db: AsyncSession, cpu_model_id: int) -> Optional[CpuModelRef]:
+        """按 ID 查找，缓存中没有（其他进程登记的型号）时读取数据库"""
+        ref = self._by_id.get(cpu_model_id)
+        if ref is None:
+            row = (await db.execute(
+                select(CpuModel.id, CpuModel.model_key, CpuModel.name).where(CpuModel.id == cpu_model_id)
+            )).one_or_none()
+            if row is not None:
+                ref = self._remember(row.id, row.model_key, row.name)
+        return ref
+
+    async def find(self, db: AsyncSession, cpu_model: Optional[str]) -> Optional[CpuModelRef]:
+        """按原始型号查找已登记的型号，缓存中没有时读取数据库（不登记新型号）"""
+        canonical = canonicalize_cpu_model(cpu_model)
+        if canonical is None:
+            return None
+        ref = self._by_key.get(canonical[1])
+        if ref is None:
+            row = (await db.execute(
+                select(CpuModel.id, CpuModel.name).where(CpuModel.model_key == canonical[1])
+            )).one_or_none()
+            if row is not None:
+                ref = self._remember(row.id, canonical[1], row.name)
+        return ref
+
+    async def intern(self, db: AsyncSession, cpu_model: Optional[str]) -> Optional[CpuModelRef]:
+        """
+        登记原始型号，返回规范化后的型号；型号为空时返回 None
+
+        新型号在单独的短事务中登记并提交（与调用方的写入无关，失败回滚也不影响型号行），
+        因此必须在调用方开始写入之前调用。
+        """
+        canonical = canonicalize_cpu_model(cpu_model)
+        if canonical is None:
+            return None
+        name, model_key = canonical
+        ref = self._by_key.get(model_key)
+        if ref is not None:
+            return ref
+
+        await db.execute(_insert_missing.values(model_key=model_key, name=name))
+        cpu_model_id = await db.scalar(select(CpuModel.id).where(CpuModel.model_key == model_key))
+        await db.commit()
+        return self._remember(cpu_model_id, model_key, name)
+
+    def _remember(self, cpu_model_id: int, model_key: str, name: str) -> CpuModelRef:
+        with self._lock:
+            ref = self._by_id.get(cpu_model_id)
+            if ref is None:
+                ref = CpuModelRef(cpu_model_id, name)
+                self._by_id[cpu_model_id] = ref
+                self._by_key[model_key] = ref
+            return ref
+
+
+# 全局型号缓存
+cpu_model_registry = CpuModelRegistry()
+
+
+def _intern_sync(connection, canonicals: Iterable[Tuple[str, str]], known: Dict[str, int]):
+    """同步登记一批规范化型号，把 唯一键 -> ID 写入 known"""
+    missing = {key: name for name, key in canonicals if key not in known}
+    if not missing:
+        return
+    for key, name in missing.items():
+        connection.execute(_insert_missing.values(model_key=key, name=name))
+    rows = connection.execute(
+        select(CpuModel.model_key, CpuModel.id).where(CpuModel.model_key.in_(list(missing)))
+    ).all()
+    known.update({key: cpu_model_id for key, cpu_model_id in rows})
+
+
+def backfill_cpu_models(batch_size: int = 2000, start_id: int = 0) -> dict:
+    """
+    为已有记录登记型号并回填 cpu_model_id
+
+    按 id > start_id 的键集分页流式读取，每块一个短事务，只回写 cpu_model_id 变化的行；
+    可重复执行，规范化规则调整后重新执行即可（旧型号行保留）。
+
+    Returns:
+        dict: last_id, scanned（扫描行数）, updated（修改行数）, models（登记的型号数）
+    """
+    from app.dependencies.database import engine
+
+    results_table = BenchmarkResult.__table__
+    id_column = results_table.c.id
+    query = select(
+        id_column, results_table.c.cpu_model, results_table.c.cpu_model_id
+    ).order_by(id_column.asc()).limit(batch_size)
+
+    with engine.connect() as connection:
+        known = dict(connection.execute(select(CpuModel.model_key, CpuModel.id)).all())
+
+    progress = {"last_id": start_id, "scanned": 0, "updated": 0}
+    while True:
+        with engine.connect() as reader:
+            rows = reader.execution_options(stream_results=True).execute(
+                query.where(id_column > progress["last_id"])
+            ).all()
+        if not rows:
+            break
+
+        canonicals = {row.id: canonicalize_cpu_model(row.cpu_model) for row in rows}
+        with engine.begin() as writer:
+            _intern_sync(writer, {canonical for canonical in canonicals.values() if canonical}, known)
+            changes = {}
+            for row in rows:
+                canonical = canonicals[row.id]
+                cpu_model_id = known[canonical[1]] if canonical else None
+                if cpu_model_id != row.cpu_model_id:
+                    changes[row.id] = cpu_model_id
+            if changes:
+                writer.execute(update(results_table).where(id_column.in_(list(changes))).values(
+                    cpu_model_id=case(
+                        {row_id: literal(value, results_table.c.cpu_model_id.type) for row_id, value in changes.items()},
+                        value=id_column
+                    ),
+                    # 回填不是用户修改，保持原更新时间
+                    updated_at=results_table.c.updated_at
+                ))
+
+        progress["last_id"] = rows[-1].id
+        progress["scanned"] += len(rows)
+        progress["updated"] += len(changes)
+        print(f"[INFO] 已处理至 id={progress['last_id']}，扫描 {progress['scanned']} 行，已修改 {progress['updated']} 行")
+
+    progress["models"] = len(known)
+    return progress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="登记已有记录的 CPU 型号并回填 cpu_model_id")
+    parser.add_argument("--batch-size", type=int, default=2000, help="每块读取行数")
+    parser.add_argument("--start-id", type=int, default=0, help="从 id 大于该值的记录开始")
+    args = parser.parse_args()
+
+    result = backfill_cpu_models(args.batch_size, args.start_id)
+    print(f"CPU 型号回填完成: 扫描 {result['scanned']} 行，修改 {result['updated']} 行，共 {result['models']} 个型号")
+    print("[INFO] 请继续执行 python -m app.services.cpu_stats 重建型号统计")
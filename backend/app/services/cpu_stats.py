@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+CPU 型号耗时统计
+
+cpu_model_stats 表按 (CPU 型号ID, 设备类型) 保存记录数以及总耗时、Phase 1、Phase 2
+耗时的最佳值、均值和离差平方和（Welford 算法），提交、更新、删除接口在同一事务中增量更新，
+查询统计不需要对 benchmark_results 做 GROUP BY：
+
+- 新增样本：n += 1，delta = x - mean，mean += delta / n，M2 += delta * (x - mean')
+- 移除样本：mean' = (n * mean - x) / (n - 1)，M2 -= (x - mean) * (x - mean')；
+  移除的值不大于最佳值时按 idx_cpu_model_device 重新取最小值
+- 统计行先 INSERT IGNORE 保证存在，再 SELECT ... FOR UPDATE 加锁修改，
+  同一型号的并发提交在该行上排队
+
+三个耗时都不为空的记录才参与统计。应用启动时把统计表读入内存索引（CpuStatsIndex），
+/cpu-stats 按型号查询为字典查找，前 N 个型号从按记录数排序的有序索引中切片。
+
+型号ID 见 app/services/cpu_models.py。迁移、回填型号后或批量修改记录（device_reclassify 等）后
+重建统计（在 backend 目录下）:
+    python -m app.services.cpu_stats --batch-size 2000
+"""
+import argparse
+import math
+import threading
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import BenchmarkResult, CpuModel, CpuModelStats, DeviceType
+from app.services.cpu_models import cpu_model_registry
+
+# 统计列前缀 -> 记录上的耗时列
+STATS_METRICS = {
+    "overall": "overall_wall_time",
+    "phase1": "phase1_wall_time",
+    "phase2": "phase2_wall_time",
+}
+
+# 统计的一条记录：型号ID、设备类型、耗时（与 STATS_METRICS 顺序一致）
+StatsSample = namedtuple("StatsSample", ["cpu_model_id", "device_type", "values"])
+
+# 全部设备类型的型号排名使用的键
+ALL_DEVICE_TYPES = None
+
+# 耗时列的精度（DECIMAL(15, 6)）；请求体中的 float 写入时按该精度舍入
+_TIME_PRECISION = 6
+_TIME_TOLERANCE = 10 ** -_TIME_PRECISION
+
+
+def stats_sample(record) -> Optional[StatsSample]:
+    """记录参与统计的样本；没有型号ID或耗时不完整时返回 None"""
+    if record.cpu_model_id is None:
+        return None
+    values = tuple(getattr(record, column) for column in STATS_METRICS.values())
+    if any(value is None for value in values):
+        return None
+    device_type = record.device_type.value if record.device_type else DeviceType.unknown.value
+    return StatsSample(record.cpu_model_id, device_type, tuple(round(float(value), _TIME_PRECISION) for value in values))
+
+
+def _new_stats(sample: StatsSample) -> CpuModelStats:
+    stats = CpuModelStats(
+        cpu_model_id=sample.cpu_model_id,
+        device_type=DeviceType(sample.device_type),
+        sample_count=0
+    )
+    for prefix in STATS_METRICS:
+        setattr(stats, f"{prefix}_best", None)
+        setattr(stats, f"{prefix}_mean", 0.0)
+        setattr(stats, f"{prefix}_m2", 0.0)
+    return stats
+
+
+def _add_sample(stats: CpuModelStats, values: Tuple[float, ...]):
+    count = stats.sample_count + 1
+    for prefix, value in zip(STATS_METRICS, values):
+        mean = getattr(stats, f"{prefix}_mean")
+        delta = value - mean
+        mean += delta / count
+        setattr(stats, f"{prefix}_mean", mean)
+        setattr(stats, f"{prefix}_m2", getattr(stats, f"{prefix}_m2") + delta * (value - mean))
+        best = getattr(stats, f"{prefix}_best")
+        if best is None or value < best:
+            setattr(stats, f"{prefix}_best", value)
+    stats.sample_count = count
+
+
+def _remove_sample(stats: CpuModelStats, values: Tuple[float, ...]) -> bool:
+    """移除一个样本，返回是否需要重新计算最佳值"""
+    count = stats.sample_count - 1
+    recompute_best = False
+    for prefix, value in zip(STATS_METRICS, values):
+        if count <= 0:
+            setattr(stats, f"{prefix}_mean", 0.0)
+            setattr(stats, f"{prefix}_m2", 0.0)
+            setattr(stats, f"{prefix}_best", None)
+            continue
+        mean = getattr(stats, f"{prefix}_mean")
+        new_mean = (mean * (count + 1) - value) / count
+        setattr(stats, f"{prefix}_mean", new_mean)
+        # 浮点误差可能使结果略小于 0
+        setattr(stats, f"{prefix}_m2", max(getattr(stats, f"{prefix}_m2") - (value - mean) * (value - new_mean), 0.0))
+        best = getattr(stats, f"{prefix}_best")
+        if best is not None and value <= best + _TIME_TOLERANCE:
+            recompute_best = True
+    stats.sample_count = max(count, 0)
+    return recompute_best
+
+
+def stats_entry(stats, cpu_model: Optional[str]) -> dict:
+    """统计行转换为接口返回的条目（cpu_model 为规范型号名称）"""
+    count = stats.sample_count
+    entry = {
+        "cpu_model": cpu_model,
+        "cpu_model_id": stats.cpu_model_id,
+        "device_type": stats.device_type.value if stats.device_type else DeviceType.unknown.value,
+        "sample_count": count,
+    }
+    for prefix, column in STATS_METRICS.items():
+        best = getattr(stats, f"{prefix}_best")
+        m2 = getattr(stats, f"{prefix}_m2")
+        entry[column] = {
+            "best": round(best, 6) if best is not None else None,
+            "mean": round(getattr(stats, f"{prefix}_mean"), 6),
+            # 样本标准差
+            "stddev": round(math.sqrt(m2 / (count - 1)), 6) if count > 1 else 0.0,
+        }
+    return entry
+
+
+_insert_missing = insert(CpuModelStats).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+
+def best_times_query(cpu_model_id: int, device_type):
+    """某个分组各阶段的最小耗时（走 idx_cpu_model_device）"""
+    columns = [getattr(BenchmarkResult, column) for column in STATS_METRICS.values()]
+    return select(*[func.min(column) for column in columns]).where(
+        BenchmarkResult.cpu_model_id == cpu_model_id,
+        BenchmarkResult.device_type == device_type,
+        *[column.isnot(None) for column in columns]
+    )
+
+
+async def _recompute_best(db: AsyncSession, stats: CpuModelStats):
+    """重新取各阶段最小耗时（调用前需 flush 本事务的记录修改）"""
+    row = (await db.execute(best_times_query(stats.cpu_model_id, stats.device_type))).one()
+    for prefix, best in zip(STATS_METRICS, row):
+        setattr(stats, f"{prefix}_best", float(best) if best is not None else None)
+
+
+async def apply_stats_change(db: AsyncSession, before: Optional[StatsSample],
+                             after: Optional[StatsSample]) -> List[Tuple[Tuple[int, str], Optional[dict]]]:
+    """
+    在调用方的事务中把一条记录的变化（before -> after）应用到统计表
+
+    Args:
+        before: 修改前的样本（新增时为 None）
+        after: 修改后的样本（删除时为 None）
+
+    Returns:
+        list: [((型号ID, 设备类型), 统计条目或 None)]，提交后传给 cpu_stats_index.apply
+    """
+    if before == after:
+        return []
+
+    operations = _group_operations([(before, after)])
+    changes = []
+    # 按分组键顺序加锁，避免并发修改两个分组时死锁
+    for group in sorted(operations):
+        cpu_model_id, device_type = group
+        if any(added for added, _ in operations[group]):
+            await db.execute(_insert_missing.values(cpu_model_id=cpu_model_id, device_type=DeviceType(device_type)))
+
+        stats = await db.scalar(_locked_stats_query(group))
+        if stats is None:
+            continue
+
+        recompute_best = _apply_operations(stats, operations[group])
+        if stats.sample_count == 0:
+            await db.delete(stats)
+            changes.append((group, None))
+            continue
+        if recompute_best:
+            await db.flush()
+            await _recompute_best(db, stats)
+        ref = await cpu_model_registry.resolve(db, cpu_model_id)
+        changes.append((group, stats_entry(stats, ref.name if ref else None)))
+    return changes
+
+
+def apply_stats_changes_sync(db: Session, pairs: Iterable[Tuple[Optional[StatsSample], Optional[StatsSample]]]) -> int:
+    """
+    批量任务在调用方的事务中应用一批记录变化（before -> after），调用前需 flush 记录的修改
+
+    调用方把涉及的分组写入变更日志（app/services/data_version.py），运行中的服务据此重新读取这些分组，不返回条目。
+
+    Returns:
+        int: 修改的统计分组数
+    """
+    operations = _group_operations(pair for pair in pairs if pair[0] != pair[1])
+    for group in sorted(operations):
+        cpu_model_id, device_type = group
+        if any(added for added, _ in operations[group]):
+            db.execute(_insert_missing.values(cpu_model_id=cpu_model_id, device_type=DeviceType(device_type)))
+
+        stats = db.scalar(_locked_stats_query(group))
+        if stats is None:
+            continue
+
+        recompute_best = _apply_operations(stats, operations[group])
+        if stats.sample_count == 0:
+            db.delete(stats)
+        elif recompute_best:
+            db.flush()
+            row = db.execute(best_times_query(stats.cpu_model_id, stats.device_type)).one()
+            for prefix, best in zip(STATS_METRICS, row):
+                setattr(stats, f"{prefix}_best", float(best) if best is not None else None)
+    db.flush()
+    return len(operations)
+
+
+def _group_operations(pairs) -> Dict[Tuple[int, str], List[Tuple[bool, StatsSample]]]:
+    """把记录变化拆分为各分组上的 (是否新增, 样本) 操作"""
+    operations: Dict[Tuple[int, str], List[Tuple[bool, StatsSample]]] = {}
+    for before, after in pairs:
+        if before is not None:
+            operations.setdefault((before.cpu_model_id, before.device_type), []).append((False, before))
+        if after is not None:
+            operations.setdefault((after.cpu_model_id, after.device_type), []).append((True, after))
+    return operations
+
+
+def _locked_stats_query(group: Tuple[int, str]):
+    cpu_model_id, device_type = group
+    return select(CpuModelStats).where(
+        CpuModelStats.cpu_model_id == cpu_model_id,
+        CpuModelStats.device_type == DeviceType(device_type)
+    ).with_for_update()
+
+
+def _apply_operations(stats: CpuModelStats, operations: List[Tuple[bool, StatsSample]]) -> bool:
+    """在统计行上增删样本，返回是否需要重新计算最佳值"""
+    recompute_best = False
+    for added, sample in operations:
+        if added:
+            _add_sample(stats, sample.values)
+        else:
+            recompute_best = _remove_sample(stats, sample.values) or recompute_best
+    return recompute_best
+
+
+class CpuStatsIndex:
+    """进程内 CPU 型号统计索引"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[Tuple[int, str], dict] = {}
+        # 设备类型 -> (-记录数, 型号ID, 设备类型) 有序索引
+        self._rankings: Dict[Optional[str], SortedList] = {}
+        self.ready = False
+
+    async def load(self, db: AsyncSession) -> int:
+        """从统计表全量构建索引，返回分组数"""
+        rows = (await db.execute(
+            select(CpuModelStats, CpuModel.name).join(CpuModel, CpuModel.id == CpuModelStats.cpu_model_id)
+        )).all()
+        with self._lock:
+            self._entries.clear()
+            self._rankings = {}
+            for stats, name in rows:
+                entry = stats_entry(stats, name)
+                self._insert((entry["cpu_model_id"], entry["device_type"]), entry)
+            self.ready = True
+            return len(self._entries)
+
+    async def load_groups(self, db: AsyncSession, groups: Iterable[Tuple[int, str]]) -> int:
+        """从统计表重新读取指定分组并替换索引中的条目（已删除的分组移出索引），返回分组数"""
+        groups = set(groups)
+        rows = (await db.execute(
+            select(CpuModelStats, CpuModel.name).join(CpuModel, CpuModel.id == CpuModelStats.cpu_model_id).where(
+                CpuModelStats.cpu_model_id.in_({cpu_model_id for cpu_model_id, _ in groups})
+            )
+        )).all() if groups else []
+        entries = {}
+        for stats, name in rows:
+            entry = stats_entry(stats, name)
+            entries[(entry["cpu_model_id"], entry["device_type"])] = entry
+        self.apply([(group, entries.get(group)) for group in groups])
+        return len(groups)
+
+    def apply(self, changes: List[Tuple[Tuple[int, str], Optional[dict]]]):
+        """应用 apply_stats_change 返回的变更"""
+        with self._lock:
+            for group, entry in changes:
+                self._discard(group)
+                if entry is not None:
+                    self._insert(group, entry)
+
+    def get(self, cpu_model_id: int, device_type: Optional[str] = None) -> List[dict]:
+        """某个型号的统计（未指定设备类型时返回各设备类型的统计）"""
+        device_types = [device_type] if device_type else list(DeviceType.__members__)
+        entries = [self._entries.get((cpu_model_id, name)) for name in device_types]
+        return [entry for entry in entries if entry is not None]
+
+    def top(self, device_type: Optional[str], limit: int) -> List[dict]:
+        """记录数最多的前 limit 个型号"""
+        with self._lock:
+            ranking = self._rankings.get(device_type)
+            if not ranking:
+                return []
+            return [self._entries[(key, name)] for _, key, name in ranking[:limit]]
+
+    def _insert(self, group: Tuple[int, str], entry: dict):
+        self._entries[group] = entry
+        ranking_key = (-entry["sample_count"], *group)
+        for device_type in (ALL_DEVICE_TYPES, group[1]):
+            self._rankings.setdefault(device_type, SortedList()).add(ranking_key)
+
+    def _discard(self, group: Tuple[int, str]):
+        entry = self._entries.pop(group, None)
+        if entry is None:
+            return
+        ranking_key = (-entry["sample_count"], *group)
+        for device_type in (ALL_DEVICE_TYPES, group[1]):
+            self._rankings[device_type].discard(ranking_key)
+
+
+# 全局索引实例
+cpu_stats_index = CpuStatsIndex()
+
+
+def rebuild_cpu_stats(batch_size: int = 2000) -> dict:
+    """
+    从全部记录重建统计表（记录的 cpu_model_id 需已回填）
+
+    按 id 键集分页流式读取，统计在内存中累计后在一个事务中替换整表并递增数据版本，
+    运行中的服务随后自动重新加载统计索引。重建期间的新提交可能被覆盖，请在低峰期执行。
+
+    Returns:
+        dict: scanned（扫描行数）, groups（统计分组数）
+    """
+    from app.dependencies.database import engine, SessionLocal
+
+    results_table = BenchmarkResult.__table__
+    query = select(
+        results_table.c.id,
+        results_table.c.cpu_model_id,
+        results_table.c.device_type,
+        *[results_table.c[column] for column in STATS_METRICS.values()]
+    ).order_by(results_table.c.id.asc()).limit(batch_size)
+
+    progress = {"scanned": 0, "groups": 0}
+    groups: Dict[Tuple[int, str], CpuModelStats] = {}
+    last_id = 0
+    while True:
+        with engine.connect() as reader:
+            rows = reader.execution_options(stream_results=True).execute(
+                query.where(results_table.c.id > last_id)
+            ).all()
+        if not rows:
+            break
+
+        for row in rows:
+            sample = stats_sample(row)
+            if sample is None:
+                continue
+            stats = groups.get((sample.cpu_model_id, sample.device_type))
+            if stats is None:
+                stats = groups[(sample.cpu_model_id, sample.device_type)] = _new_stats(sample)
+            _add_sample(stats, sample.values)
+
+        last_id = rows[-1].id
+        progress["scanned"] += len(rows)
+        print(f"[INFO] 已处理至 id={last_id}，扫描 {progress['scanned']} 行")
+
+    from app.services.data_version import bump_data_version_sync
+
+    with SessionLocal() as db:
+        db.execute(delete(CpuModelStats))
+        db.add_all(groups.values())
+        db.flush()
+        # 整表替换，不列出分组：写入整表变更标记，运行中的服务全量重新加载
+        bump_data_version_sync(db.connection())
+        db.commit()
+    progress["groups"] = len(groups)
+    return progress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="重建 CPU 型号统计")
+    parser.add_argument("--batch-size", type=int, default=2000, help="每块读取行数")
+    args = parser.parse_args()
+
+    result = rebuild_cpu_stats(args.batch_size)
+    print(f"CPU 型号统计重建完成: 扫描 {result['scanned']} 行，共 {result['groups']} 个分组")
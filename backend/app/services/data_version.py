@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜数据版本（data_versions 表）与数据变更日志（data_changes 表）
+
+排行榜内存索引、CPU 型号统计索引和排行榜响应缓存都是进程内状态，写接口提交后只更新本进程。
+多进程部署（gunicorn 多 worker）时其他进程需要感知这些写入：
+
+- 写入 benchmark_results / cpu_model_stats 的事务在提交前调用 bump_data_version() 把版本号加一，
+  并以新版本号写入本次变更涉及的记录 ID、用户 ID 和型号统计分组；版本行的行锁使版本号顺序与提交顺序一致
+- 后台任务每隔 DATA_VERSION_REFRESH_SECONDS 秒查询版本号，与本进程已同步的版本不同时读取两个版本之间的
+  变更日志，只重新读取涉及的记录和统计分组增量更新两个索引，并使响应缓存失效；
+  其他进程的写入最多延迟一个轮询间隔可见
+- 变更日志不连续（落后超过 DATA_CHANGE_RETENTION_SECONDS 的日志已被删除）、包含整表变更标记
+  （如重建型号统计）或涉及的记录超过 DATA_CHANGE_MAX_RECORDS 时，改为全量重新加载
+- 本进程写入得到的版本号紧接已同步的版本时（期间没有其他进程写入），本进程已增量更新，
+  直接记为已同步；单进程部署因此不会因自身写入重新读取
+- 批量任务（device_reclassify、metrics_backfill、cpu_stats 重建）每次写入同样加一并写入变更日志
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import DATA_CHANGE_RETENTION_SECONDS, DATA_CHANGE_MAX_RECORDS
+from app.dependencies.database import increment_returning
+from app.models import DataVersion, DataChange
+from app.services.leaderboard_index import leaderboard_index
+from app.services.cpu_stats import cpu_stats_index
+from app.services.response_cache import leaderboard_cache
+
+# 排行榜与 CPU 型号统计共用的版本行
+DATA_VERSION_NAME = "benchmark_results"
+
+_VERSION_QUERY = select(DataVersion.version).where(DataVersion.name == DATA_VERSION_NAME)
+_BUMP = update(DataVersion).where(DataVersion.name == DATA_VERSION_NAME).values(version=DataVersion.version + 1)
+_INSERT_MISSING = insert(DataVersion).prefix_with("IGNORE", dialect="mysql").prefix_with(
+    "OR IGNORE", dialect="sqlite"
+).values(name=DATA_VERSION_NAME, version=0)
+_CHANGES_QUERY = select(
+    DataChange.version, DataChange.benchmark_id, DataChange.user_id, DataChange.cpu_model_id, DataChange.device_type
+)
+
+
+def _change_rows(version: int, record_ids: Iterable[int], user_ids: Iterable[int],
+                 stats_groups: Iterable[Tuple[int, str]]) -> List[dict]:
+    """一个版本的变更日志行（键相同，以一条多行 INSERT 写入）；未指明变更范围时写入一行整表变更标记"""
+    empty = {"version": version, "benchmark_id": None, "user_id": None, "cpu_model_id": None, "device_type": None}
+    rows = [{**empty, "benchmark_id": record_id} for record_id in set(record_ids)]
+    rows += [{**empty, "user_id": user_id} for user_id in set(user_ids)]
+    rows += [{**empty, "cpu_model_id": cpu_model_id, "device_type": device_type}
+             for cpu_model_id, device_type in set(stats_groups)]
+    return rows or [empty]
+
+
+async def bump_data_version(db: AsyncSession, record_ids: Iterable[int] = (), user_ids: Iterable[int] = (),
+                            stats_groups: Iterable[Tuple[int, str]] = ()) -> Optional[int]:
+    """
+    在调用方的事务中把版本号加一并写入变更日志，返回新版本号
+
+    先写入会话中待提交的修改，使版本行锁只持有到紧随其后的提交；新版本号随 UPDATE 取回。
+    提交后把返回值传给 data_version.observe()。
+
+    Args:
+        record_ids: 新增、修改或删除的记录 ID
+        user_ids: 资料变更的用户 ID（其他进程重新读取该用户的全部记录）
+        stats_groups: 变化的型号统计分组 (cpu_model_id, device_type)
+    """
+    await db.flush()
+    version = await increment_returning(
+        db, update(DataVersion).where(DataVersion.name == DATA_VERSION_NAME), DataVersion.version, 1
+    )
+    await db.execute(insert(DataChange).values(_change_rows(version, record_ids, user_ids, stats_groups)))
+    return version
+
+
+def bump_data_version_sync(connection: Connection, record_ids: Iterable[int] = (), user_ids: Iterable[int] = (),
+                           stats_groups: Iterable[Tuple[int, str]] = ()):
+    """批量任务在写入事务中把版本号加一并写入变更日志（参数同 bump_data_version，均未指定时为整表变更）"""
+    connection.execute(_BUMP)
+    version = connection.scalar(_VERSION_QUERY)
+    connection.execute(insert(DataChange).values(_change_rows(version, record_ids, user_ids, stats_groups)))
+
+
+class DataVersionTracker:
+    """本进程内存索引已同步的数据版本"""
+
+    def __init__(self):
+        self._version: Optional[int] = None
+
+    async def load(self, db: AsyncSession) -> int:
+        """登记版本行（不存在时）并读取当前版本，须在构建索引之前调用"""
+        await db.execute(_INSERT_MISSING)
+        await db.commit()
+        self._version = await db.scalar(_VERSION_QUERY)
+        return self._version
+
+    def observe(self, version: Optional[int]):
+        """本进程的写入提交并更新索引后调用：版本号紧接已同步的版本时记为已同步"""
+        if version is not None and self._version is not None and version == self._version + 1:
+            self._version = version
+
+    async def refresh(self, db: AsyncSession) -> Optional[str]:
+        """
+        版本变化时同步索引并使响应缓存失效
+
+        同一事务内读取版本号、变更日志和索引数据；同步期间本进程的写入会在下次轮询时再次同步。
+
+        Returns:
+            Optional[str]: incremental（增量同步）/ full（全量重新加载）；版本未变化时返回 None
+        """
+        version = await db.scalar(_VERSION_QUERY)
+        if version is None or version == self._version:
+            return None
+
+        changes = []
+        if self._version is not None and version > self._version:
+            changes = (await db.execute(_CHANGES_QUERY.where(
+                DataChange.version > self._version, DataChange.version <= version
+            ))).all()
+
+        if self._is_incremental(changes, version):
+            await self._apply_changes(db, changes)
+            mode = "incremental"
+        else:
+            if leaderboard_index.ready:
+                await leaderboard_index.load(db)
+            if cpu_stats_index.ready:
+                await cpu_stats_index.load(db)
+            mode = "full"
+        leaderboard_cache.invalidate()
+        self._version = version
+        return mode
+
+    def _is_incremental(self, changes, version: int) -> bool:
+        """变更日志覆盖两个版本之间的每个版本、没有整表变更标记且记录数未超过上限时可增量同步"""
+        if self._version is None or {change.version for change in changes} != set(range(self._version + 1, version + 1)):
+            return False
+        if any(change.benchmark_id is None and change.user_id is None and change.cpu_model_id is None
+               for change in changes):
+            return False
+        return sum(change.benchmark_id is not None for change in changes) <= DATA_CHANGE_MAX_RECORDS
+
+    @staticmethod
+    async def _apply_changes(db: AsyncSession, changes):
+        record_ids = {change.benchmark_id for change in changes if change.benchmark_id is not None}
+        user_ids = {change.user_id for change in changes if change.user_id is not None}
+        groups = {(change.cpu_model_id, change.device_type) for change in changes if change.cpu_model_id is not None}
+        if leaderboard_index.ready:
+            await leaderboard_index.load_records(db, record_ids, user_ids)
+        if cpu_stats_index.ready and groups:
+            await cpu_stats_index.load_groups(db, groups)
+
+
+data_version = DataVersionTracker()
+
+
+async def prune_data_changes(db: AsyncSession) -> int:
+    """删除超过保留时间的变更日志，返回删除的行数"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=DATA_CHANGE_RETENTION_SECONDS)
+    result = await db.execute(delete(DataChange).where(DataChange.created_at < cutoff))
+    await db.commit()
+    return result.rowcount
+
+
+async def run_data_version_refresher(session_factory, interval: float):
+    """后台定期检查数据版本，每个保留周期清理一次过期的变更日志"""
+    pruned_at = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                mode = await data_version.refresh(db)
+                if mode == "full":
+                    print("[INFO] 检测到其他进程的写入（变更日志不完整或整表变更），已全量重新加载排行榜与 CPU 型号统计索引")
+                if time.monotonic() - pruned_at >= DATA_CHANGE_RETENTION_SECONDS:
+                    pruned_at = time.monotonic()
+                    await prune_data_changes(db)
+        except Exception as e:
+            print(f"[ERROR] 数据版本刷新失败: {e}")
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+设备类型批量重新分类任务
+
+关键词列表调整后，按主键分块流式读取 benchmark_results，用当前分类器重新计算
+device_type / device_type_confidence，只回写发生变化的行。
+
+- 每块是一个独立的短事务：按 id > last_id 的键集分页读取（服务端游标），
+  以一条 UPDATE ... SET col = CASE id WHEN ... END WHERE id IN (...) 写回
+- 同一 cpu_model 在整个任务中只分类一次，与提交接口一致按原始型号分类
+- 跳过 device_type_manually_corrected 为真的行：写回前在事务中加锁重新读取待修改的行，
+  跳过期间被手动修正的行，修改行数取 UPDATE 实际影响的行数
+- 设备类型变化的记录在同一事务中从原分组移到新分组（cpu_model_stats 增量更新，无需重建统计）
+- 每块提交后把进度写入检查点文件，中断后再次执行会从检查点继续，完成后删除检查点
+
+使用方法（在 backend 目录下）:
+    python -m app.services.device_reclassify --batch-size 2000
+    python -m app.services.device_reclassify --dry-run
+
+每块写入时递增数据版本并记下修改的记录和移动的统计分组（app/services/data_version.py），运行中的服务
+在下一个检查间隔内增量同步排行榜与 CPU 型号统计内存索引。
+"""
+import argparse
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, update, case, literal, or_
+
+from app.dependencies.database import engine, SessionLocal
+from app.models import BenchmarkResult, DeviceType
+from app.services.cpu_stats import STATS_METRICS, stats_sample, apply_stats_changes_sync
+from app.services.data_version import bump_data_version_sync
+from app.utils.checkpoint import new_checkpoint, load_checkpoint, save_checkpoint, clear_checkpoint
+from app.utils.device_classifier import DeviceTypeClassifier
+
+DEFAULT_CHECKPOINT = "device_reclassify.checkpoint.json"
+
+results_table = BenchmarkResult.__table__
+
+# 未被手动修正的行
+_NOT_CORRECTED = or_(
+    results_table.c.device_type_manually_corrected.is_(None),
+    results_table.c.device_type_manually_corrected.is_(False)
+)
+
+
+def _classify(cpu_model: Optional[str], classifications: Dict) -> Tuple[DeviceType, Decimal]:
+    """分类并转换为列类型（同一型号只计算一次）"""
+    result = classifications.get(cpu_model)
+    if result is None:
+        device_type, confidence = DeviceTypeClassifier.classify_cpu(cpu_model)
+        result = classifications[cpu_model] = (
+            DeviceType[device_type],
+            Decimal(str(confidence)).quantize(Decimal("0.01"))
+        )
+    return result
+
+
+def _update_statement(changes: Dict[int, Tuple[DeviceType, Decimal]]):
+    """生成一块变更的 UPDATE ... CASE 语句"""
+    id_column = results_table.c.id
+    device_type_column = results_table.c.device_type
+    confidence_column = results_table.c.device_type_confidence
+
+    return update(results_table).where(
+        id_column.in_(list(changes)),
+        _NOT_CORRECTED
+    ).values(
+        device_type=case(
+            {row_id: literal(device_type, device_type_column.type) for row_id, (device_type, _) in changes.items()},
+            value=id_column
+        ),
+        device_type_confidence=case(
+            {row_id: literal(confidence, confidence_column.type) for row_id, (_, confidence) in changes.items()},
+            value=id_column
+        ),
+        # 重新分类不是用户修改，保持原更新时间
+        updated_at=results_table.c.updated_at
+    )
+
+
+def _write_changes(changes: Dict[int, Tuple[DeviceType, Decimal]]) -> int:
+    """
+    在一个事务中写回一块变更并移动设备类型变化的记录的型号统计
+
+    Returns:
+        int: 实际修改的行数
+    """
+    with SessionLocal() as db, db.begin():
+        # 加锁重新读取：跳过读取后被手动修正的行，统计按锁定时的耗时移动
+        locked = db.execute(
+            select(
+                results_table.c.id,
+                results_table.c.cpu_model_id,
+                results_table.c.device_type,
+                *[results_table.c[column] for column in STATS_METRICS.values()]
+            ).where(results_table.c.id.in_(list(changes)), _NOT_CORRECTED).with_for_update()
+        ).all()
+        changes = {row.id: changes[row.id] for row in locked}
+        if not changes:
+            return 0
+
+        updated = db.execute(_update_statement(changes)).rowcount
+        moves = []
+        for row in locked:
+            before = stats_sample(row)
+            device_type = changes[row.id][0].value
+            if before is not None and before.device_type != device_type:
+                moves.append((before, before._replace(device_type=device_type)))
+        apply_stats_changes_sync(db, moves)
+        bump_data_version_sync(
+            db.connection(), record_ids=list(changes),
+            stats_groups=[(sample.cpu_model_id, sample.device_type) for move in moves for sample in move]
+        )
+        return updated
+
+
+def reclassify_device_types(batch_size: int = 2000, checkpoint_path: str = DEFAULT_CHECKPOINT,
+                            dry_run: bool = False, restart: bool = False) -> dict:
+    """
+    重新分类全部未手动修正的记录
+
+    Args:
+        batch_size: 每块读取的行数
+        checkpoint_path: 检查点文件路径
+        dry_run: 只统计需要修改的行数，不写库也不写检查点
+        restart: 忽略已有检查点，从头开始
+
+    Returns:
+        dict: last_id, scanned（扫描行数）, updated（修改行数）
+    """
+    checkpoint = new_checkpoint() if restart else load_checkpoint(checkpoint_path)
+    if checkpoint["last_id"]:
+        print(f"[INFO] 从检查点继续: id > {checkpoint['last_id']}")
+
+    classifications = {}
+    query = select(
+        results_table.c.id,
+        results_table.c.cpu_model,
+        results_table.c.device_type,
+        results_table.c.device_type_confidence
+    ).where(_NOT_CORRECTED).order_by(results_table.c.id.asc()).limit(batch_size)
+
+    while True:
+        with engine.connect() as reader:
+            rows = reader.execution_options(stream_results=True).execute(
+                query.where(results_table.c.id > checkpoint["last_id"])
+            ).all()
+        if not rows:
+            break
+
+        changes = {}
+        for row in rows:
+            device_type, confidence = _classify(row.cpu_model, classifications)
+            if row.device_type != device_type or row.device_type_confidence != confidence:
+                changes[row.id] = (device_type, confidence)
+
+        updated = len(changes)
+        if changes and not dry_run:
+            updated = _write_changes(changes)
+
+        checkpoint["last_id"] = rows[-1].id
+        checkpoint["scanned"] += len(rows)
+        checkpoint["updated"] += updated
+        if not dry_run:
+            save_checkpoint(checkpoint_path, checkpoint)
+        print(f"[INFO] 已处理至 id={checkpoint['last_id']}，扫描 {checkpoint['scanned']} 行，"
+              f"{'待修改' if dry_run else '已修改'} {checkpoint['updated']} 行")
+
+    if not dry_run:
+        clear_checkpoint(checkpoint_path)
+    print(f"[INFO] 共 {len(classifications)} 个不同的 CPU 型号")
+    return checkpoint
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="按当前关键词重新分类已有记录的设备类型")
+    parser.add_argument("--batch-size", type=int, default=2000, help="每块读取行数")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="检查点文件路径")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写入")
+    parser.add_argument("--restart", action="store_true", help="忽略检查点，从头开始")
+    args = parser.parse_args()
+
+    result = reclassify_device_types(args.batch_size, args.checkpoint, args.dry_run, args.restart)
+    print(f"重新分类完成: 扫描 {result['scanned']} 行，"
+          f"{'待修改' if args.dry_run else '已修改'} {result['updated']} 行")
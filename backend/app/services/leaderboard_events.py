@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜实时推送（SSE）
+
+提交、更新、删除接口提交事务后调用 leaderboard_events.publish()，变更按频道
+（总榜 all 与各设备类型）在 LEADERBOARD_STREAM_COALESCE_SECONDS 窗口内合并，
+每个窗口每个频道最多推送一条增量：
+
+    {"channel": "server", "seq": 12, "total": 345, "min_rank": 17,
+     "changes": [{"id": 5, "action": "upsert", "rank": 17, "previous_rank": 40},
+                 {"id": 9, "action": "remove", "rank": null, "previous_rank": 3}]}
+
+- rank / previous_rank 为按总耗时正序的排名（排名索引未就绪时为 null），
+  min_rank 之前的排名不受影响，客户端据此判断当前页是否需要刷新
+- 每个连接的待发送队列长度固定（LEADERBOARD_STREAM_QUEUE_SIZE），慢消费者的队列满时
+  丢弃积压的增量并改为推送一条 reset，客户端收到后重新拉取，内存占用不随积压增长
+- 推送只覆盖本进程处理的写入：多进程部署时连接在其他 worker 上的客户端
+  收不到本 worker 的变更（可配合 Nginx 会话保持或在前端保留低频刷新）
+"""
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set
+
+from app.config import (
+    LEADERBOARD_STREAM_COALESCE_SECONDS, LEADERBOARD_STREAM_QUEUE_SIZE, LEADERBOARD_STREAM_MAX_CLIENTS
+)
+from app.services.leaderboard_index import leaderboard_index, ALL_DEVICE_TYPES
+
+# 总榜频道名
+ALL_CHANNEL = "all"
+
+# 队列溢出后推送的重置事件
+RESET = object()
+
+# 服务关闭时放入队列，连接随即结束（客户端按 retry 间隔重连到其他 worker 或新进程）
+CLOSE = object()
+
+
+def channel_name(device_type: Optional[str]) -> str:
+    """设备类型对应的频道名（None 为总榜）"""
+    return device_type or ALL_CHANNEL
+
+
+@dataclass
+class _PendingChange:
+    """窗口内某条记录在某频道的合并变更"""
+    removed: bool
+    previous_rank: Optional[int]
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """一个 SSE 连接"""
+    channel: str
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=LEADERBOARD_STREAM_QUEUE_SIZE))
+
+    def offer(self, message):
+        """放入队列；队列已满时清空积压，只保留一条 reset（或 close）"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(CLOSE if message is CLOSE else RESET)
+
+
+class StreamLimitExceeded(Exception):
+    """连接数已达上限"""
+
+
+class StreamClosed(Exception):
+    """服务正在关闭，不再接受新连接"""
+
+
+class LeaderboardEvents:
+    """按频道合并排行榜变更并分发给订阅者"""
+
+    def __init__(self, coalesce_seconds: float = LEADERBOARD_STREAM_COALESCE_SECONDS,
+                 max_clients: int = LEADERBOARD_STREAM_MAX_CLIENTS):
+        self.coalesce_seconds = coalesce_seconds
+        self.max_clients = max_clients
+        self.seq = 0
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._pending: Dict[str, Dict[int, _PendingChange]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.closed = False
+
+    @property
+    def client_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, device_type: Optional[str]) -> Subscriber:
+        """
+        订阅频道
+
+        Raises:
+            StreamClosed: 服务正在关闭
+            StreamLimitExceeded: 连接数已达上限
+        """
+        if self.closed:
+            raise StreamClosed()
+        if self.client_count >= self.max_clients:
+            raise StreamLimitExceeded()
+        subscriber = Subscriber(channel_name(device_type))
+        self._subscribers.setdefault(subscriber.channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.channel)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.channel]
+
+    def close(self):
+        """服务关闭时结束全部连接（须在事件循环中调用），之后的订阅请求返回 503"""
+        self.closed = True
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                subscriber.offer(CLOSE)
+
+    def publish(self, benchmark_id: int, device_types: Iterable[Optional[str]], removed: bool = False,
+                previous_ranks: Optional[Dict[Optional[str], int]] = None):
+        """
+        记录一次已提交的变更（须在事件循环中调用）
+
+        Args:
+            benchmark_id: 记录 ID
+            device_types: 变更涉及的设备类型（更新时包含修改前后的设备类型）
+            removed: 是否为删除
+            previous_ranks: 变更前的排名（leaderboard_index.ranks_of 的返回值）
+        """
+        previous_ranks = previous_ranks or {}
+        channels = {ALL_CHANNEL: previous_ranks.get(ALL_DEVICE_TYPES)}
+        for device_type in device_types:
+            if device_type:
+                channels[device_type] = previous_ranks.get(device_type)
+
+        for channel, previous_rank in channels.items():
+            pending = self._pending.setdefault(channel, {})
+            change = pending.get(benchmark_id)
+            if change is None:
+                pending[benchmark_id] = _PendingChange(removed, previous_rank)
+            else:
+                # 同一窗口内多次变更：保留窗口开始前的排名，动作以最后一次为准
+                change.removed = removed
+
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.coalesce_seconds, self._flush)
+
+    def _flush(self):
+        """推送窗口内合并后的变更"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+
+        for channel, changes in pending.items():
+            subscribers = self._subscribers.get(channel)
+            if not subscribers:
+                continue
+            message = self._build_delta(channel, changes)
+            if not message["changes"]:
+                continue
+            for subscriber in subscribers:
+                subscriber.offer(message)
+
+    def _build_delta(self, channel: str, changes: Dict[int, _PendingChange]) -> dict:
+        self.seq += 1
+        device_type = None if channel == ALL_CHANNEL else channel
+        index_ready = leaderboard_index.ready
+
+        items = []
+        ranks = []
+        for benchmark_id, change in changes.items():
+            rank = None
+            removed = change.removed
+            if not removed and index_ready:
+                rank = leaderboard_index.ranks_of(benchmark_id).get(device_type)
+                # 更新后不再属于该榜单（设备类型变化或耗时被清空）
+                removed = rank is None
+            if index_ready and rank is None and change.previous_rank is None:
+                # 变更前后都不在该榜单上
+                continue
+            items.append({
+                "id": benchmark_id,
+                "action": "remove" if removed else "upsert",
+                "rank": rank,
+                "previous_rank": change.previous_rank
+            })
+            ranks.extend(r for r in (rank, change.previous_rank) if r is not None)
+
+        # 索引未就绪时排名未知，无法确定影响范围
+        return {
+            "channel": channel,
+            "seq": self.seq,
+            "total": leaderboard_index.total(device_type) if index_ready else None,
+            "min_rank": min(ranks) if index_ready and ranks else None,
+            "changes": items
+        }
+
+
+def format_event(message) -> bytes:
+    """把增量编码为 SSE 事件"""
+    if message is RESET:
+        return b"event: reset\ndata: {}\n\n"
+    data = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {message['seq']}\nevent: leaderboard\ndata: {data}\n\n".encode("utf-8")
+
+
+# 全局实例
+leaderboard_events = LeaderboardEvents()
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜内存排名索引
+
+按 (排序方式, 设备类型) 维护 (排序值, id) 有序索引（顺序统计结构），
+任意页数据和总数都在 O(log n + limit) 内返回，用户记录的排名为二分查找，无需查询数据库。
+
+索引在应用启动时从 BenchmarkResult 全量构建（用户名和头像冗余存储在记录上，
+无需关联 users），之后由提交、更新、删除接口以及用户资料刷新（OAuth 回调）增量维护。
+索引未就绪时调用方应回退到数据库查询。
+"""
+import threading
+from collections import namedtuple
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+from sqlalchemy import select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BenchmarkResult
+from app.utils.serialization import RowSerializer
+
+# 全部设备类型的排行榜使用的键
+ALL_DEVICE_TYPES = None
+
+# 排行榜排序方式：名称 -> (排序列, 是否降序)；榜单顺序为 (排序列, id) 同向排序
+LEADERBOARD_SORTS = {
+    "time": ("overall_wall_time", False),
+    "score": ("performance_score", True),
+    "per_core": ("performance_per_core", True),
+}
+DEFAULT_SORT = "time"
+
+# 排行榜读取的列（排行榜查询只取这些列，不加载整行）
+LEADERBOARD_COLUMNS = (
+    BenchmarkResult.id,
+    BenchmarkResult.user_id,
+    BenchmarkResult.username,
+    BenchmarkResult.avatar_url,
+    BenchmarkResult.cpu_model,
+    BenchmarkResult.cpu_cores,
+    BenchmarkResult.memory_gb,
+    BenchmarkResult.phase1_wall_time,
+    BenchmarkResult.phase2_wall_time,
+    BenchmarkResult.overall_wall_time,
+    BenchmarkResult.device_type,
+    BenchmarkResult.device_type_confidence,
+    BenchmarkResult.performance_score,
+    BenchmarkResult.performance_per_core,
+    BenchmarkResult.throughput_keys_per_sec,
+    BenchmarkResult.submitted_at,
+)
+
+
+def _to_decimal(value) -> Decimal:
+    """统一排序键的数值类型（数据库为 DECIMAL，请求体为 float）"""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _board_key(sort: str, value, benchmark_id: int) -> Tuple[Decimal, int]:
+    """排序键：降序榜单取负值，使所有榜单在 SortedList 中按升序即为榜单顺序"""
+    value = _to_decimal(value)
+    if LEADERBOARD_SORTS[sort][1]:
+        return -value, -benchmark_id
+    return value, benchmark_id
+
+
+# 记录在某个榜单中的排名：position 为按 (排序值, id) 排列的位置，与排行榜各行的 rank 编号一致
+# （排序值相同的记录按 id 先后排名），倒序排名为 total - position + 1；total 为榜单记录数
+BoardRank = namedtuple("BoardRank", ["position", "total"])
+
+
+# 排行榜、我的记录和记录详情中设备类型字段为空时的取值
+ENTRY_DEFAULTS = {"device_type": "unknown", "device_type_confidence": 0.0}
+
+_entry_serializer = RowSerializer(LEADERBOARD_COLUMNS, exclude=("user_id",), defaults=ENTRY_DEFAULTS)
+
+
+def build_entry(benchmark) -> dict:
+    """构建排行榜条目（不含排名），benchmark 为 BenchmarkResult 或按 LEADERBOARD_COLUMNS 查询的行"""
+    if isinstance(benchmark, BenchmarkResult):
+        return _entry_serializer.from_object(benchmark)
+    return _entry_serializer(benchmark)
+
+
+class LeaderboardIndex:
+    """进程内排行榜排名索引"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[int, dict] = {}
+        self._keys: Dict[int, Tuple[int, str, Dict[str, Tuple[Decimal, int]]]] = {}
+        self._user_records: Dict[int, Set[int]] = {}
+        self._boards: Dict[Tuple[str, Optional[str]], SortedList] = {}
+        self.ready = False
+
+    async def load(self, db: AsyncSession) -> int:
+        """从数据库全量构建索引，返回索引的记录数"""
+        rows = (await db.execute(select(*LEADERBOARD_COLUMNS))).all()
+
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._user_records.clear()
+            self._boards = {}
+            for row in rows:
+                self._insert(row)
+            self.ready = True
+            return len(self._entries)
+
+    async def load_records(self, db: AsyncSession, record_ids: Set[int], user_ids: Set[int]) -> int:
+        """从数据库重新读取指定记录和指定用户的全部记录并替换索引中的条目（已删除的记录移出索引），返回读取的行数"""
+        conditions = []
+        if record_ids:
+            conditions.append(BenchmarkResult.id.in_(record_ids))
+        if user_ids:
+            conditions.append(BenchmarkResult.user_id.in_(user_ids))
+        if not conditions:
+            return 0
+        rows = (await db.execute(select(*LEADERBOARD_COLUMNS).where(or_(*conditions)))).all()
+
+        with self._lock:
+            for user_id in user_ids:
+                for benchmark_id in list(self._user_records.get(user_id, ())):
+                    self._discard(benchmark_id)
+            for benchmark_id in record_ids:
+                self._discard(benchmark_id)
+            for row in rows:
+                self._discard(row.id)
+                self._insert(row)
+            return len(rows)
+
+    def upsert(self, benchmark: BenchmarkResult):
+        """新增或更新一条记录"""
+        with self._lock:
+            self._discard(benchmark.id)
+            self._insert(benchmark)
+
+    def update_user(self, user_id: int, username: str, avatar_url: Optional[str]) -> int:
+        """更新某用户全部记录的用户名和头像，返回更新的条目数"""
+        with self._lock:
+            record_ids = self._user_records.get(user_id, ())
+            for benchmark_id in record_ids:
+                # 条目字典会被 page() 浅拷贝返回，替换而非原地修改
+                self._entries[benchmark_id] = {
+                    **self._entries[benchmark_id], "username": username, "avatar_url": avatar_url
+                }
+            return len(record_ids)
+
+    def remove(self, benchmark_id: int):
+        """删除一条记录"""
+        with self._lock:
+            self._discard(benchmark_id)
+
+    def ranks_of(self, benchmark_id: int, sort: str = DEFAULT_SORT) -> Dict[Optional[str], int]:
+        """记录在总榜（键为 None）和所属设备类型榜单中的排名，未索引时返回空字典"""
+        with self._lock:
+            indexed = self._keys.get(benchmark_id)
+            if indexed is None or sort not in indexed[2]:
+                return {}
+            _, device_type, keys = indexed
+            key = keys[sort]
+            return {
+                ALL_DEVICE_TYPES: self._boards[(sort, ALL_DEVICE_TYPES)].bisect_left(key) + 1,
+                device_type: self._boards[(sort, device_type)].bisect_left(key) + 1
+            }
+
+    def user_ranks(self, user_id: int, sort: str = DEFAULT_SORT) -> List[Tuple[dict, Decimal, Dict[Optional[str], BoardRank]]]:
+        """
+        用户每条记录在总榜（键为 None）和所属设备类型榜单中的排名，按榜单顺序排列
+
+        Returns:
+            list: [(排行榜条目, 排序值, {榜单: BoardRank})]
+        """
+        descending = LEADERBOARD_SORTS[sort][1]
+        with self._lock:
+            records = []
+            for benchmark_id in self._user_records.get(user_id, ()):
+                _, device_type, keys = self._keys[benchmark_id]
+                key = keys.get(sort)
+                if key is None:
+                    continue
+                ranks = {
+                    board: _board_rank(self._boards[(sort, board)], key)
+                    for board in (ALL_DEVICE_TYPES, device_type)
+                }
+                records.append((key, self._entries[benchmark_id], ranks))
+            records.sort(key=lambda record: record[0])
+            return [(entry, -key[0] if descending else key[0], ranks) for key, entry, ranks in records]
+
+    def total(self, device_type: Optional[str], sort: str = DEFAULT_SORT) -> int:
+        """榜单记录总数"""
+        with self._lock:
+            board = self._boards.get((sort, device_type))
+            return len(board) if board is not None else 0
+
+    def page(self, device_type: Optional[str], offset: int, limit: int, reverse: bool = False,
+             sort: str = DEFAULT_SORT) -> Tuple[int, List[dict]]:
+        """
+        获取指定排行榜的一页数据
+
+        Returns:
+            Tuple[int, List[dict]]: (总数, 带排名的条目列表)
+        """
+        with self._lock:
+            board = self._boards.get((sort, device_type))
+            if board is None:
+                return 0, []
+
+            total = len(board)
+            if offset < 0 or offset >= total or limit <= 0:
+                return total, []
+
+            if reverse:
+                keys = board.islice(max(total - offset - limit, 0), total - offset, reverse=True)
+            else:
+                keys = board.islice(offset, offset + limit)
+
+            entries = []
+            for rank, (_, signed_id) in enumerate(keys, start=offset + 1):
+                # 降序榜单的键中 id 为负值
+                entries.append({"rank": rank, **self._entries[abs(signed_id)]})
+            return total, entries
+
+    def cursor_window(self, device_type: Optional[str], key: Tuple, direction: str,
+                      limit: int, reverse: bool = False, sort: str = DEFAULT_SORT) -> Tuple[int, int]:
+        """
+        将游标排序键 (排序值, id) 换算为 (offset, limit)，供 page() 使用
+
+        direction 取值见 app.utils.leaderboard_cursor：next/prev/at
+        """
+        with self._lock:
+            board = self._boards.get((sort, device_type))
+            if board is None:
+                return 0, 0
+
+            key = _board_key(sort, key[0], key[1])
+            total = len(board)
+            left = board.bisect_left(key)
+            right = board.bisect_right(key)
+
+            # 倒序榜单中，排在游标之前的是比游标大的记录
+            if reverse:
+                before, through = total - right, total - left
+            else:
+                before, through = left, right
+
+            if direction == "prev":
+                offset = max(before - limit, 0)
+                return offset, before - offset
+            if direction == "at":
+                return before, limit
+            return through, limit
+
+    def _insert(self, benchmark):
+        device_type = benchmark.device_type.value if benchmark.device_type else "unknown"
+        keys = {}
+        for sort, (column, _) in LEADERBOARD_SORTS.items():
+            value = getattr(benchmark, column)
+            if value is None:
+                continue
+            key = keys[sort] = _board_key(sort, value, benchmark.id)
+            self._boards.setdefault((sort, ALL_DEVICE_TYPES), SortedList()).add(key)
+            self._boards.setdefault((sort, device_type), SortedList()).add(key)
+
+        if keys:
+            self._entries[benchmark.id] = build_entry(benchmark)
+            self._keys[benchmark.id] = (benchmark.user_id, device_type, keys)
+            self._user_records.setdefault(benchmark.user_id, set()).add(benchmark.id)
+
+    def _discard(self, benchmark_id: int):
+        indexed = self._keys.pop(benchmark_id, None)
+        if indexed is None:
+            return
+
+        user_id, device_type, keys = indexed
+        self._entries.pop(benchmark_id, None)
+        user_records = self._user_records.get(user_id)
+        if user_records is not None:
+            user_records.discard(benchmark_id)
+            if not user_records:
+                del self._user_records[user_id]
+        for sort, key in keys.items():
+            self._boards[(sort, ALL_DEVICE_TYPES)].discard(key)
+            self._boards[(sort, device_type)].discard(key)
+
+
+def _board_rank(board: SortedList, key: Tuple[Decimal, int]) -> BoardRank:
+    """排序键在榜单中的排名"""
+    return BoardRank(board.bisect_left(key) + 1, len(board))
+
+
+# 全局索引实例
+leaderboard_index = LeaderboardIndex()
+
+
+async def sync_user_profile(db: AsyncSession, user_id: int, username: str, avatar_url: Optional[str]) -> int:
+    """
+    把用户资料（用户名、头像）同步到该用户的全部记录
+
+    在调用方的事务中执行 UPDATE（不修改记录的 updated_at）；有记录被修改时调用方需在提交前
+    调用 bump_data_version(db, user_ids=[user_id])（app/services/data_version.py），提交后调用
+    leaderboard_index.update_user 并使排行榜缓存失效。
+
+    Returns:
+        int: 修改的记录数
+    """
+    result = await db.execute(
+        update(BenchmarkResult).where(
+            BenchmarkResult.user_id == user_id,
+            or_(
+                BenchmarkResult.username != username,
+                BenchmarkResult.avatar_url.is_distinct_from(avatar_url)
+            )
+        ).values(
+            username=username,
+            avatar_url=avatar_url,
+            updated_at=BenchmarkResult.updated_at
+        ).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
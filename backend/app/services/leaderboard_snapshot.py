@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜每日快照任务
+
+按设备类型（以及总榜，device_type 为 NULL）计算当日排名，流式读取排行结果，
+以多行 INSERT ... VALUES 批量写入 leaderboard_snapshots。同一天重复执行会整体替换
+当天快照（删除与写入在同一事务中）。
+
+使用方法:
+    # 命令行（在 backend 目录下）
+    python -m app.services.leaderboard_snapshot --date 2025-12-31
+
+    # 进程内调度：设置 ENABLE_SNAPSHOT_SCHEDULER=true，应用启动后每天 SNAPSHOT_HOUR 点（UTC）执行
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, func
+
+from app.dependencies.database import engine
+from app.models import BenchmarkResult, LeaderboardSnapshot
+
+snapshot_table = LeaderboardSnapshot.__table__
+
+
+def _ranking_query(by_device_type: bool):
+    """按 (overall_wall_time, id) 计算排名（与排行榜展示的位置一致）"""
+    wall_time = BenchmarkResult.overall_wall_time
+    rank_position = func.row_number().over(
+        partition_by=BenchmarkResult.device_type if by_device_type else None,
+        order_by=(wall_time.asc(), BenchmarkResult.id.asc())
+    )
+    return select(
+        BenchmarkResult.id,
+        BenchmarkResult.user_id,
+        BenchmarkResult.username,
+        BenchmarkResult.device_type,
+        BenchmarkResult.cpu_model,
+        wall_time,
+        BenchmarkResult.performance_score,
+        rank_position.label("rank_position")
+    ).where(wall_time.isnot(None))
+
+
+def create_snapshot(snapshot_date: Optional[date] = None, batch_size: int = 1000,
+                    retention_days: Optional[int] = None) -> int:
+    """
+    生成指定日期的排行榜快照
+
+    Args:
+        snapshot_date: 快照日期，默认为当天（UTC）
+        batch_size: 每批读取和写入的行数
+        retention_days: 保留天数，设置后删除更早的快照
+
+    Returns:
+        int: 写入的快照行数
+    """
+    snapshot_date = snapshot_date or datetime.now(timezone.utc).date()
+    created_at = datetime.now(timezone.utc)
+    written = 0
+
+    # 读写使用不同连接：流式游标占用读连接期间，写连接可以继续执行
+    with engine.connect() as reader, engine.begin() as writer:
+        writer.execute(delete(snapshot_table).where(snapshot_table.c.snapshot_date == snapshot_date))
+
+        for by_device_type in (True, False):
+            result = reader.execution_options(stream_results=True, yield_per=batch_size).execute(
+                _ranking_query(by_device_type)
+            )
+            for rows in result.partitions():
+                writer.execute(insert(snapshot_table).values([
+                    {
+                        "snapshot_date": snapshot_date,
+                        "rank_position": row.rank_position,
+                        "user_id": row.user_id,
+                        "username": row.username,
+                        "benchmark_result_id": row.id,
+                        "overall_wall_time": row.overall_wall_time,
+                        "performance_score": row.performance_score or 0,
+                        # 总榜快照的 device_type 为 NULL
+                        "device_type": row.device_type if by_device_type else None,
+                        "cpu_model": row.cpu_model,
+                        "created_at": created_at
+                    }
+                    for row in rows
+                ]))
+                written += len(rows)
+
+        if retention_days:
+            writer.execute(delete(snapshot_table).where(
+                snapshot_table.c.snapshot_date < snapshot_date - timedelta(days=retention_days)
+            ))
+
+    return written
+
+
+async def run_snapshot_scheduler(hour: int, retention_days: Optional[int] = None):
+    """进程内调度：每天指定时刻（UTC）在线程池中生成快照"""
+    while True:
+        now = datetime.now(timezone.utc)
+        next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+        try:
+            written = await asyncio.to_thread(create_snapshot, next_run.date(), retention_days=retention_days)
+            print(f"[OK] 排行榜快照生成完成: {next_run.date()}，共 {written} 行")
+        except Exception as e:
+            print(f"[ERROR] 排行榜快照生成失败: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成排行榜每日快照")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="快照日期 (YYYY-MM-DD)，默认当天")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批写入行数")
+    parser.add_argument("--retention-days", type=int, default=None, help="删除早于该天数的快照")
+    args = parser.parse_args()
+
+    count = create_snapshot(args.date, args.batch_size, args.retention_days)
+    print(f"排行榜快照生成完成: {args.date or '今天'}，共 {count} 行")
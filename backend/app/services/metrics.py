@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus 指标
+
+- http_request_duration_seconds / http_response_size_bytes: 按路由模板、方法（和状态码）统计的
+  请求耗时与响应体大小（app/middleware/metrics.py）；流式响应的耗时为连接持续时间
+- http_requests_in_flight: 进行中的请求数
+- db_query_duration_seconds: 按语句类型和发起查询的路由统计的 SQL 耗时（引擎 before/after_cursor_execute 事件）
+- db_pool_checked_out / db_pool_overflow: 连接池已借出连接数与溢出连接数（连接池 checkout/checkin 事件）
+- oauth_upstream_duration_seconds: OAuth 回调中访问 token 端点和用户信息端点的耗时
+
+单进程运行时使用进程内默认注册表。gunicorn 多进程部署时 gunicorn.conf.py 设置
+PROMETHEUS_MULTIPROC_DIR，各 worker 把指标写入该目录下的内存映射文件，/metrics 由任一
+worker 汇总全部进程的指标；仪表值只汇总存活进程（livesum）。
+
+每次观测是一次加锁的累加（多进程时写入内存映射文件，不涉及系统调用），可在生产环境常开；
+ENABLE_METRICS=false 时不注册中间件和数据库事件。
+"""
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Tuple
+
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.middleware.request_context import current_route
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP 请求耗时（秒）",
+    ["method", "route", "status"]
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes", "HTTP 响应体大小（字节，压缩后）",
+    ["method", "route"],
+    buckets=(128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, float("inf"))
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "进行中的 HTTP 请求数",
+    multiprocess_mode="livesum"
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "SQL 语句执行耗时（秒）",
+    ["operation", "route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf"))
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "连接池已借出的连接数",
+    ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "连接池超出 pool_size 的溢出连接数",
+    ["pool"], multiprocess_mode="livesum"
+)
+
+OAUTH_UPSTREAM_SECONDS = Histogram(
+    "oauth_upstream_duration_seconds", "OAuth 上游请求耗时（秒）",
+    ["step", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+)
+
+# 统计的语句类型，其余归为 OTHER
+_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+
+def statement_operation(statement: str) -> str:
+    operation = statement[:6].upper()
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["metrics_query_start"].pop()
+    DB_QUERY_SECONDS.labels(statement_operation(statement), current_route()).observe(elapsed)
+
+
+def instrument_engine(engine: Engine, pool_name: str):
+    """为同步引擎（异步引擎传入 async_engine.sync_engine）注册查询耗时和连接池事件"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool_name)
+    overflow = DB_POOL_OVERFLOW.labels(pool_name)
+
+    # 溢出连接在归还时才关闭，checkin 事件中的 overflow() 可能比实际多 1，下次借出时更正
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+        overflow.set(max(pool.overflow(), 0))
+
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+        overflow.set(max(pool.overflow(), 0))
+
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+
+
+@contextmanager
+def time_oauth_request(step: str):
+    """记录一次 OAuth 上游请求（含状态码检查）的耗时，outcome 为 ok / timeout / error"""
+    started = perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except httpx.TimeoutException:
+        outcome = "timeout"
+        raise
+    finally:
+        OAUTH_UPSTREAM_SECONDS.labels(step, outcome).observe(perf_counter() - started)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """生成 Prometheus 文本格式的指标，返回 (内容, Content-Type)"""
+    if MULTIPROCESS:
+        # 多进程：每次汇总指标目录下全部进程的文件
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
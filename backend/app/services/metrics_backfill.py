@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+性能指标回填任务
+
+为已有的 benchmark_results 计算 performance_score / performance_per_core /
+throughput_keys_per_sec（新提交和更新的记录在写入时计算），只回写发生变化的行，
+评分公式调整后重新执行即可。
+
+- 按 id > last_id 的键集分页流式读取，每块一个短事务，
+  以一条 UPDATE ... SET col = CASE id WHEN ... END WHERE id IN (...) 写回
+- 每块提交后把进度写入检查点文件，中断后再次执行会从检查点继续，完成后删除检查点；
+  任务可重复执行
+
+使用方法（在 backend 目录下）:
+    python -m app.services.metrics_backfill --batch-size 2000
+    python -m app.services.metrics_backfill --dry-run
+
+每块写入时递增数据版本并记下修改的记录（app/services/data_version.py），运行中的服务在下一个检查间隔内增量同步排行榜内存索引。
+"""
+import argparse
+from typing import Dict
+
+from sqlalchemy import select, update, case, literal
+
+from app.dependencies.database import engine
+from app.models import BenchmarkResult
+from app.services.data_version import bump_data_version_sync
+from app.utils.benchmark_scoring import compute_benchmark_metrics
+from app.utils.checkpoint import new_checkpoint, load_checkpoint, save_checkpoint, clear_checkpoint
+
+DEFAULT_CHECKPOINT = "metrics_backfill.checkpoint.json"
+
+results_table = BenchmarkResult.__table__
+
+METRIC_COLUMNS = ("performance_score", "performance_per_core", "throughput_keys_per_sec")
+
+
+def _update_statement(changes: Dict[int, dict]):
+    """生成一块变更的 UPDATE ... CASE 语句"""
+    id_column = results_table.c.id
+    values = {
+        name: case(
+            {row_id: literal(metrics[name], results_table.c[name].type) for row_id, metrics in changes.items()},
+            value=id_column
+        )
+        for name in METRIC_COLUMNS
+    }
+    return update(results_table).where(id_column.in_(list(changes))).values(
+        **values,
+        # 回填不是用户修改，保持原更新时间
+        updated_at=results_table.c.updated_at
+    )
+
+
+def backfill_metrics(batch_size: int = 2000, checkpoint_path: str = DEFAULT_CHECKPOINT,
+                     dry_run: bool = False, restart: bool = False) -> dict:
+    """
+    回填全部记录的性能指标
+
+    Args:
+        batch_size: 每块读取的行数
+        checkpoint_path: 检查点文件路径
+        dry_run: 只统计需要修改的行数，不写库也不写检查点
+        restart: 忽略已有检查点，从头开始
+
+    Returns:
+        dict: last_id, scanned（扫描行数）, updated（修改行数）
+    """
+    progress = new_checkpoint() if restart else load_checkpoint(checkpoint_path)
+    if progress["last_id"]:
+        print(f"[INFO] 从检查点继续: id > {progress['last_id']}")
+    query = select(
+        results_table.c.id,
+        results_table.c.cpu_cores,
+        results_table.c.phase1_wall_time,
+        results_table.c.phase2_wall_time,
+        results_table.c.overall_wall_time,
+        *[results_table.c[name] for name in METRIC_COLUMNS]
+    ).order_by(results_table.c.id.asc()).limit(batch_size)
+
+    while True:
+        with engine.connect() as reader:
+            rows = reader.execution_options(stream_results=True).execute(
+                query.where(results_table.c.id > progress["last_id"])
+            ).all()
+        if not rows:
+            break
+
+        changes = {}
+        for row in rows:
+            metrics = compute_benchmark_metrics(
+                row.phase1_wall_time, row.phase2_wall_time, row.overall_wall_time, row.cpu_cores
+            )
+            if any(getattr(row, name) != metrics[name] for name in METRIC_COLUMNS):
+                changes[row.id] = metrics
+
+        if changes and not dry_run:
+            with engine.begin() as writer:
+                writer.execute(_update_statement(changes))
+                bump_data_version_sync(writer, record_ids=list(changes))
+
+        progress["last_id"] = rows[-1].id
+        progress["scanned"] += len(rows)
+        progress["updated"] += len(changes)
+        if not dry_run:
+            save_checkpoint(checkpoint_path, progress)
+        print(f"[INFO] 已处理至 id={progress['last_id']}，扫描 {progress['scanned']} 行，"
+              f"{'待修改' if dry_run else '已修改'} {progress['updated']} 行")
+
+    if not dry_run:
+        clear_checkpoint(checkpoint_path)
+    return progress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="回填已有记录的性能指标")
+    parser.add_argument("--batch-size", type=int, default=2000, help="每块读取行数")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="检查点文件路径")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写入")
+    parser.add_argument("--restart", action="store_true", help="忽略检查点，从头开始")
+    args = parser.parse_args()
+
+    result = backfill_metrics(args.batch_size, args.checkpoint, args.dry_run, args.restart)
+    print(f"性能指标回填完成: 扫描 {result['scanned']} 行，"
+          f"{'待修改' if args.dry_run else '已修改'} {result['updated']} 行")
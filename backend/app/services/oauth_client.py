@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+OAuth 出站 HTTP 客户端
+
+整个应用共享一个 httpx.AsyncClient：连接保持复用（token 端点和用户信息端点同域时
+一次登录只需一次 TCP/TLS 握手），服务端支持时使用 HTTP/2，并设置连接/读取超时。
+信号量限制同时进行的出站请求数，登录高峰时多余的请求排队，排队时间计入连接池超时。
+
+客户端在应用 lifespan 中创建和关闭；未经 lifespan 启动时（如脚本中直接调用）首次使用时创建。
+"""
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.config import (
+    OAUTH_HTTP2, OAUTH_CONNECT_TIMEOUT, OAUTH_READ_TIMEOUT,
+    OAUTH_MAX_CONNECTIONS, OAUTH_MAX_CONCURRENCY
+)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class OAuthHTTPClient:
+    """共享的 OAuth 出站客户端"""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        """创建连接池"""
+        if self._client is not None:
+            return
+
+        http2 = OAUTH_HTTP2 and HTTP2_AVAILABLE
+        if OAUTH_HTTP2 and not HTTP2_AVAILABLE:
+            print("[INFO] 未安装 h2，OAuth 请求使用 HTTP/1.1")
+
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                connect=OAUTH_CONNECT_TIMEOUT,
+                read=OAUTH_READ_TIMEOUT,
+                write=OAUTH_READ_TIMEOUT,
+                pool=OAUTH_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=OAUTH_MAX_CONNECTIONS,
+                max_keepalive_connections=OAUTH_MAX_CONNECTIONS
+            ),
+            headers={"User-Agent": "Benchmark-Platform/1.0"}
+        )
+        self._semaphore = asyncio.Semaphore(OAUTH_MAX_CONCURRENCY)
+
+    async def close(self):
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        发起请求（受并发上限约束）
+
+        Raises:
+            httpx.PoolTimeout: 排队超过连接池超时
+            httpx.TimeoutException / httpx.RequestError: 连接或读取失败
+        """
+        if self._client is None:
+            await self.start()
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=OAUTH_CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout("OAuth 出站请求排队超时")
+
+        try:
+            return await self._client.request(method, url, **kwargs)
+        finally:
+            self._semaphore.release()
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+
+# 应用级共享客户端
+oauth_http_client = OAuthHTTPClient()
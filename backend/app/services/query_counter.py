@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+SQL 语句计数
+
+- 请求级计数：DEBUG_QUERY_COUNT 开启时注册 QueryCountMiddleware（app/middleware/query_count.py），
+  每个请求在上下文变量中持有一个计数器，响应头 X-Query-Count 返回处理该请求执行的语句数
+- query_budget(limit)：统计代码块内本进程执行的全部语句，超过 limit 条时抛出 QueryBudgetExceeded
+  （附带执行过的语句），用于固定每个接口的查询次数、发现 N+1 回归（见 scripts/check_query_budget.py）。
+  统计不区分请求，只应在串行调用接口的脚本或测试中使用
+
+计数在引擎的 after_cursor_execute 事件中进行，未开启请求级计数时由 query_budget 首次使用时注册。
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 响应头
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCounter:
+    """一段时间内执行的语句数"""
+
+    __slots__ = ("count", "statements", "keep_statements")
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.statements: List[str] = []
+        self.keep_statements = keep_statements
+
+    def add(self, statement: str):
+        self.count += 1
+        if self.keep_statements:
+            self.statements.append(statement)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """代码块执行的语句数超过预算"""
+
+    def __init__(self, label: str, limit: int, counter: QueryCounter):
+        self.limit = limit
+        self.count = counter.count
+        self.statements = counter.statements
+        listing = "\n".join(f"  {index}. {' '.join(statement.split())[:200]}"
+                            for index, statement in enumerate(counter.statements, 1))
+        super().__init__(f"{label or '代码块'} 执行了 {counter.count} 条 SQL，超过预算 {limit} 条:\n{listing}")
+
+
+# 当前请求的计数器
+request_counter: ContextVar[Optional[QueryCounter]] = ContextVar("request_counter", default=None)
+
+# 进行中的 query_budget
+_budgets: List[QueryCounter] = []
+
+_installed: List[Engine] = []
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = request_counter.get()
+    if counter is not None:
+        counter.add(statement)
+    for budget in _budgets:
+        budget.add(statement)
+
+
+def install(engines):
+    """为引擎注册计数事件（重复调用只注册一次）"""
+    for engine in engines:
+        if engine not in _installed:
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            _installed.append(engine)
+
+
+@contextmanager
+def query_budget(limit: int, label: str = "") -> Iterator[QueryCounter]:
+    """
+    断言代码块内执行的 SQL 语句不超过 limit 条
+
+    Example:
+        with query_budget(2, "GET /api/v1/benchmarks/my-ranks"):
+            client.get("/api/v1/benchmarks/my-ranks")
+
+    Raises:
+        QueryBudgetExceeded: 超过预算
+    """
+    from app.dependencies.database import engine, async_engine
+    install([engine, async_engine.sync_engine])
+
+    counter = QueryCounter(keep_statements=True)
+    _budgets.append(counter)
+    try:
+        yield counter
+    finally:
+        _budgets.remove(counter)
+    if counter.count > limit:
+        raise QueryBudgetExceeded(label, limit, counter)
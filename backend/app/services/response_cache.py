@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+公共接口响应缓存
+
+缓存预先序列化好的 JSON 响应字节，容量受 LRU 限制。写入路径通过 invalidate()
+递增版本号并清空缓存；计算期间版本号发生变化的结果不会写入缓存，避免缓存旧数据。
+ETag 取响应内容的哈希，多进程下相同内容得到相同 ETag，客户端带 If-None-Match
+重复访问时直接返回 304，不查询数据库也不重新序列化。
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from fastapi.responses import Response
+
+from app.config import LEADERBOARD_CACHE_SIZE
+from app.utils.serialization import dumps
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """已序列化的响应"""
+    body: bytes
+    etag: str
+
+    def to_response(self, if_none_match: Optional[str] = None) -> Response:
+        """生成响应；If-None-Match 命中时返回 304"""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """判断 If-None-Match 是否命中（弱比较）"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """带版本号的 LRU 响应缓存"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """读取缓存（命中时移到 LRU 末尾）"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+            return cached
+
+    def put(self, key: Hashable, content, version: int) -> CachedResponse:
+        """
+        序列化并缓存响应
+
+        Args:
+            key: 缓存键
+            content: 可 JSON 序列化的响应内容（orjson 编码）
+            version: 开始计算响应时读取的版本号，已失效时只返回不缓存
+        """
+        body = dumps(content)
+        cached = CachedResponse(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+        with self._lock:
+            if version == self.version and self.max_entries > 0:
+                self._entries[key] = cached
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return cached
+
+    def invalidate(self):
+        """数据变更后使全部缓存失效"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+# 公共排行榜页面缓存
+leaderboard_cache = ResponseCache(LEADERBOARD_CACHE_SIZE)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+慢查询日志
+
+在引擎的 before/after_cursor_execute 事件中计时，耗时超过 SLOW_QUERY_THRESHOLD_MS 的语句
+连同绑定参数、发起查询的路由（app/middleware/request_context.py）记入进程内环形缓冲区，
+只保留最近 SLOW_QUERY_LOG_SIZE 条，通过 GET /api/v1/admin/slow-queries 查看。
+
+执行计划不在请求中获取：慢查询放入有界队列，由后台线程用同步引擎执行
+EXPLAIN（MySQL）或 EXPLAIN QUERY PLAN（SQLite），结果回填到对应条目；队列满时跳过。
+记录慢查询本身只是一次加锁的追加，不访问数据库。
+
+每个进程各自维护缓冲区，gunicorn 多 worker 时只能看到处理该请求的 worker 的记录。
+"""
+import itertools
+import queue
+import threading
+from collections import deque
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from time import perf_counter
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE
+from app.middleware.request_context import current_route
+
+# 可以获取执行计划的语句类型
+_EXPLAINABLE = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+# 记录的语句与参数长度上限
+MAX_STATEMENT_LENGTH = 4000
+MAX_PARAMETER_LENGTH = 200
+
+# 执行计划状态
+EXPLAIN_PENDING = "pending"
+EXPLAIN_DONE = "done"
+EXPLAIN_FAILED = "failed"
+EXPLAIN_SKIPPED = "skipped"
+
+
+def _format_value(value):
+    """参数转换为可 JSON 序列化的值，长字符串截断"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else f"{text[:MAX_PARAMETER_LENGTH]}...({len(text)} chars)"
+
+
+def _format_parameters(parameters):
+    if isinstance(parameters, dict):
+        return {key: _format_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_format_value(value) for value in parameters]
+    return _format_value(parameters)
+
+
+class SlowQueryEntry:
+    """一条慢查询记录"""
+
+    __slots__ = ("id", "recorded_at", "route", "duration_ms", "statement", "parameters",
+                 "executemany", "explain_status", "explain_plan", "explain_error",
+                 "_raw_statement", "_raw_parameters", "_dialect")
+
+    def __init__(self, entry_id: int, route: str, duration_ms: float, statement: str, parameters,
+                 executemany: bool, dialect: str):
+        self.id = entry_id
+        self.recorded_at = datetime.now(timezone.utc)
+        self.route = route
+        self.duration_ms = round(duration_ms, 3)
+        self.statement = statement[:MAX_STATEMENT_LENGTH]
+        # executemany 只保留第一组参数
+        self.parameters = _format_parameters(parameters[0] if executemany and parameters else parameters)
+        self.executemany = executemany
+        self.explain_status = EXPLAIN_PENDING
+        self.explain_plan: Optional[List[dict]] = None
+        self.explain_error: Optional[str] = None
+        self._raw_statement = statement
+        self._raw_parameters = parameters
+        self._dialect = dialect
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "recorded_at": self.recorded_at.isoformat(),
+            "route": self.route,
+            "duration_ms": self.duration_ms,
+            "statement": self.statement,
+            "parameters": self.parameters,
+            "executemany": self.executemany,
+            "explain": {
+                "status": self.explain_status,
+                "plan": self.explain_plan,
+                "error": self.explain_error
+            }
+        }
+
+
+class SlowQueryLog:
+    """进程内慢查询环形缓冲区"""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, size: int = SLOW_QUERY_LOG_SIZE):
+        self.threshold_ms = threshold_ms
+        self.enabled = False
+        self._entries = deque(maxlen=max(size, 1))
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: "queue.Queue[SlowQueryEntry]" = queue.Queue(maxsize=max(size, 1))
+        self._explain_engine: Optional[Engine] = None
+        self._worker: Optional[threading.Thread] = None
+
+    def install(self, engines: Iterable[Engine], explain_engine: Engine):
+        """为引擎注册计时事件；explain_engine 为后台线程执行 EXPLAIN 使用的同步引擎"""
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._explain_engine = explain_engine
+        self.enabled = True
+
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """最近的记录（新的在前）"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+            if limit is not None:
+                entries = entries[:limit]
+            return [entry.to_dict() for entry in entries]
+
+    def clear(self) -> int:
+        """清空缓冲区，返回清除的条数"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+        if duration_ms < self.threshold_ms or statement[:7].upper() == "EXPLAIN":
+            return
+        self.record(statement, parameters, duration_ms, executemany, conn.dialect.name)
+
+    def record(self, statement: str, parameters, duration_ms: float, executemany: bool = False,
+               dialect: str = "mysql") -> SlowQueryEntry:
+        """记录一条慢查询，并排队获取执行计划"""
+        entry = SlowQueryEntry(next(self._ids), current_route(), duration_ms, statement, parameters,
+                               executemany, dialect)
+        with self._lock:
+            self._entries.append(entry)
+
+        if executemany or statement.lstrip()[:6].upper() not in _EXPLAINABLE or self._explain_engine is None:
+            entry.explain_status = EXPLAIN_SKIPPED
+            entry._raw_parameters = None
+            return entry
+        try:
+            self._pending.put_nowait(entry)
+        except queue.Full:
+            entry.explain_status = EXPLAIN_SKIPPED
+            entry.explain_error = "执行计划队列已满"
+            entry._raw_parameters = None
+            return entry
+        self._ensure_worker()
+        return entry
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _explain_loop(self):
+        while True:
+            entry = self._pending.get()
+            try:
+                plan = self._explain(entry)
+                with self._lock:
+                    entry.explain_plan = plan
+                    entry.explain_status = EXPLAIN_DONE
+            except Exception as e:
+                with self._lock:
+                    entry.explain_error = str(e)
+                    entry.explain_status = EXPLAIN_FAILED
+            finally:
+                # 参数只在获取执行计划时需要
+                entry._raw_parameters = None
+
+    def _explain(self, entry: SlowQueryEntry) -> List[dict]:
+        prefix = "EXPLAIN QUERY PLAN " if entry._dialect == "sqlite" else "EXPLAIN "
+        # 记录的语句已是驱动格式（占位符与参数），直接交给 DBAPI 执行
+        with self._explain_engine.connect() as connection:
+            result = connection.exec_driver_sql(prefix + entry._raw_statement, entry._raw_parameters)
+            return [
+                {key: _format_value(value) for key, value in row.items()}
+                for row in result.mappings()
+            ]
+
+
+# 全局慢查询日志
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+前端静态文件服务（生产模式）
+
+启动时扫描 dist 目录生成内存清单（URL 路径 -> 文件类型、stat 结果、预压缩版本），
+请求时只查字典，不再逐个请求检查文件系统：
+
+- /assets/ 下的文件名带内容哈希，返回一年有效期的 immutable 缓存头
+- 其余文件（index.html 等）返回 no-cache，浏览器每次带 ETag 协商，未变化时返回 304
+- 存在同名 .br / .gz 文件时按 Accept-Encoding 直接返回预压缩版本
+  （构建后执行 scripts/precompress_assets.py 生成）
+- 清单中不存在的路径返回 index.html（SPA 路由），/assets/ 下不存在的文件返回 404
+
+dist 目录在服务启动后更新需要重启服务。
+"""
+import mimetypes
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+
+from app.middleware.compression import accepted_encodings
+from app.services.response_cache import etag_matches
+
+ASSETS_PREFIX = "assets/"
+INDEX_FILE = "index.html"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# 预压缩文件后缀，按优先级排列
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("text/css", ".css")
+mimetypes.add_type("image/svg+xml", ".svg")
+
+
+@dataclass(frozen=True)
+class _FileVariant:
+    """某个编码的文件"""
+    path: str
+    stat_result: os.stat_result
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    """清单中的一个文件"""
+    media_type: str
+    cache_control: str
+    # 编码 -> 文件，None 为未压缩的原文件
+    variants: Dict[Optional[str], _FileVariant]
+
+
+class StaticSite:
+    """dist 目录的内存清单"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files: Dict[str, StaticFile] = {}
+
+    def load(self) -> int:
+        """扫描目录生成清单，返回文件数"""
+        files = {}
+        for directory, _, filenames in os.walk(self.root):
+            names = set(filenames)
+            for filename in filenames:
+                if any(filename.endswith(suffix) and filename[:-len(suffix)] in names
+                       for suffix in PRECOMPRESSED_SUFFIXES.values()):
+                    # 预压缩版本随原文件登记
+                    continue
+                path = os.path.join(directory, filename)
+                variants = {None: _FileVariant(path, os.stat(path))}
+                for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+                    if filename + suffix in names:
+                        variants[encoding] = _FileVariant(path + suffix, os.stat(path + suffix))
+
+                url_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                files[url_path] = StaticFile(
+                    media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    cache_control=IMMUTABLE_CACHE_CONTROL if url_path.startswith(ASSETS_PREFIX) else REVALIDATE_CACHE_CONTROL,
+                    variants=variants
+                )
+        self.files = files
+        return len(files)
+
+    def response(self, url_path: str, headers: Headers, method: str = "GET") -> Response:
+        """
+        返回 url_path 对应的文件
+
+        Args:
+            url_path: 不含开头斜杠的请求路径
+            headers: 请求头（Accept-Encoding、If-None-Match）
+            method: 请求方法，HEAD 只返回响应头
+        """
+        static_file = self.files.get(url_path)
+        if static_file is None:
+            if url_path.startswith(ASSETS_PREFIX) or INDEX_FILE not in self.files:
+                return Response(status_code=404)
+            static_file = self.files[INDEX_FILE]
+
+        encoding = None
+        if len(static_file.variants) > 1:
+            accepted = accepted_encodings(headers.get("accept-encoding"))
+            encoding = next((name for name in PRECOMPRESSED_SUFFIXES if name in accepted and name in static_file.variants), None)
+
+        response_headers = {"Cache-Control": static_file.cache_control}
+        if len(static_file.variants) > 1:
+            response_headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+
+        variant = static_file.variants[encoding]
+        response = FileResponse(
+            variant.path, headers=response_headers, media_type=static_file.media_type,
+            stat_result=variant.stat_result, method=method
+        )
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, response.headers["etag"]):
+            response_headers["ETag"] = response.headers["etag"]
+            return Response(status_code=304, headers=response_headers)
+        return response
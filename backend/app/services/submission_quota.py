@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+用户提交数量限额
+
+限额计数存放在 users.result_count 上，提交时在同一事务中执行条件更新：
+
+    UPDATE users SET result_count = result_count + 1
+    WHERE id = :user_id AND result_count < :limit
+
+更新命中 0 行即已达上限。InnoDB 对该用户行加锁直到事务结束，同一用户的并发提交
+在这一行上排队，后到的请求读到已提交的最新计数再判断，不会出现先 COUNT 再 INSERT
+时多个请求同时通过检查、超出上限的情况。插入失败回滚时计数一并回滚。
+
+更新后的计数随 UPDATE 一起取回，不再单独 SELECT（见 app/dependencies/database.py 的 increment_returning）；
+是否命中取 UPDATE 的 rowcount。
+
+上限为 system_config.max_results_per_user（见 app/services/system_settings.py）。
+"""
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies.database import increment_returning
+from app.models import User
+
+
+async def _update_count(db: AsyncSession, user_id: int, condition, delta: int) -> Optional[int]:
+    """条件更新计数器并取回更新后的计数；条件不满足（未命中）时返回 None"""
+    return await increment_returning(
+        db,
+        update(User).where(User.id == user_id, condition).execution_options(synchronize_session=False),
+        User.result_count, delta,
+        updated_at=User.updated_at
+    )
+
+
+async def reserve_slot(db: AsyncSession, user_id: int, limit: int) -> Optional[int]:
+    """
+    在调用方的事务中占用一个提交名额
+
+    Returns:
+        Optional[int]: 占用后的已提交记录数；已达上限时返回 None
+    """
+    return await _update_count(db, user_id, User.result_count < limit, 1)
+
+
+async def release_slot(db: AsyncSession, user_id: int) -> int:
+    """
+    在调用方的事务中释放一个提交名额（删除记录时）
+
+    Returns:
+        int: 释放后的已提交记录数
+    """
+    return await _update_count(db, user_id, User.result_count > 0, -1) or 0
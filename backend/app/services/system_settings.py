@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+系统配置（system_config 表）内存缓存
+
+启动时把 system_config 整表读入内存，路由通过 system_settings.current 读取类型化的
+配置项，不再查询数据库。后台任务每隔 SETTINGS_REFRESH_SECONDS 秒执行一次版本查询
+（行数、最大更新时间、配置值总长度），版本变化时才重新加载整表；多进程部署时各进程
+独立轮询，修改配置后最多延迟一个轮询间隔生效。
+
+表中缺失或无法解析的配置项使用 Settings 中的默认值。
+"""
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import SystemConfig
+
+
+@dataclass(frozen=True)
+class Settings:
+    """类型化的配置项，字段名即 config_key"""
+    # 每个用户最多可提交的记录数
+    max_results_per_user: int = 3
+    # 我的排名中计算所在页码使用的每页条数（与前端排行榜每页条数一致）
+    my_ranks_page_size: int = 20
+    # 提交时未指定设备类型是否按 CPU 型号自动分类
+    enable_device_classification: bool = True
+    # 自动分类结果视为可信的置信度阈值
+    device_type_confidence_threshold: float = 0.7
+    # 是否允许用户修改记录的设备类型
+    enable_manual_device_type_correction: bool = True
+    # 登录会话（JWT 与 Cookie）有效小时数
+    session_expire_hours: int = 24
+
+    @classmethod
+    def from_rows(cls, rows: Dict[str, Optional[str]]) -> "Settings":
+        """由 config_key -> config_value 构建，缺失或无效的值使用默认值"""
+        values = {}
+        for field in dataclasses.fields(cls):
+            raw = rows.get(field.name)
+            if raw is None:
+                continue
+            try:
+                values[field.name] = _parse(field.type, raw)
+            except (TypeError, ValueError):
+                print(f"[ERROR] 配置项 {field.name} 的值无效，使用默认值: {raw!r}")
+        return cls(**values)
+
+
+def _parse(field_type, raw: str):
+    raw = raw.strip()
+    if field_type is bool:
+        if raw.lower() in ("true", "1", "yes"):
+            return True
+        if raw.lower() in ("false", "0", "no"):
+            return False
+        raise ValueError(raw)
+    return field_type(raw)
+
+
+# 版本查询：任意一行增删改都会改变其中至少一项
+_VERSION_QUERY = select(
+    func.count(SystemConfig.id),
+    func.max(SystemConfig.updated_at),
+    func.sum(func.length(SystemConfig.config_value))
+)
+
+
+class SystemSettings:
+    """system_config 的进程内缓存"""
+
+    def __init__(self):
+        self.current = Settings()
+        self._version: Optional[Tuple] = None
+
+    async def load(self, db: AsyncSession) -> int:
+        """重新加载整表，返回配置项数"""
+        version = tuple((await db.execute(_VERSION_QUERY)).one())
+        rows = (await db.execute(select(SystemConfig.config_key, SystemConfig.config_value))).all()
+        self.current = Settings.from_rows({key: value for key, value in rows})
+        self._version = version
+        return len(rows)
+
+    async def refresh(self, db: AsyncSession) -> bool:
+        """版本变化时重新加载，返回是否重新加载"""
+        version = tuple((await db.execute(_VERSION_QUERY)).one())
+        if version == self._version:
+            return False
+        previous = self.current
+        await self.load(db)
+        changed = [
+            field.name for field in dataclasses.fields(Settings)
+            if getattr(previous, field.name) != getattr(self.current, field.name)
+        ]
+        if changed:
+            print(f"[INFO] 系统配置已更新: {', '.join(changed)}")
+        return True
+
+
+system_settings = SystemSettings()
+
+
+async def run_settings_refresher(session_factory, interval: float):
+    """后台定期检查配置版本"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await system_settings.refresh(db)
+        except Exception as e:
+            print(f"[ERROR] 系统配置刷新失败: {e}")
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+认证用户缓存
+
+缓存用户资料的只读快照，已认证请求在 TTL 内不再查询 users 表。
+登录（OAuth 回调 / Mock 登录）更新用户后调用 invalidate()；与 ResponseCache 相同，
+查询期间发生过失效的结果不会写入缓存，避免写回旧资料。
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.config import USER_CACHE_TTL_SECONDS, USER_CACHE_SIZE
+from app.models import User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """用户资料快照（字段与 User 模型一致）"""
+    id: int
+    username: str
+    user_id: str
+    email: Optional[str]
+    avatar_url: Optional[str]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            user_id=user.user_id,
+            email=user.email,
+            avatar_url=user.avatar_url,
+            created_at=user.created_at
+        )
+
+
+class UserCache:
+    """按用户主键缓存的 TTL + LRU 缓存"""
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: "OrderedDict[int, Tuple[float, CachedUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        """读取未过期的缓存"""
+        with self._lock:
+            item = self._entries.get(user_id)
+            if item is None:
+                return None
+            expires_at, user = item
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user: User, generation: int) -> CachedUser:
+        """
+        缓存用户资料
+
+        Args:
+            user: 查询到的用户
+            generation: 开始查询前读取的 generation，期间发生过失效时只返回不缓存
+        """
+        cached = CachedUser.from_model(user)
+        with self._lock:
+            if generation == self.generation and self.ttl_seconds > 0 and self.max_entries > 0:
+                self._entries[cached.id] = (time.monotonic() + self.ttl_seconds, cached)
+                self._entries.move_to_end(cached.id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return cached
+
+    def invalidate(self, user_id: int):
+        """用户资料变更后移除缓存"""
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+# 已认证用户缓存
+user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_SIZE)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试输出解析器
+
+所有字段的模式合并为一个预编译的正则（各分支以固定关键字开头），
+用 finditer 对文本做一次线性扫描，配合简单的状态机提取字段：
+
+- 系统信息（CPU / Cores / Memory）取第一次出现的值
+- [Phase 1] / [Phase 2] / [Overall] 段头之后遇到的第一个 wall_time 归属该段
+
+ASCII 文本先转小写再用区分大小写的正则匹配。超过 _KEYWORD_SCAN_MIN_LENGTH 的文本
+（夹带大段日志）改为按各分支开头的固定关键字做字面量搜索，只在关键字出现的位置尝试匹配，
+已取到值的字段不再搜索其关键字，无关日志不会逐字符进入多分支正则；短文本直接 finditer 更快。
+其他文本退回 IGNORECASE 的 finditer 扫描。
+"""
+import re
+
+# 键值分隔符：等价于 \s*[:\s]\s*，使用原子组避免长空白串上的回溯
+_SEP = r"(?>\s*:\s*|\s+)"
+
+_TOKEN_SOURCE = (
+    r"\[(?:phase\s*(?P<phase>[12])|overall)\]"
+    rf"|wall_time{_SEP}(?P<wall_time>[\d.]+)\s*s"
+    # CPU 值放在前瞻中捕获，不消耗该行，行内其余关键字仍会被扫描到
+    rf"|cpu{_SEP}(?=(?P<cpu>.+?)(?:\n|$))"
+    rf"|cores?(?:_logical)?{_SEP}(?P<cores>\d+)"
+    rf"|memory{_SEP}(?P<memory>[\d.]+)\s*gi?b"
+)
+
+_TOKEN_PATTERN = re.compile(_TOKEN_SOURCE)
+_TOKEN_PATTERN_IGNORECASE = re.compile(_TOKEN_SOURCE, re.IGNORECASE)
+
+# 按关键字跳读的最小文本长度（更短的文本直接 finditer，见 scripts/bench_parser.py）
+_KEYWORD_SCAN_MIN_LENGTH = 4096
+
+# 各分支开头的固定关键字（小写文本），匹配只可能从这些位置开始
+_ANCHORS = {
+    "section": re.compile(r"\[(?:phase|overall\])"),
+    "overall": re.compile(r"\[overall\]"),
+    "wall_time": re.compile("wall_time"),
+    "cpu": re.compile("cpu"),
+    "cores": re.compile("core"),
+    "memory": re.compile("memory"),
+}
+
+# 段头对应的字段
+_SECTION_FIELDS = {
+    "1": "phase1_wall_time",
+    "2": "phase2_wall_time",
+    None: "overall_wall_time",
+}
+
+
+def _iter_tokens(lowered: str, wanted: set):
+    """
+    按顺序产生 _TOKEN_PATTERN.finditer(lowered) 中属于 wanted 分支的匹配，只在这些分支的关键字处尝试匹配
+
+    wanted 可在迭代过程中修改。各分支匹配消耗的文本（关键字、分隔符、数值、单位）中不会
+    出现其他分支的关键字，因此跳过某个分支不影响其余分支的匹配结果。
+    """
+    next_positions = {}
+    resume = 0
+    while True:
+        start = -1
+        for name in wanted:
+            position = next_positions.get(name)
+            if position is None or 0 <= position < resume:
+                found = _ANCHORS[name].search(lowered, resume)
+                position = next_positions[name] = found.start() if found else -1
+            if position >= 0 and (start < 0 or position < start):
+                start = position
+        if start < 0:
+            return
+        match = _TOKEN_PATTERN.match(lowered, start)
+        if match:
+            yield match
+            resume = match.end()
+        else:
+            resume = start + 1
+
+
+def parse_benchmark_output(text: str) -> dict:
+    """
+    解析基准测试输出文本
+
+    Args:
+        text: 基准测试程序的原始输出
+
+    Returns:
+        dict: cpu_model, cpu_cores, memory_gb, phase1_wall_time, phase2_wall_time, overall_wall_time
+
+    Raises:
+        ValueError: 数值字段格式错误（如 "1.2.3"）
+    """
+    parsed_data = {
+        "cpu_model": "",
+        "cpu_cores": None,
+        "memory_gb": None,
+        "phase1_wall_time": None,
+        "phase2_wall_time": None,
+        "overall_wall_time": None
+    }
+
+    # 仍需要的分支；wall_time 只在有段头等待取值时需要
+    wanted = {"section", "cpu", "cores", "memory"}
+    if text.isascii():
+        # 小写文本与原文位置一一对应，CPU 型号按位置从原文截取以保留大小写
+        if len(text) >= _KEYWORD_SCAN_MIN_LENGTH:
+            matches = _iter_tokens(text.lower(), wanted)
+        else:
+            matches = _TOKEN_PATTERN.finditer(text.lower())
+    else:
+        matches = _TOKEN_PATTERN_IGNORECASE.finditer(text)
+
+    # 已出现段头、尚未取到 wall_time 的字段
+    pending_sections = []
+    seen_sections = set()
+    cpu_found = False
+
+    for match in matches:
+        kind = match.lastgroup
+        if kind == "wall_time":
+            if pending_sections:
+                value = float(match.group("wall_time"))
+                for field in pending_sections:
+                    parsed_data[field] = value
+                pending_sections.clear()
+                wanted.discard("wall_time")
+        elif kind == "cpu":
+            if not cpu_found:
+                cpu_found = True
+                start, end = match.span("cpu")
+                parsed_data["cpu_model"] = text[start:end].strip()
+                wanted.discard("cpu")
+        elif kind == "cores":
+            if parsed_data["cpu_cores"] is None:
+                parsed_data["cpu_cores"] = int(match.group("cores"))
+                wanted.discard("cores")
+        elif kind == "memory":
+            if parsed_data["memory_gb"] is None:
+                parsed_data["memory_gb"] = float(match.group("memory"))
+                wanted.discard("memory")
+        else:
+            field = _SECTION_FIELDS[match.group("phase")]
+            if field not in seen_sections:
+                seen_sections.add(field)
+                pending_sections.append(field)
+                wanted.add("wall_time")
+                if len(seen_sections) == len(_SECTION_FIELDS):
+                    wanted.discard("section")
+                    wanted.discard("overall")
+                elif "overall_wall_time" not in seen_sections and len(seen_sections) == 2:
+                    # 两个 Phase 段头都已出现，只需再找 [Overall]
+                    wanted.discard("section")
+                    wanted.add("overall")
+
+    return parsed_data
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试性能指标计算
+
+在写入时计算并存储，排行榜按存储的列排序（走索引），不在查询中计算表达式。
+
+- performance_score: 各阶段相对参考机器的速度比的几何平均 × 1000（越高越快），
+  参考机器（README 示例中的 AMD Ryzen 7 6800H）记为 1000 分；只有总耗时时按总耗时折算
+- performance_per_core: performance_score / 逻辑核心数
+- throughput_keys_per_sec: Phase 1 测试的密钥总数 / Phase 1 耗时
+"""
+import math
+from decimal import Decimal
+from typing import Optional
+
+from app.config import PHASE1_TOTAL_KEYS
+
+# 参考机器各阶段耗时（秒）
+REFERENCE_PHASE1_WALL_TIME = 64.642
+REFERENCE_PHASE2_WALL_TIME = 71.761
+REFERENCE_SCORE = 1000
+
+_SCORE_QUANTUM = Decimal("0.000001")
+_SCORE_MAX = Decimal("999999999.999999")
+
+
+def _to_score_decimal(value: float) -> Decimal:
+    """转换为与 DECIMAL(15, 6) 列一致的值（超出列范围时截断）"""
+    return min(Decimal(repr(value)).quantize(_SCORE_QUANTUM), _SCORE_MAX)
+
+
+def compute_benchmark_metrics(phase1_wall_time, phase2_wall_time, overall_wall_time,
+                              cpu_cores: Optional[int]) -> dict:
+    """
+    计算性能指标
+
+    Returns:
+        dict: performance_score, performance_per_core, throughput_keys_per_sec（无法计算的为 None）
+    """
+    phase1 = float(phase1_wall_time) if phase1_wall_time else None
+    phase2 = float(phase2_wall_time) if phase2_wall_time else None
+    overall = float(overall_wall_time) if overall_wall_time else None
+
+    ratios = []
+    if phase1 and phase1 > 0:
+        ratios.append(REFERENCE_PHASE1_WALL_TIME / phase1)
+    if phase2 and phase2 > 0:
+        ratios.append(REFERENCE_PHASE2_WALL_TIME / phase2)
+    if not ratios and overall and overall > 0:
+        ratios.append((REFERENCE_PHASE1_WALL_TIME + REFERENCE_PHASE2_WALL_TIME) / overall)
+
+    score = None
+    per_core = None
+    if ratios:
+        score_value = REFERENCE_SCORE * math.exp(sum(math.log(ratio) for ratio in ratios) / len(ratios))
+        score = _to_score_decimal(score_value)
+        if cpu_cores and cpu_cores > 0:
+            per_core = _to_score_decimal(score_value / cpu_cores)
+
+    throughput = None
+    if phase1 and phase1 > 0:
+        throughput = round(PHASE1_TOTAL_KEYS / phase1)
+
+    return {
+        "performance_score": score,
+        "performance_per_core": per_core,
+        "throughput_keys_per_sec": throughput
+    }
+
+
+def apply_benchmark_metrics(benchmark) -> None:
+    """根据记录当前的耗时和核心数更新其性能指标"""
+    metrics = compute_benchmark_metrics(
+        benchmark.phase1_wall_time, benchmark.phase2_wall_time,
+        benchmark.overall_wall_time, benchmark.cpu_cores
+    )
+    for field, value in metrics.items():
+        setattr(benchmark, field, value)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+批量任务检查点
+
+按主键分块处理的批量任务（device_reclassify、metrics_backfill）每块提交后把进度
+（last_id 与累计计数）写入 JSON 文件，中断后再次执行从检查点继续，全部完成后删除。
+"""
+import json
+import os
+
+
+def new_checkpoint() -> dict:
+    """从头开始的进度"""
+    return {"last_id": 0, "scanned": 0, "updated": 0}
+
+
+def load_checkpoint(path: str) -> dict:
+    """读取检查点，不存在时从头开始"""
+    if not os.path.exists(path):
+        return new_checkpoint()
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """原子写入检查点"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str):
+    """任务完成后删除检查点"""
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+CPU 型号规范化
+
+同一颗 CPU 在不同系统上的输出差异很大，例如
+"Intel(R) Xeon(R) Gold 6248R CPU @ 3.00GHz" 与 "Intel Xeon Gold 6248R"，
+"AMD Ryzen 7 6800H with Radeon Graphics" 与 "AMD Ryzen 7 6800H"。
+规范化去掉商标符号、主频后缀和厂商附加描述（核心数说明、集成显卡、Processor/CPU 字样），
+合并空白，得到展示用的规范名称；规范名称的小写形式作为 cpu_models 表的唯一键。
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# 规范名称与唯一键的最大长度（与 cpu_models 表的列一致）
+MAX_CPU_MODEL_LENGTH = 255
+
+# 规范化结果缓存的型号数量上限
+CANONICAL_CACHE_SIZE = 4096
+
+# 按顺序执行的替换规则
+_NOISE_PATTERNS = (
+    # 商标符号：(R) (TM) (C) ® ™ ©
+    re.compile(r"\((?:r|tm|c)\)|[®™©]", re.IGNORECASE),
+    # 主频后缀：@ 3.00GHz、3.5 GHz
+    re.compile(r"@\s*[\d.]+\s*[gm]hz\b|\b[\d.]+\s*[gm]hz\b", re.IGNORECASE),
+    # 集成显卡说明：with Radeon Graphics、w/ Radeon Vega Mobile Gfx
+    re.compile(r"\s(?:with|w/)\s+radeon\b.*$", re.IGNORECASE),
+    # 核心数说明：64-Core Processor、Eight-Core Processor
+    re.compile(r"\b[\w]+-core\s+processor\b", re.IGNORECASE),
+    # 单独的 Processor / CPU 字样
+    re.compile(r"\b(?:processor|cpu)\b", re.IGNORECASE),
+    # 残留的 @ 符号
+    re.compile(r"\s@(?=\s|$)"),
+)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonicalize_cpu_model(cpu_model: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    规范化 CPU 型号
+
+    Returns:
+        Optional[Tuple[str, str]]: (规范名称, 唯一键)；型号为空时返回 None
+    """
+    if not cpu_model or not cpu_model.strip():
+        return None
+
+    name = cpu_model
+    for pattern in _NOISE_PATTERNS:
+        name = pattern.sub(" ", name)
+    name = " ".join(name.split())
+    if not name:
+        # 只有噪声时保留原文
+        name = " ".join(cpu_model.split())
+
+    name = name[:MAX_CPU_MODEL_LENGTH]
+    return name, name.lower()
@@ -2,10 +2,24 @@
 """
 CPU设备类型识别工具
 根据CPU型号识别服务器级或消费级处理器
+
+关键词和特殊模式在类加载时预编译：打分只关心"是否命中任一关键词"和
+"是否命中高置信度关键词"，各用一个分支正则在 C 层完成查找；
+分类结果只依赖小写后的型号字符串，按其做 LRU 缓存。
 """
 
 import re
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# 分类结果缓存的型号数量上限
+CLASSIFY_CACHE_SIZE = 4096
+
+
+def _compile_keywords(keywords: Iterable[str]) -> "re.Pattern":
+    """把关键词（统一转小写）编译为单个正则分支，长关键词优先"""
+    unique = sorted({keyword.lower() for keyword in keywords}, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(keyword) for keyword in unique))
 
 
 class DeviceTypeClassifier:
@@ -52,6 +66,26 @@ class DeviceTypeClassifier:
         'Desktop', 'Laptop', 'Mobile',
     ]
 
+    # 高置信度关键词
+    SERVER_HIGH_CONFIDENCE_KEYWORDS = ['Xeon', 'EPYC', 'POWER']
+    CONSUMER_HIGH_CONFIDENCE_KEYWORDS = [
+        'Core i3', 'Core i5', 'Core i7', 'Core i9',
+        'Ryzen 3', 'Ryzen 5', 'Ryzen 7', 'Ryzen 9',
+    ]
+
+    _SERVER_PATTERN = _compile_keywords(SERVER_CPU_KEYWORDS)
+    _SERVER_HIGH_CONFIDENCE_PATTERN = _compile_keywords(SERVER_HIGH_CONFIDENCE_KEYWORDS)
+    _CONSUMER_PATTERN = _compile_keywords(CONSUMER_CPU_KEYWORDS)
+    _CONSUMER_HIGH_CONFIDENCE_PATTERN = _compile_keywords(CONSUMER_HIGH_CONFIDENCE_KEYWORDS)
+
+    # 特殊模式
+    # Intel Xeon Gold/Silver/Bronze等
+    _XEON_PATTERN = re.compile(r'xeon\s+(?:gold|silver|bronze|platinum|w-\d+|d-\d+)')
+    # AMD EPYC 7000/9000系列
+    _EPYC_PATTERN = re.compile(r'epyc\s+\d+[a-z]*')
+    # Intel Core 移动版识别
+    _MOBILE_PATTERN = re.compile(r'core\s+.*[uHQMK]$"')
+
     @classmethod
     def classify_cpu(cls, cpu_model: Optional[str]) -> Tuple[str, float]:
         """
@@ -68,48 +102,63 @@ class DeviceTypeClassifier:
         if not cpu_model:
             return 'unknown', 0.0
 
-        cpu_model_lower = cpu_model.lower()
-        cpu_model_original = cpu_model
+        return cls._classify_lower(cpu_model.lower())
 
+    @classmethod
+    def classify_many(cls, cpu_models: Iterable[Optional[str]]) -> List[Tuple[str, float]]:
+        """
+        批量分类，同一批次内相同型号只计算一次
+
+        Args:
+            cpu_models: CPU型号列表
+
+        Returns:
+            List[Tuple[str, float]]: 与输入顺序一致的 (设备类型, 置信度)
+        """
+        results = {}
+        classified = []
+        for cpu_model in cpu_models:
+            key = cpu_model.lower() if cpu_model else None
+            result = results.get(key)
+            if result is None:
+                result = results[key] = cls.classify_cpu(cpu_model)
+            classified.append(result)
+        return classified
+
+    @classmethod
+    @lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+    def _classify_lower(cls, cpu_model_lower: str) -> Tuple[str, float]:
+        """对小写型号字符串分类（结果缓存）"""
         # 服务器级CPU匹配
         server_score = 0.0
-        for keyword in cls.SERVER_CPU_KEYWORDS:
-            if keyword.lower() in cpu_model_lower:
-                # 特殊处理一些高置信度的关键词
-                if keyword in ['Xeon', 'EPYC', 'POWER']:
-                    server_score = max(server_score, 0.95)
-                elif 'eon' in cpu_model_lower or 'epyc' in cpu_model_lower:
-                    server_score = max(server_score, 0.9)
-                else:
-                    server_score = max(server_score, 0.8)
+        if cls._SERVER_PATTERN.search(cpu_model_lower):
+            # 特殊处理一些高置信度的关键词
+            if cls._SERVER_HIGH_CONFIDENCE_PATTERN.search(cpu_model_lower):
+                server_score = 0.95
+            elif 'eon' in cpu_model_lower or 'epyc' in cpu_model_lower:
+                server_score = 0.9
+            else:
+                server_score = 0.8
 
         # 消费级CPU匹配
         consumer_score = 0.0
-        for keyword in cls.CONSUMER_CPU_KEYWORDS:
-            if keyword.lower() in cpu_model_lower:
-                # 特殊处理一些高置信度的关键词
-                if keyword in ['Core i3', 'Core i5', 'Core i7', 'Core i9',
-                             'Ryzen 3', 'Ryzen 5', 'Ryzen 7', 'Ryzen 9']:
-                    consumer_score = max(consumer_score, 0.95)
-                elif 'core i' in cpu_model_lower or 'ryzen' in cpu_model_lower:
-                    consumer_score = max(consumer_score, 0.9)
-                else:
-                    consumer_score = max(consumer_score, 0.7)
+        if cls._CONSUMER_PATTERN.search(cpu_model_lower):
+            # 特殊处理一些高置信度的关键词
+            if cls._CONSUMER_HIGH_CONFIDENCE_PATTERN.search(cpu_model_lower):
+                consumer_score = 0.95
+            elif 'core i' in cpu_model_lower or 'ryzen' in cpu_model_lower:
+                consumer_score = 0.9
+            else:
+                consumer_score = 0.7
 
         # 特殊模式匹配
-        # Intel Xeon Gold/Silver/Bronze等
-        xeon_pattern = r'xeon\s+(?:gold|silver|bronze|platinum|w-\d+|d-\d+)'
-        if re.search(xeon_pattern, cpu_model_lower):
+        if cls._XEON_PATTERN.search(cpu_model_lower):
             server_score = max(server_score, 0.98)
 
-        # AMD EPYC 7000/9000系列
-        epyc_pattern = r'epyc\s+\d+[a-z]*'
-        if re.search(epyc_pattern, cpu_model_lower):
+        if cls._EPYC_PATTERN.search(cpu_model_lower):
             server_score = max(server_score, 0.98)
 
-        # Intel Core 移动版识别
-        mobile_pattern = r'core\s+.*[uHQMK]$"'
-        if re.search(mobile_pattern, cpu_model_lower):
+        if cls._MOBILE_PATTERN.search(cpu_model_lower):
             consumer_score = max(consumer_score, 0.9)
 
         # 判断结果
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜游标（keyset 分页）工具
+
+游标是对 (排序值, id) 排序键的不透明编码（排序值取决于排序方式，
+见 app.services.leaderboard_index.LEADERBOARD_SORTS），同时携带该行的排名，
+使得按游标翻页时无需 OFFSET 扫描也能给出正确排名。
+"""
+import base64
+import json
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+# 游标方向
+CURSOR_NEXT = "next"    # 取排序键之后的记录
+CURSOR_PREV = "prev"    # 取排序键之前的记录
+CURSOR_AT = "at"        # 从排序键所在记录开始（包含该记录）
+
+_DIRECTIONS = (CURSOR_NEXT, CURSOR_PREV, CURSOR_AT)
+
+
+@dataclass(frozen=True)
+class LeaderboardCursor:
+    """解码后的排行榜游标"""
+    value: Decimal
+    id: int
+    rank: int
+    direction: str
+    device_type: Optional[str]
+    reverse: bool
+    sort: str = "time"
+
+    @property
+    def key(self):
+        return self.value, self.id
+
+
+def encode_cursor(value, record_id: int, rank: int, direction: str,
+                  device_type: Optional[str], reverse: bool, sort: str = "time") -> str:
+    """编码游标"""
+    payload = {
+        "t": str(value),
+        "i": int(record_id),
+        "r": int(rank),
+        "d": direction,
+        "dt": device_type,
+        "rv": bool(reverse),
+        "s": sort
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, device_type: Optional[str], reverse: bool, sort: str = "time") -> LeaderboardCursor:
+    """
+    解码游标并校验其与当前榜单一致
+
+    Raises:
+        ValueError: 游标格式错误或与当前榜单不匹配
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        cursor = LeaderboardCursor(
+            value=Decimal(payload["t"]),
+            id=int(payload["i"]),
+            rank=int(payload["r"]),
+            direction=payload["d"],
+            device_type=payload.get("dt"),
+            reverse=bool(payload.get("rv", False)),
+            # 旧版游标没有排序方式，均为按时间排序
+            sort=payload.get("s", "time")
+        )
+    except (ValueError, TypeError, KeyError, InvalidOperation) as e:
+        raise ValueError("游标格式错误") from e
+
+    # NaN/Infinity 无法参与排序键比较
+    if not cursor.value.is_finite() or cursor.direction not in _DIRECTIONS or cursor.rank < 1:
+        raise ValueError("游标格式错误")
+    if cursor.device_type != device_type or cursor.reverse != reverse or cursor.sort != sort:
+        raise ValueError("游标与当前榜单不匹配")
+    return cursor
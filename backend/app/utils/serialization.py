@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+响应序列化
+
+- dumps / FastJSONResponse: 基于 orjson 的 JSON 编码，作为应用默认响应类。
+  路由直接返回 FastJSONResponse 时跳过 FastAPI 的 jsonable_encoder 递归转换
+- RowSerializer: 按列类型预先确定每列的转换（DECIMAL -> float、Enum -> 值、
+  时间 -> ISO 8601），把按列顺序的查询行或 ORM 对象转为可直接编码的字典。
+  排行榜、我的记录、记录详情和模型 to_dict 共用，不再逐字段手写转换
+"""
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy import Date, DateTime, Enum, Numeric
+
+
+def _default(value):
+    """orjson 不支持的类型"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """编码为 JSON 字节（支持 datetime、Enum、Decimal）"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 编码的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _decimal(value) -> Optional[float]:
+    return float(value) if value else None
+
+
+def _enum(value) -> Optional[str]:
+    return value.value if value else None
+
+
+def _temporal(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _converter_for(column_type) -> Optional[Callable]:
+    """列类型对应的转换函数，无需转换时为 None"""
+    if isinstance(column_type, Enum):
+        return _enum
+    if isinstance(column_type, Numeric) and column_type.asdecimal:
+        return _decimal
+    if isinstance(column_type, (DateTime, Date)):
+        return _temporal
+    return None
+
+
+class RowSerializer:
+    """查询行 -> 响应字典"""
+
+    def __init__(self, columns: Sequence, exclude: Iterable[str] = (),
+                 defaults: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            columns: 查询的列（ORM 属性、表列或带 label 的表达式），顺序与查询行一致
+            exclude: 查询了但不输出的列
+            defaults: 转换结果为 None 时使用的默认值
+        """
+        self.names: Tuple[str, ...] = tuple(column.key for column in columns)
+        self._conversions = tuple(
+            (column.key, converter)
+            for column in columns
+            if column.key not in exclude and (converter := _converter_for(column.type)) is not None
+        )
+        self._exclude = tuple(name for name in self.names if name in exclude)
+        self._defaults = tuple((defaults or {}).items())
+        self._getter = attrgetter(*self.names)
+
+    def __call__(self, row: Sequence) -> dict:
+        """转换按列顺序的查询行（Row 或元组）"""
+        result = dict(zip(self.names, row))
+        for name in self._exclude:
+            del result[name]
+        for name, convert in self._conversions:
+            result[name] = convert(result[name])
+        for name, default in self._defaults:
+            if result[name] is None:
+                result[name] = default
+        return result
+
+    def from_object(self, obj) -> dict:
+        """转换 ORM 对象（按列名读取属性）"""
+        values = self._getter(obj)
+        return self(values if len(self.names) > 1 else (values,))
@@ -4,6 +4,8 @@
 基准测试评分平台 - 主应用入口（重构版）
 版本: 2.0.0
 """
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -12,21 +14,108 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # 导入配置
-from app.config import ALLOWED_ORIGINS
+from app.config import (
+    ALLOWED_ORIGINS, ENABLE_LEADERBOARD_INDEX, ENABLE_CPU_STATS_INDEX, ENABLE_METRICS, DEBUG_QUERY_COUNT,
+    ENABLE_SNAPSHOT_SCHEDULER, SNAPSHOT_HOUR, SNAPSHOT_RETENTION_DAYS, SETTINGS_REFRESH_SECONDS,
+    DATA_VERSION_REFRESH_SECONDS
+)
 
 # 导入路由
-from app.routes import health, auth, benchmarks
+from app.routes import health, auth, benchmarks, snapshots, admin
 
 # 导入数据库初始化
 from app.dependencies.database_init import check_database_exists
+from app.dependencies.database import AsyncSessionLocal, async_engine
+
+# 导入排行榜索引
+from app.services.leaderboard_index import leaderboard_index
+from app.services.leaderboard_snapshot import run_snapshot_scheduler
+from app.services.system_settings import system_settings, run_settings_refresher
+from app.services.cpu_models import cpu_model_registry
+from app.services.cpu_stats import cpu_stats_index
+from app.services.data_version import data_version, run_data_version_refresher
+from app.services.oauth_client import oauth_http_client
+from app.utils.serialization import FastJSONResponse
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时加载系统配置与 CPU 型号、构建排行榜与 CPU 型号统计内存索引并启动跨进程版本检查、启动快照调度、创建 OAuth 连接池，关闭时释放连接"""
+    await oauth_http_client.start()
+
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await system_settings.load(db)
+        print(f"[OK] 系统配置加载完成，共 {count} 项")
+    except Exception as e:
+        print(f"[ERROR] 系统配置加载失败，使用默认值: {e}")
+    settings_task = asyncio.create_task(run_settings_refresher(AsyncSessionLocal, SETTINGS_REFRESH_SECONDS))
+
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await cpu_model_registry.load(db)
+        print(f"[OK] CPU 型号加载完成，共 {count} 个型号")
+    except Exception as e:
+        print(f"[ERROR] CPU 型号加载失败，按需从数据库读取: {e}")
+
+    # 先读取数据版本再构建索引：构建期间其他进程的写入会在下次版本检查时重新加载
+    try:
+        async with AsyncSessionLocal() as db:
+            version = await data_version.load(db)
+        print(f"[OK] 数据版本加载完成，当前版本 {version}")
+    except Exception as e:
+        print(f"[ERROR] 数据版本加载失败，无法感知其他进程的写入: {e}")
+    data_version_task = asyncio.create_task(run_data_version_refresher(AsyncSessionLocal, DATA_VERSION_REFRESH_SECONDS))
+
+    if ENABLE_LEADERBOARD_INDEX:
+        try:
+            async with AsyncSessionLocal() as db:
+                count = await leaderboard_index.load(db)
+            print(f"[OK] 排行榜索引构建完成，共 {count} 条记录")
+        except Exception as e:
+            print(f"[ERROR] 排行榜索引构建失败，回退到数据库查询: {e}")
+
+    if ENABLE_CPU_STATS_INDEX:
+        try:
+            async with AsyncSessionLocal() as db:
+                count = await cpu_stats_index.load(db)
+            print(f"[OK] CPU 型号统计索引构建完成，共 {count} 个分组")
+        except Exception as e:
+            print(f"[ERROR] CPU 型号统计索引构建失败，回退到数据库查询: {e}")
+
+    snapshot_task = None
+    if ENABLE_SNAPSHOT_SCHEDULER:
+        snapshot_task = asyncio.create_task(run_snapshot_scheduler(SNAPSHOT_HOUR, SNAPSHOT_RETENTION_DAYS))
+        print(f"[INFO] 排行榜快照调度已启动，每天 {SNAPSHOT_HOUR}:00 (UTC) 执行")
+
+    yield
+
+    settings_task.cancel()
+    data_version_task.cancel()
+    if snapshot_task:
+        snapshot_task.cancel()
+
+    await oauth_http_client.close()
+
+    # 关闭本进程的数据库连接池
+    await async_engine.dispose()
+
 
 # 创建FastAPI应用
 app = FastAPI(
     title="基准测试评分平台",
     description="集成 linux.do OAuth 认证的基准测试平台",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    # orjson 编码响应；热点接口直接返回 FastJSONResponse，跳过 jsonable_encoder
+    default_response_class=FastJSONResponse
 )
 
+# JSON 响应压缩（先于 CORS 注册，位于其内层）
+app.add_middleware(CompressionMiddleware)
+
 # 配置CORS
 app.add_middleware(
     CORSMiddleware,
@@ -36,48 +125,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 请求上下文（数据库事件据此取得发起查询的路由）
+app.add_middleware(RequestContextMiddleware)
+
+# 调试：响应头返回请求执行的 SQL 语句数
+if DEBUG_QUERY_COUNT:
+    from app.middleware.query_count import QueryCountMiddleware
+    app.add_middleware(QueryCountMiddleware)
+
+# 请求指标（最后注册，位于最外层）
+if ENABLE_METRICS:
+    from app.middleware.metrics import MetricsMiddleware
+    app.add_middleware(MetricsMiddleware)
+
 # 注册路由
 app.include_router(health.router)
 app.include_router(auth.router)
+app.include_router(snapshots.router)
 app.include_router(benchmarks.router)
+app.include_router(admin.router)
 
 # 静态文件服务（生产模式）
 import os
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import Request
+from app.services.static_site import StaticSite
 
 dist_path = os.path.join(os.path.dirname(__file__), "..", "dist")
 if os.path.exists(dist_path):
-    print(f"[INFO] 检测到 dist 目录，启用静态文件服务")
-
-    # MIME类型映射
-    import mimetypes
-    mimetypes.add_type('application/javascript', '.js')
-    mimetypes.add_type('text/css', '.css')
-    mimetypes.add_type('image/svg+xml', '.svg')
-
-    # Serve静态资源（CSS, JS等）
-    app.mount("/assets", StaticFiles(directory=os.path.join(dist_path, "assets")), name="assets")
-
-    # SPA路由：所有非API/assets请求返回index.html
-    @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
-        # 排除 assets 路径（由 StaticFiles 处理）
-        if full_path.startswith("assets"):
-            from fastapi import HTTPException
-            raise HTTPException(status_code=404)
-        # 尝试返回静态文件
-        file_path = os.path.join(dist_path, full_path)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        # 否则返回index.html（SPA路由）
-        return FileResponse(os.path.join(dist_path, "index.html"))
+    # 启动时生成文件清单，请求时不再检查文件系统
+    static_site = StaticSite(dist_path)
+    print(f"[INFO] 检测到 dist 目录，启用静态文件服务，共 {static_site.load()} 个文件")
+
+    # 静态资源与 SPA 路由：清单中的文件直接返回，其余路径返回 index.html
+    @app.api_route("/{full_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def serve_spa(full_path: str, request: Request):
+        return static_site.response(full_path, request.headers, request.method)
 else:
     print(f"[INFO] 未检测到 dist 目录，使用开发模式（需要单独运行前端）")
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from app.server import run
 
     print("=" * 60)
     print("Starting Benchmark Platform (Refactored Version)")
@@ -101,4 +189,5 @@ if __name__ == "__main__":
     print("Starting server...")
     print("=" * 60)
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # 单进程模式；生产环境多进程部署使用 gunicorn -c backend/gunicorn.conf.py
+    run(app, host="0.0.0.0", port=8000)
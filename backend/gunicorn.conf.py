@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+gunicorn 生产配置（多进程）
+
+使用方法（在项目根目录下）:
+    gunicorn -c backend/gunicorn.conf.py
+
+- worker 数取 WEB_CONCURRENCY，未设置时取本进程可用的 CPU 核数
+- worker 使用 uvloop + httptools（app.server.ProductionWorker）
+- 不预加载应用：每个 worker 在 fork 之后才导入 app_main，数据库引擎和连接池在 worker 内创建；
+  数据库检查与迁移在启动前的独立子进程中执行，主进程不导入数据库模块、不持有连接
+- 设置 DB_POOL_BUDGET 后各 worker 按 worker 数平分数据库连接总预算
+- 收到 SIGTERM 时停止接受新连接、结束实时推送连接，等待进行中的请求完成，最长 GRACEFUL_TIMEOUT 秒
+- 排行榜内存索引、响应缓存和实时推送都是进程内状态，每个 worker 各自维护；各 worker 每
+  DATA_VERSION_REFRESH_SECONDS 秒检查数据版本，其他 worker 写入后重新加载索引（app/services/data_version.py）
+- 多 worker 时请关闭 ENABLE_SNAPSHOT_SCHEDULER，改用 cron 执行快照任务
+- 开启 ENABLE_METRICS（默认）时设置 PROMETHEUS_MULTIPROC_DIR，各 worker 把指标写入该目录，
+  /metrics 汇总全部 worker；启动时清除上次遗留的指标文件，worker 退出时标记其仪表值失效
+"""
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+
+from dotenv import load_dotenv
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+load_dotenv()
+
+
+def _available_cpus() -> int:
+    """可用 CPU 核数（容器中遵循 cpuset 限制）"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+workers = int(os.getenv("WEB_CONCURRENCY") or 0) or _available_cpus()
+# worker 继承该环境变量，据此计算各自的连接池大小（见 app/dependencies/database.py）
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Prometheus 多进程指标目录（worker 继承该环境变量，见 app/services/metrics.py）
+if os.getenv("ENABLE_METRICS", "true").lower() in ("true", "1", "yes"):
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "benchmark-platform-metrics"))
+
+chdir = BACKEND_DIR
+wsgi_app = "app_main:app"
+worker_class = "app.server.ProductionWorker"
+preload_app = False
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = 5
+
+accesslog = os.getenv("ACCESS_LOG") or None
+errorlog = "-"
+
+
+def on_starting(server):
+    """启动 worker 之前清理指标目录，并在子进程中检查数据库并执行迁移"""
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+
+    # 迁移子进程不写指标文件
+    env = {key: value for key, value in os.environ.items() if key != "PROMETHEUS_MULTIPROC_DIR"}
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "from app.dependencies.database_init import check_database_exists; check_database_exists()"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+    if result.returncode != 0:
+        print("[ERROR] 数据库初始化失败，请检查数据库连接配置")
+    print(f"[INFO] 启动 {workers} 个 worker，监听 {bind}")
+
+
+def child_exit(server, worker):
+    """worker 退出后其仪表值不再计入汇总"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,20 +2,20 @@
 # -*- coding: utf-8 -*-
 """
 简化的数据库初始化脚本
+
+创建数据库（如果不存在），然后执行 migrations 目录下尚未执行的迁移。
 """
 
 import os
-import mysql.connector
-from mysql.connector import Error
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 
 # 数据库连接配置 - 从环境变量读取，避免硬编码敏感信息
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', '127.0.0.1'),
-    'port': int(os.getenv('DB_PORT', '3306')),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', ''),
-    'charset': 'utf8mb4'
-}
+DB_HOST = os.getenv('DB_HOST', '127.0.0.1')
+DB_PORT = os.getenv('DB_PORT', '3306')
+DB_USER = os.getenv('DB_USER', 'root')
+DB_PASSWORD = os.getenv('DB_PASSWORD', '')
+DB_NAME = os.getenv('DB_NAME', 'benchmark')
 
 def init_database():
     """初始化数据库"""
@@ -23,39 +23,24 @@ def init_database():
         print("正在连接数据库...")
 
         # 连接MySQL服务器（不指定数据库）
-        connection = mysql.connector.connect(**DB_CONFIG)
-        cursor = connection.cursor()
-
-        # 创建数���库
-        cursor.execute("CREATE DATABASE IF NOT EXISTS benchmark DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-        cursor.execute("USE benchmark")
-
-        print("数据库 'benchmark' 创建/选择成功")
+        server_engine = create_engine(f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/?charset=utf8mb4")
+        with server_engine.begin() as conn:
+            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{DB_NAME}` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"))
+        server_engine.dispose()
 
-        # 读取并执行SQL文件
-        with open('init.sql', 'r', encoding='utf-8') as file:
-            sql_content = file.read()
+        print(f"数据库 '{DB_NAME}' 创建/选择成功")
 
-        # 分割SQL语句
-        sql_statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip() and not stmt.strip().startswith('--')]
+        # 执行迁移（导入时读取 DB_* 环境变量连接到目标库）
+        os.environ.setdefault('DB_NAME', DB_NAME)
+        from app.dependencies.database import engine
+        from app.dependencies.migrations import upgrade
 
-        executed_count = 0
-        for statement in sql_statements:
-            try:
-                cursor.execute(statement)
-                connection.commit()
-                executed_count += 1
-            except Error as e:
-                if "already exists" in str(e) or "Duplicate" in str(e):
-                    continue  # 忽略已存在的错误
-                print(f"执行SQL错误: {e}")
-                print(f"SQL: {statement[:100]}...")
-
-        print(f"成功执行 {executed_count} 条SQL语句")
+        executed = upgrade(engine)
+        print(f"成功执行 {len(executed)} 个迁移版本")
 
         # 验证表创建
-        cursor.execute("SHOW TABLES;")
-        tables = cursor.fetchall()
+        with engine.connect() as conn:
+            tables = conn.execute(text("SHOW TABLES")).fetchall()
         print(f"数据库中的表数量: {len(tables)}")
 
         if tables:
@@ -63,18 +48,12 @@ def init_database():
             for table in tables:
                 print(f"   - {table[0]}")
 
-        cursor.close()
-        connection.close()
-
         print("数据库初始化完成！")
         return True
 
-    except Error as e:
+    except SQLAlchemyError as e:
         print(f"数据库初始化失败: {e}")
         return False
-    except FileNotFoundError:
-        print("找不到 init.sql 文件")
-        return False
 
 if __name__ == "__main__":
     print("基准测试平台 - 数据库初始化")
@@ -83,4 +62,4 @@ if __name__ == "__main__":
     if init_database():
         print("初始化成功！")
     else:
-        print("初始化失败！")
\ No newline at end of file
+        print("初始化失败！")
@@ -1,13 +1,5 @@
 -- 基准测试评分平台数据库初始化脚本
 
--- 创建数据库（如果不存在）
-CREATE DATABASE IF NOT EXISTS `benchmark`
-DEFAULT CHARACTER SET utf8mb4
-DEFAULT COLLATE utf8mb4_unicode_ci;
-
--- 使用数据库
-USE `benchmark`;
-
 -- 用户表 - 存储通过 linux.do 认证的用户信息
 CREATE TABLE `users` (
     `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
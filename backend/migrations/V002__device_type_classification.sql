@@ -2,8 +2,6 @@
 -- 添加时间：2025-12-05
 -- 版本：1.1.0
 
-USE `benchmark`;
-
 -- 1. 添加设备类型字段到benchmark_results表
 ALTER TABLE `benchmark_results`
 ADD COLUMN `device_type` ENUM('server', 'consumer', 'unknown') DEFAULT 'unknown'
@@ -0,0 +1,14 @@
+-- 数据库迁移脚本：排行榜快照按设备类型分榜
+-- 添加时间：2026-10-18
+-- 版本：1.2.0
+
+-- 1. 快照排名按 (日期, 设备类型, 名次) 唯一，device_type 为 NULL 表示总榜
+ALTER TABLE `leaderboard_snapshots`
+DROP INDEX `uk_snapshot_rank`;
+
+ALTER TABLE `leaderboard_snapshots`
+MODIFY COLUMN `device_type` ENUM('server', 'consumer', 'unknown') DEFAULT NULL
+COMMENT '设备类型: server(服务器级), consumer(消费级), unknown(未知)，NULL 表示总榜';
+
+ALTER TABLE `leaderboard_snapshots`
+ADD UNIQUE KEY `uk_snapshot_device_rank` (`snapshot_date`, `device_type`, `rank_position`);
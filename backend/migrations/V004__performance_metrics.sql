@@ -0,0 +1,20 @@
+-- 数据库迁移脚本：存储性能指标并支持按分数排序的排行榜
+-- 添加时间：2026-10-18
+-- 版本：1.3.0
+-- 执行后运行 python -m app.services.metrics_backfill 回填已有记录的指标
+
+-- 1. 添加单核性能分数字段
+ALTER TABLE `benchmark_results`
+ADD COLUMN `performance_per_core` DECIMAL(15,6) DEFAULT NULL
+COMMENT '单核性能分数'
+AFTER `performance_score`;
+
+ALTER TABLE `benchmark_results`
+ADD INDEX `idx_performance_per_core` (`performance_per_core`);
+
+-- 2. 按分数排序的排行榜索引（sort=score / sort=per_core）
+ALTER TABLE `benchmark_results`
+ADD INDEX `idx_device_score` (`device_type`, `performance_score`);
+
+ALTER TABLE `benchmark_results`
+ADD INDEX `idx_device_per_core` (`device_type`, `performance_per_core`);
@@ -0,0 +1,12 @@
+-- 数据库迁移脚本：热点查询复合索引
+-- 添加时间：2026-10-18
+-- 版本：1.4.0
+
+-- 1. 按设备类型筛选、按 (overall_wall_time, id) 排序的排行榜与游标分页：
+--    索引顺序即榜单顺序，正序/倒序都无需 filesort
+ALTER TABLE `benchmark_results`
+ADD INDEX `idx_device_time` (`device_type`, `overall_wall_time`, `id`);
+
+-- 2. 用户记录列表（按提交时间排序）与提交数量统计
+ALTER TABLE `benchmark_results`
+ADD INDEX `idx_user_submitted` (`user_id`, `submitted_at`);
@@ -0,0 +1,16 @@
+-- 数据库迁移脚本：排行榜读取不再关联 users 表
+-- 添加时间：2026-10-18
+-- 版本：1.5.0
+
+-- 1. 记录上冗余存储提交者头像（username 已冗余存储）
+ALTER TABLE `benchmark_results`
+ADD COLUMN `avatar_url` VARCHAR(500) DEFAULT NULL
+COMMENT '用户头像URL（冗余字段，排行榜查询无需关联 users）'
+AFTER `username`;
+
+-- 2. 从 users 回填用户名和头像（保持记录原更新时间）
+UPDATE `benchmark_results` br
+INNER JOIN `users` u ON br.`user_id` = u.`id`
+SET br.`username` = u.`username`,
+    br.`avatar_url` = u.`avatar_url`,
+    br.`updated_at` = br.`updated_at`;
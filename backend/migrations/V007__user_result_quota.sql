@@ -0,0 +1,23 @@
+-- 数据库迁移脚本：提交数量限额改为用户行上的计数器
+-- 添加时间：2026-10-18
+-- 版本：1.6.0
+
+-- 1. 用户已提交记录数（提交时条件更新 result_count < 上限，删除时减一）
+ALTER TABLE `users`
+ADD COLUMN `result_count` INT UNSIGNED NOT NULL DEFAULT 0
+COMMENT '已提交的基准测试记录数（限额计数器）'
+AFTER `avatar_url`;
+
+-- 2. 从现有记录回填（保持用户原更新时间）
+UPDATE `users` u
+INNER JOIN (
+    SELECT `user_id`, COUNT(*) AS `cnt`
+    FROM `benchmark_results`
+    GROUP BY `user_id`
+) c ON c.`user_id` = u.`id`
+SET u.`result_count` = c.`cnt`,
+    u.`updated_at` = u.`updated_at`;
+
+-- 3. 提交上限由 system_config.max_results_per_user 配置（缺失时补上默认值 3）
+INSERT IGNORE INTO `system_config` (`config_key`, `config_value`, `config_type`, `description`) VALUES
+('max_results_per_user', '3', 'number', '每个用户最多提交的结果数量');
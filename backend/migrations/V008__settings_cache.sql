@@ -0,0 +1,11 @@
+-- 数据库迁移脚本：system_config 配置项由服务端内存缓存读取
+-- 添加时间：2026-10-18
+-- 版本：1.7.0
+
+-- 1. 新增可调整的配置项（已存在时保留现有值）
+INSERT IGNORE INTO `system_config` (`config_key`, `config_value`, `config_type`, `description`) VALUES
+('my_ranks_page_size', '20', 'number', '我的排名计算所在页码使用的每页条数（与前端排行榜每页条数一致）'),
+('session_expire_hours', '24', 'number', '登录会话有效小时数');
+
+-- 2. 服务每 SETTINGS_REFRESH_SECONDS 秒比较 (行数, MAX(updated_at), SUM(LENGTH(config_value)))，
+--    变化时重新加载；手工修改配置时保持 updated_at 自动更新即可
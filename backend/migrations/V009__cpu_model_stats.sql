@@ -0,0 +1,36 @@
+-- 数据库迁移脚本：按 CPU 型号汇总的耗时统计
+-- 添加时间：2026-10-18
+-- 版本：1.8.0
+-- 执行后运行 python -m app.services.cpu_stats 回填分组键并重建统计
+
+-- 1. 记录上的归一化 CPU 型号（分组键）；索引覆盖重新计算最佳耗时的查询
+ALTER TABLE `benchmark_results`
+ADD COLUMN `cpu_model_key` VARCHAR(255) DEFAULT NULL
+COMMENT '归一化的CPU型号（型号统计分组键）'
+AFTER `cpu_model`;
+
+ALTER TABLE `benchmark_results`
+ADD INDEX `idx_cpu_model_device` (`cpu_model_key`, `device_type`, `overall_wall_time`, `phase1_wall_time`, `phase2_wall_time`);
+
+-- 2. 统计表：各阶段耗时的最佳值、均值、离差平方和（Welford 算法增量维护）
+CREATE TABLE `cpu_model_stats` (
+    `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    `cpu_model_key` VARCHAR(255) NOT NULL COMMENT '归一化的CPU型号（分组键）',
+    `device_type` ENUM('server', 'consumer', 'unknown') NOT NULL COMMENT '设备类型',
+    `cpu_model` VARCHAR(255) NOT NULL COMMENT 'CPU型号（展示用，取首条记录的原始写法）',
+    `sample_count` INT NOT NULL DEFAULT 0 COMMENT '记录数',
+    `overall_best` DOUBLE DEFAULT NULL COMMENT '总耗时最佳值(秒)',
+    `overall_mean` DOUBLE NOT NULL DEFAULT 0 COMMENT '总耗时均值(秒)',
+    `overall_m2` DOUBLE NOT NULL DEFAULT 0 COMMENT '总耗时离差平方和',
+    `phase1_best` DOUBLE DEFAULT NULL COMMENT 'Phase 1 耗时最佳值(秒)',
+    `phase1_mean` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 1 耗时均值(秒)',
+    `phase1_m2` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 1 耗时离差平方和',
+    `phase2_best` DOUBLE DEFAULT NULL COMMENT 'Phase 2 耗时最佳值(秒)',
+    `phase2_mean` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 2 耗时均值(秒)',
+    `phase2_m2` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 2 耗时离差平方和',
+    `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_cpu_model_device` (`cpu_model_key`, `device_type`),
+    KEY `idx_device_sample_count` (`device_type`, `sample_count`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='CPU型号耗时统计表';
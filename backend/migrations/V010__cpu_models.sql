@@ -0,0 +1,52 @@
+-- 数据库迁移脚本：CPU 型号规范化与维度表
+-- 添加时间：2026-10-18
+-- 版本：1.9.0
+-- 执行后依次运行（在 backend 目录下）:
+--   python -m app.services.cpu_models   登记已有记录的型号并回填 cpu_model_id
+--   python -m app.services.cpu_stats    按型号ID重建统计
+
+-- 1. 型号维度表：规范名称（去掉商标符号、主频后缀、厂商附加描述）及其小写唯一键
+CREATE TABLE `cpu_models` (
+    `id` INT UNSIGNED NOT NULL AUTO_INCREMENT,
+    `model_key` VARCHAR(255) NOT NULL COMMENT '规范名称的小写形式（唯一键）',
+    `name` VARCHAR(255) NOT NULL COMMENT '规范名称',
+    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_model_key` (`model_key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='CPU型号维度表';
+
+-- 2. 记录引用型号ID，替换字符串分组键；原始 cpu_model 保留用于展示
+ALTER TABLE `benchmark_results`
+DROP INDEX `idx_cpu_model_device`,
+DROP COLUMN `cpu_model_key`,
+ADD COLUMN `cpu_model_id` INT UNSIGNED DEFAULT NULL
+COMMENT '规范化的CPU型号ID'
+AFTER `cpu_model`,
+ADD CONSTRAINT `fk_benchmark_cpu_model` FOREIGN KEY (`cpu_model_id`) REFERENCES `cpu_models` (`id`),
+ADD INDEX `idx_cpu_model_device` (`cpu_model_id`, `device_type`, `overall_wall_time`, `phase1_wall_time`, `phase2_wall_time`);
+
+-- 3. 统计表改为按型号ID分组（数据由重建命令生成）
+DROP TABLE `cpu_model_stats`;
+
+CREATE TABLE `cpu_model_stats` (
+    `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    `cpu_model_id` INT UNSIGNED NOT NULL COMMENT 'CPU型号ID',
+    `device_type` ENUM('server', 'consumer', 'unknown') NOT NULL COMMENT '设备类型',
+    `sample_count` INT NOT NULL DEFAULT 0 COMMENT '记录数',
+    `overall_best` DOUBLE DEFAULT NULL COMMENT '总耗时最佳值(秒)',
+    `overall_mean` DOUBLE NOT NULL DEFAULT 0 COMMENT '总耗时均值(秒)',
+    `overall_m2` DOUBLE NOT NULL DEFAULT 0 COMMENT '总耗时离差平方和',
+    `phase1_best` DOUBLE DEFAULT NULL COMMENT 'Phase 1 耗时最佳值(秒)',
+    `phase1_mean` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 1 耗时均值(秒)',
+    `phase1_m2` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 1 耗时离差平方和',
+    `phase2_best` DOUBLE DEFAULT NULL COMMENT 'Phase 2 耗时最佳值(秒)',
+    `phase2_mean` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 2 耗时均值(秒)',
+    `phase2_m2` DOUBLE NOT NULL DEFAULT 0 COMMENT 'Phase 2 耗时离差平方和',
+    `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_cpu_model_device` (`cpu_model_id`, `device_type`),
+    KEY `idx_device_sample_count` (`device_type`, `sample_count`),
+    CONSTRAINT `fk_stats_cpu_model` FOREIGN KEY (`cpu_model_id`) REFERENCES `cpu_models` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='CPU型号耗时统计表';
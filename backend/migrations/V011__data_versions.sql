@@ -0,0 +1,14 @@
+-- 数据库迁移脚本：排行榜数据版本号（多 worker 间同步进程内索引）
+-- 添加时间：2026-10-18
+-- 版本：1.10.0
+
+-- 1. 写入 benchmark_results / cpu_model_stats 的事务提交前把版本号加一，
+--    各 worker 轮询版本号，变化时重新加载排行榜与 CPU 型号统计内存索引（见 app/services/data_version.py）
+CREATE TABLE `data_versions` (
+    `name` VARCHAR(50) NOT NULL COMMENT '数据名称',
+    `version` BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT '版本号，每次写入加一',
+
+    PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='数据版本号';
+
+INSERT INTO `data_versions` (`name`, `version`) VALUES ('benchmark_results', 0);
@@ -0,0 +1,21 @@
+-- 数据库迁移脚本：数据变更日志（多 worker 间增量同步进程内索引）
+-- 添加时间：2026-10-18
+-- 版本：1.11.0
+
+-- 1. 递增 data_versions 的事务同时写入本次变更涉及的记录、用户和型号统计分组（版本号相同），
+--    各 worker 发现版本变化时只重新读取这些行并增量更新内存索引（见 app/services/data_version.py）；
+--    四列均为空的行表示整表变更（如重建型号统计），读取到时全量重新加载
+-- 2. 各 worker 定期删除超过 DATA_CHANGE_RETENTION_SECONDS 的日志；落后超过保留期的 worker 全量重新加载
+CREATE TABLE `data_changes` (
+    `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT COMMENT '日志ID',
+    `version` BIGINT UNSIGNED NOT NULL COMMENT '变更所属的数据版本',
+    `benchmark_id` BIGINT NULL COMMENT '变更的记录ID',
+    `user_id` BIGINT NULL COMMENT '资料变更的用户ID（重新读取该用户的全部记录）',
+    `cpu_model_id` INT NULL COMMENT '变更的统计分组：CPU型号ID',
+    `device_type` VARCHAR(20) NULL COMMENT '变更的统计分组：设备类型',
+    `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '写入时间',
+
+    PRIMARY KEY (`id`),
+    KEY `idx_version` (`version`),
+    KEY `idx_created_at` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='数据变更日志';
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+设备类型分类器微基准
+
+对比旧版（每次调用逐个关键词 lower() + 子串查找、每次编译正则）与预编译分支正则 + LRU 缓存版本：
+先在真实型号语料和随机拼接的型号上校验两者输出一致，再计时。
+
+使用方法（在 backend 目录下）:
+    python scripts/bench_classifier.py
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.device_classifier import DeviceTypeClassifier  # noqa: E402
+
+SERVER_CPU_KEYWORDS = DeviceTypeClassifier.SERVER_CPU_KEYWORDS
+CONSUMER_CPU_KEYWORDS = DeviceTypeClassifier.CONSUMER_CPU_KEYWORDS
+
+
+def legacy_classify_cpu(cpu_model):
+    """改造前 DeviceTypeClassifier.classify_cpu 的实现"""
+    if not cpu_model:
+        return 'unknown', 0.0
+
+    cpu_model_lower = cpu_model.lower()
+
+    server_score = 0.0
+    for keyword in SERVER_CPU_KEYWORDS:
+        if keyword.lower() in cpu_model_lower:
+            if keyword in ['Xeon', 'EPYC', 'POWER']:
+                server_score = max(server_score, 0.95)
+            elif 'eon' in cpu_model_lower or 'epyc' in cpu_model_lower:
+                server_score = max(server_score, 0.9)
+            else:
+                server_score = max(server_score, 0.8)
+
+    consumer_score = 0.0
+    for keyword in CONSUMER_CPU_KEYWORDS:
+        if keyword.lower() in cpu_model_lower:
+            if keyword in ['Core i3', 'Core i5', 'Core i7', 'Core i9',
+                           'Ryzen 3', 'Ryzen 5', 'Ryzen 7', 'Ryzen 9']:
+                consumer_score = max(consumer_score, 0.95)
+            elif 'core i' in cpu_model_lower or 'ryzen' in cpu_model_lower:
+                consumer_score = max(consumer_score, 0.9)
+            else:
+                consumer_score = max(consumer_score, 0.7)
+
+    if re.search(r'xeon\s+(?:gold|silver|bronze|platinum|w-\d+|d-\d+)', cpu_model_lower):
+        server_score = max(server_score, 0.98)
+    if re.search(r'epyc\s+\d+[a-z]*', cpu_model_lower):
+        server_score = max(server_score, 0.98)
+    if re.search(r'core\s+.*[uHQMK]$"', cpu_model_lower):
+        consumer_score = max(consumer_score, 0.9)
+
+    if server_score > consumer_score:
+        if server_score >= 0.7:
+            return 'server', server_score
+    elif consumer_score > server_score:
+        if consumer_score >= 0.7:
+            return 'consumer', consumer_score
+
+    if any(term in cpu_model_lower for term in ['server', 'workstation', 'ws']) and server_score > 0.3:
+        return 'server', max(server_score, 0.6)
+    if any(term in cpu_model_lower for term in ['desktop', 'laptop', 'mobile']) and consumer_score > 0.3:
+        return 'consumer', max(consumer_score, 0.6)
+
+    return 'unknown', 0.0
+
+
+# 常见的基准测试上报型号
+REAL_CPU_MODELS = [
+    "Intel(R) Xeon(R) CPU E5-2680 v4 @ 2.40GHz",
+    "Intel(R) Xeon(R) CPU E5-2670 v3 @ 2.30GHz",
+    "Intel(R) Xeon(R) Gold 6248R CPU @ 3.00GHz",
+    "Intel(R) Xeon(R) Platinum 8375C CPU @ 2.90GHz",
+    "Intel(R) Xeon(R) Silver 4214 CPU @ 2.20GHz",
+    "Intel(R) Xeon(R) W-2295 CPU @ 3.00GHz",
+    "Intel Xeon Processor (Cascadelake)",
+    "Intel Xeon Processor (Skylake, IBRS)",
+    "AMD EPYC 7742 64-Core Processor",
+    "AMD EPYC 7763 64-Core Processor",
+    "AMD EPYC 9654 96-Core Processor",
+    "AMD EPYC-Rome Processor",
+    "AMD EPYC Processor (with IBPB)",
+    "AMD Opteron(tm) Processor 6276",
+    "Ampere Altra Q80-30",
+    "Neoverse-N1",
+    "POWER9 (raw), altivec supported",
+    "Cavium ThunderX2(R) CPU CN9980 v2.2 @ 2.20GHz",
+    "Intel(R) Core(TM) i7-9700K CPU @ 3.60GHz",
+    "Intel(R) Core(TM) i9-13900K",
+    "12th Gen Intel(R) Core(TM) i7-12700H",
+    "13th Gen Intel(R) Core(TM) i5-1340P",
+    "11th Gen Intel(R) Core(TM) i5-1135G7 @ 2.40GHz",
+    "Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz",
+    "Intel(R) Core(TM) m3-7Y30 CPU @ 1.00GHz",
+    "Intel(R) Core(TM) Ultra 7 155H",
+    "AMD Ryzen 7 6800H with Radeon Graphics",
+    "AMD Ryzen 9 5900X 12-Core Processor",
+    "AMD Ryzen 5 5600G with Radeon Graphics",
+    "AMD Ryzen Threadripper 3970X 32-Core Processor",
+    "AMD Ryzen 9 7950X3D 16-Core Processor",
+    "AMD Athlon Silver 3050U with Radeon Graphics",
+    "AMD FX(tm)-8350 Eight-Core Processor",
+    "Intel(R) Pentium(R) Silver J5040 CPU @ 2.00GHz",
+    "Intel(R) Celeron(R) N5105 @ 2.00GHz",
+    "Intel(R) Pentium(R) CPU G4560 @ 3.50GHz",
+    "Apple M1",
+    "Apple M2 Pro",
+    "Apple M3 Max",
+    "Qualcomm Snapdragon X Elite - X1E78100",
+    "MediaTek Dimensity 9000",
+    "ARMv8 Processor rev 1 (v8l)",
+    "Cortex-A72",
+    "QEMU Virtual CPU version 2.5+",
+    "Common KVM processor",
+    "Unknown CPU Model",
+    "Intel(R) Xeon(R) CPU @ 2.20GHz",
+    "Intel Core i7 Mobile Workstation",
+    "Power Desktop Server",
+    "",
+    None,
+]
+
+
+def build_fuzz_corpus(size, seed=42):
+    """随机拼接关键词片段，覆盖重叠关键词和启发式分支"""
+    fragments = (
+        SERVER_CPU_KEYWORDS + CONSUMER_CPU_KEYWORDS
+        + ["Gold 6248", "W-2295", "7742", "Xeon  Silver", "eon", "ryzen", "core i", "laptop",
+           "desktop", "server", "ws", "@ 2.40GHz", "v4", "(R)", "(TM)", "-Core", " ", "K", "U\""]
+    )
+    rnd = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        parts = rnd.sample(fragments, rnd.randint(1, 4))
+        text = rnd.choice(["", " "]).join(parts)
+        corpus.append(rnd.choice([text, text.upper(), text.lower()]))
+    return corpus
+
+
+def main():
+    corpus = REAL_CPU_MODELS + build_fuzz_corpus(20000)
+    mismatches = [cpu for cpu in corpus if legacy_classify_cpu(cpu) != DeviceTypeClassifier.classify_cpu(cpu)]
+    for cpu in mismatches[:10]:
+        print("[DIFF]", repr(cpu), legacy_classify_cpu(cpu), DeviceTypeClassifier.classify_cpu(cpu))
+    print(f"一致性校验: {len(corpus) - len(mismatches)}/{len(corpus)} 一致")
+
+    # 模拟线上流量：少量型号反复出现
+    rnd = random.Random(7)
+    traffic = [rnd.choice(REAL_CPU_MODELS) for _ in range(20000)]
+
+    def run_uncached():
+        DeviceTypeClassifier._classify_lower.cache_clear()
+        for cpu in REAL_CPU_MODELS:
+            DeviceTypeClassifier.classify_cpu(cpu)
+
+    print("-" * 60)
+    print(f"{'场景':<28}{'旧版(µs/次)':>14}{'新版(µs/次)':>14}")
+    rows = [
+        ("未命中缓存（逐个型号）",
+         lambda: [legacy_classify_cpu(cpu) for cpu in REAL_CPU_MODELS], run_uncached, len(REAL_CPU_MODELS)),
+        ("重复型号流量（命中缓存）",
+         lambda: [legacy_classify_cpu(cpu) for cpu in traffic],
+         lambda: [DeviceTypeClassifier.classify_cpu(cpu) for cpu in traffic], len(traffic)),
+        ("classify_many 批量",
+         lambda: [legacy_classify_cpu(cpu) for cpu in traffic],
+         lambda: DeviceTypeClassifier.classify_many(traffic), len(traffic)),
+    ]
+    for name, legacy, current, count in rows:
+        legacy_us = min(timeit.repeat(legacy, number=5, repeat=3)) / 5 / count * 1e6
+        current_us = min(timeit.repeat(current, number=5, repeat=3)) / 5 / count * 1e6
+        print(f"{name:<28}{legacy_us:>14.2f}{current_us:>14.2f}   {legacy_us / current_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
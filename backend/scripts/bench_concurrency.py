@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并发压测脚本：混合负载下各接口的延迟分布（p50/p95/p99）
+
+对运行中的服务发起混合请求（排行榜深分页/倒序、我的排名、健康检查），
+用于比较同步 Session 与 AsyncSession 版本在并发下的尾延迟。
+
+使用方法:
+    # 1. 启动服务（关闭排行榜内存索引，让请求真正落到数据库）
+    ENABLE_LEADERBOARD_INDEX=false ENABLE_MOCK_LOGIN=true python app_main.py
+
+    # 2. 压测
+    python scripts/bench_concurrency.py --base-url http://localhost:8000 --concurrency 50 --duration 30
+
+    # 3. 切换到改造前的提交重复 1、2，对比输出中的 p99
+
+参考结果（SQLite，5000 用户 / 15000 条记录，1 vCPU，单个 uvicorn 进程，
+ENABLE_LEADERBOARD_INDEX=false，--duration 30 --max-page 700，单位 ms）:
+
+    并发 10                    同步 Session            AsyncSession
+                               p50      p99            p50      p99
+    leaderboard                670.8   2217.7          258.3    365.2
+    leaderboard_deep           718.2   1821.3          409.4    574.2
+    leaderboard_reverse        727.5   2068.0          427.2    595.5
+    my_ranks                  1627.1   2697.7         3370.9   3975.1
+    health                     727.6   1663.3          136.6    234.4
+    合计                       788.3   2628.3          317.5   3870.0
+    吞吐 (req/s)                11.5                     15.3
+
+    并发 50（超出单核处理能力，请求排队）
+    合计                      3197.1  15840.1         3491.9   9330.3
+    吞吐 (req/s)                13.2                     14.4
+
+AsyncSession 下排行榜和健康检查的 p99 降到原来的 1/4～1/7；my_ranks 当时仍是全表窗口函数查询，
+在 aiosqlite 的单连接线程上排队，p99 反而升高并决定了合计 p99。排行榜索引就绪时 my_ranks 已改由
+内存索引计算（不查询数据库）。MySQL 下的结果需在目标环境中重新测量。
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+# (名称, 路径, 权重)
+WORKLOAD = [
+    ("leaderboard", "/api/v1/benchmarks/leaderboard?page=1&limit=20", 4),
+    ("leaderboard_deep", "/api/v1/benchmarks/leaderboard?page={deep_page}&limit=20", 3),
+    ("leaderboard_reverse", "/api/v1/benchmarks/leaderboard?page={deep_page}&limit=20&reverse=true", 2),
+    ("my_ranks", "/api/v1/benchmarks/my-ranks", 2),
+    ("health", "/health", 3),
+]
+
+
+def percentile(samples, pct):
+    """计算百分位数（最近秩法）"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def login(client: httpx.AsyncClient, username: str) -> bool:
+    """通过 Mock 登录获取 auth_token cookie（服务需开启 ENABLE_MOCK_LOGIN）"""
+    response = await client.post("/api/v1/auth/mock-login", json={"username": username})
+    return response.status_code == 200
+
+
+async def worker(client: httpx.AsyncClient, deadline: float, max_page: int, latencies, errors):
+    names = [item[0] for item in WORKLOAD]
+    weights = [item[2] for item in WORKLOAD]
+    paths = {item[0]: item[1] for item in WORKLOAD}
+
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights=weights)[0]
+        path = paths[name].format(deep_page=random.randint(max(1, max_page // 2), max_page))
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[name] += 1
+        except httpx.HTTPError:
+            errors[name] += 1
+        latencies[name].append((time.perf_counter() - started) * 1000)
+
+
+async def run(args):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        if not await login(client, args.username):
+            print("[WARN] Mock 登录失败，my_ranks 请求将返回 401")
+
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*[
+            worker(client, deadline, args.max_page, latencies, errors)
+            for _ in range(args.concurrency)
+        ])
+
+    print(f"并发: {args.concurrency}  时长: {args.duration}s  目标: {args.base_url}")
+    print("-" * 78)
+    print(f"{'接口':<22}{'请求数':>8}{'错误':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    all_samples = []
+    for name, _, _ in WORKLOAD:
+        samples = latencies[name]
+        all_samples.extend(samples)
+        print(f"{name:<22}{len(samples):>8}{errors[name]:>6}"
+              f"{percentile(samples, 50):>10.1f}{percentile(samples, 95):>10.1f}"
+              f"{percentile(samples, 99):>10.1f}{max(samples, default=0):>10.1f}")
+    print("-" * 78)
+    total = len(all_samples)
+    print(f"{'合计':<22}{total:>8}{sum(errors.values()):>6}"
+          f"{percentile(all_samples, 50):>10.1f}{percentile(all_samples, 95):>10.1f}"
+          f"{percentile(all_samples, 99):>10.1f}{max(all_samples, default=0):>10.1f}")
+    if all_samples:
+        print(f"吞吐: {total / args.duration:.1f} req/s  平均: {statistics.mean(all_samples):.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="混合负载并发压测")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--max-page", type=int, default=50, help="深分页请求的最大页码")
+    parser.add_argument("--username", default="bench_user")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
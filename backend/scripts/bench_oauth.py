@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OAuth 登录回调压测脚本
+
+stub 模式启动一个本地替身 OAuth 服务（token 端点 + 用户信息端点，可设置响应延迟），
+并统计收到的请求数和 TCP 连接数；load 模式并发请求平台的回调接口，模拟登录高峰，
+输出回调延迟分布（p50/p95/p99）以及替身服务看到的连接数（连接复用时远小于请求数）。
+
+使用方法:
+    # 1. 启动替身 OAuth 服务
+    python scripts/bench_oauth.py stub --port 9100 --latency-ms 30
+
+    # 2. 启动平台，把 OAuth 端点指向替身服务
+    OAUTH_CLIENT_ID=bench OAUTH_CLIENT_SECRET=bench \\
+    OAUTH_TOKEN_ENDPOINT=http://127.0.0.1:9100/oauth2/token \\
+    OAUTH_USER_ENDPOINT=http://127.0.0.1:9100/api/user \\
+    python app_main.py
+
+    # 3. 压测
+    python scripts/bench_oauth.py load --base-url http://localhost:8000 \\
+        --stub-url http://127.0.0.1:9100 --concurrency 50 --requests 2000
+
+替身服务是明文 HTTP，测的是连接复用与并发上限；HTTP/2 需要 TLS 端点才会协商启用。
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    """计算百分位数（最近秩法）"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_stub(args):
+    """启动替身 OAuth 服务"""
+    import uvicorn
+    from fastapi import FastAPI, Request
+
+    stub = FastAPI()
+    stats = {"requests": 0, "connections": set()}
+
+    async def record(request: Request):
+        stats["requests"] += 1
+        stats["connections"].add((request.client.host, request.client.port))
+        if args.latency_ms:
+            await asyncio.sleep(args.latency_ms / 1000)
+
+    @stub.post("/oauth2/token")
+    async def token(request: Request):
+        await record(request)
+        form = await request.form()
+        return {"access_token": f"token-{form.get('code')}", "token_type": "bearer"}
+
+    @stub.get("/api/user")
+    async def user(request: Request):
+        await record(request)
+        user_id = request.headers.get("authorization", "").rsplit("-", 1)[-1]
+        return {
+            "id": user_id,
+            "username": f"oauth_bench_{user_id}",
+            "email": f"{user_id}@bench.local",
+            "avatar_template": "https://example.com/avatar/{size}.png"
+        }
+
+    @stub.get("/stats")
+    async def get_stats():
+        return {"requests": stats["requests"], "connections": len(stats["connections"])}
+
+    @stub.post("/stats/reset")
+    async def reset_stats():
+        stats["requests"] = 0
+        stats["connections"].clear()
+        return {"success": True}
+
+    uvicorn.run(stub, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+async def run_load(args):
+    """并发请求回调接口"""
+    latencies = []
+    errors = {}
+    counter = iter(range(args.requests))
+
+    async with httpx.AsyncClient(base_url=args.stub_url) as stub_client:
+        await stub_client.post("/stats/reset")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+
+        async def worker(index: int):
+            # 每个 worker 使用互不重叠的用户，避免同一新用户的首次登录并发插入
+            own_users = range(index + 1, args.users + 1, args.concurrency) or [index + 1]
+            for _ in counter:
+                code = random.choice(own_users)
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/api/v1/auth/linuxdo/callback", params={"code": code})
+                    if response.status_code != 302:
+                        errors[response.status_code] = errors.get(response.status_code, 0) + 1
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(index) for index in range(args.concurrency)])
+        elapsed = time.perf_counter() - started
+
+    async with httpx.AsyncClient(base_url=args.stub_url) as stub_client:
+        stub_stats = (await stub_client.get("/stats")).json()
+
+    print(f"登录回调 {len(latencies)} 次，并发 {args.concurrency}，耗时 {elapsed:.1f}s，"
+          f"吞吐 {len(latencies) / elapsed:.1f} 次/秒")
+    print(f"延迟(ms): p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+          f"p99={percentile(latencies, 99):.1f} 平均={statistics.mean(latencies):.1f}")
+    print(f"替身 OAuth 服务: 请求 {stub_stats['requests']} 次，TCP 连接 {stub_stats['connections']} 个")
+    if errors:
+        print(f"错误: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OAuth 登录回调压测")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    stub_parser = subparsers.add_parser("stub", help="启动替身 OAuth 服务")
+    stub_parser.add_argument("--port", type=int, default=9100)
+    stub_parser.add_argument("--latency-ms", type=float, default=30, help="每个请求的模拟延迟")
+
+    load_parser = subparsers.add_parser("load", help="压测平台回调接口")
+    load_parser.add_argument("--base-url", default="http://localhost:8000")
+    load_parser.add_argument("--stub-url", default="http://127.0.0.1:9100")
+    load_parser.add_argument("--concurrency", type=int, default=50)
+    load_parser.add_argument("--requests", type=int, default=2000)
+    load_parser.add_argument("--users", type=int, default=500, help="模拟的不同用户数")
+    load_parser.add_argument("--timeout", type=float, default=30)
+
+    args = parser.parse_args()
+    if args.mode == "stub":
+        run_stub(args)
+    else:
+        asyncio.run(run_load(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试输出解析器微基准
+
+对比旧版（6 次独立 re.search、含 [\\s\\S]*? 惰性跨段匹配）与单次扫描解析器：
+先校验两者在常规输入（及夹带大段日志、走关键字跳读路径的同一批输入）上的结果一致，
+再分别计时常规、大体积、无匹配日志和病态输入。
+
+使用方法（在 backend 目录下）:
+    python scripts/bench_parser.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.benchmark_parser import parse_benchmark_output  # noqa: E402
+
+SAMPLE = """=== System Information ===
+  CPU             : AMD Ryzen 7 6800H with Radeon Graphics
+  Cores_logical   : 16
+  Memory          : 7.8 GB
+
+[Phase 1] HMAC brute-force started
+  wall_time       : 64.642 s
+
+[Phase 2] LLL float benchmark
+  wall_time       : 71.761 s
+
+[Overall] total wall_time: 136.405 s
+"""
+
+
+def legacy_parse(text):
+    """改造前 /parse 接口的解析逻辑"""
+    parsed_data = {
+        "cpu_model": "",
+        "cpu_cores": None,
+        "memory_gb": None,
+        "phase1_wall_time": None,
+        "phase2_wall_time": None,
+        "overall_wall_time": None
+    }
+    cpu_match = re.search(r'CPU\s*[:\s]\s*(.+?)(?:\n|$)', text, re.IGNORECASE)
+    if cpu_match:
+        parsed_data["cpu_model"] = cpu_match.group(1).strip()
+    cores_match = re.search(r'(?:Cores|cores?|Cores?_logical)\s*[:\s]\s*(\d+)', text, re.IGNORECASE)
+    if cores_match:
+        parsed_data["cpu_cores"] = int(cores_match.group(1))
+    memory_match = re.search(r'Memory\s*[:\s]\s*([\d.]+)\s*(?:GB|gb|GiB|gib)', text, re.IGNORECASE)
+    if memory_match:
+        parsed_data["memory_gb"] = float(memory_match.group(1))
+    phase1_match = re.search(r'\[Phase\s*1\][\s\S]*?wall_time\s*[:\s]\s*([\d.]+)\s*s', text, re.IGNORECASE)
+    if phase1_match:
+        parsed_data["phase1_wall_time"] = float(phase1_match.group(1))
+    phase2_match = re.search(r'\[Phase\s*2\][\s\S]*?wall_time\s*[:\s]\s*([\d.]+)\s*s', text, re.IGNORECASE)
+    if phase2_match:
+        parsed_data["phase2_wall_time"] = float(phase2_match.group(1))
+    total_match = re.search(r'\[Overall\][\s\S]*?wall_time\s*[:\s]\s*([\d.]+)\s*s', text, re.IGNORECASE)
+    if total_match:
+        parsed_data["overall_wall_time"] = float(total_match.group(1))
+    return parsed_data
+
+
+def _log_noise(lines: int) -> str:
+    return "".join(f"[worker {i:05d}] progress {i % 100}% keys tested\n" for i in range(lines))
+
+
+def build_corpus():
+    """常规输入的变体，用于一致性校验；每个变体另附一份前后夹带日志的长文本"""
+    variants = [
+        SAMPLE,
+        SAMPLE.replace("  ", " "),
+        SAMPLE.lower(),
+        SAMPLE.replace(" : ", ":"),
+        SAMPLE.replace("Cores_logical", "Cores"),
+        SAMPLE.replace("GB", "GiB"),
+        SAMPLE.replace("[Overall] total wall_time: 136.405 s", "[Overall]\n  wall_time: 136.405s"),
+        SAMPLE.replace("\n", "\r\n"),
+        "[Phase 1]\nwall_time: 1.5 s\n[Phase 2]\nwall_time: 2.5 s\n",
+        "[Overall] wall_time: 3 s",
+        SAMPLE.replace("AMD Ryzen 7 6800H", "Intel(R) Xeon(R) 8 Cores 2.1GHz"),
+        SAMPLE.replace("AMD Ryzen 7 6800H", "Intel® Core™ i7-12700H"),
+        "CPU:   ",
+        "no benchmark data here",
+    ]
+    noise = _log_noise(200)
+    return variants + [noise + text + noise for text in variants]
+
+
+def build_inputs():
+    log_noise = _log_noise(20000)
+    return {
+        "常规输入": SAMPLE,
+        "大体积输入 (~1MB 日志)": SAMPLE.replace("[Phase 2]", log_noise + "[Phase 2]"),
+        "无匹配日志 (~1MB)": log_noise,
+        "病态输入 (大量段头无 wall_time)": "[Phase 1] retry\n" * 2000 + "[Phase 2] retry\n" * 2000,
+        "病态输入 (长空白串)": "wall_time" + " " * 20000 + "x\n" + SAMPLE,
+    }
+
+
+def _time_ms(func, text):
+    """单次调用耗时（毫秒），按首次耗时决定重复次数"""
+    number, _ = timeit.Timer(lambda: func(text)).autorange()
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=3)) / number * 1000
+
+
+def main():
+    mismatches = 0
+    for text in build_corpus():
+        if legacy_parse(text) != parse_benchmark_output(text):
+            mismatches += 1
+            print("[DIFF]", repr(text[:60]))
+            print("  legacy:", legacy_parse(text))
+            print("  new   :", parse_benchmark_output(text))
+    print(f"一致性校验: {len(build_corpus()) - mismatches}/{len(build_corpus())} 一致")
+    print("-" * 72)
+    print(f"{'输入':<32}{'旧版(ms)':>12}{'新版(ms)':>12}{'加速比':>10}")
+
+    for name, text in build_inputs().items():
+        legacy = _time_ms(legacy_parse, text)
+        single = _time_ms(parse_benchmark_output, text)
+        print(f"{name:<32}{legacy:>12.3f}{single:>12.3f}{legacy / single:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+排行榜页面序列化微基准
+
+对比改造前的路径（ORM 对象逐字段手写转换 + jsonable_encoder + 标准库 json 编码）与
+当前路径（按列查询的元组行 + RowSerializer + orjson 编码）序列化一页排行榜的耗时。
+先校验两者解码后的内容一致，再按不同每页条数计时。不连接数据库，只计序列化本身。
+
+使用方法（在 backend 目录下）:
+    python scripts/bench_serialization.py
+"""
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.models import BenchmarkResult, DeviceType  # noqa: E402
+from app.services.leaderboard_index import LEADERBOARD_COLUMNS, build_entry  # noqa: E402
+from app.utils.serialization import dumps  # noqa: E402
+
+PAGE_SIZES = (20, 100, 500)
+
+
+def build_records(count):
+    """生成与数据库读取结果类型一致的记录（DECIMAL 列为 Decimal）"""
+    rnd = random.Random(1)
+    submitted = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    records = []
+    for i in range(count):
+        phase1 = Decimal(f"{rnd.uniform(20, 120):.6f}")
+        phase2 = Decimal(f"{rnd.uniform(20, 120):.6f}")
+        records.append(BenchmarkResult(
+            id=i + 1, user_id=i + 1, username=f"user{i}", avatar_url=f"https://example.com/avatar/{i}.png",
+            cpu_model=rnd.choice(["AMD Ryzen 9 7950X", "Intel Xeon Gold 6248R", "Apple M2 Pro"]),
+            cpu_cores=rnd.choice([8, 16, 32, 64]), memory_gb=Decimal("31.25"),
+            phase1_wall_time=phase1, phase2_wall_time=phase2, overall_wall_time=phase1 + phase2,
+            device_type=rnd.choice(list(DeviceType)), device_type_confidence=Decimal("0.90"),
+            performance_score=Decimal(f"{rnd.uniform(500, 2000):.6f}"),
+            performance_per_core=Decimal(f"{rnd.uniform(50, 200):.6f}"),
+            throughput_keys_per_sec=rnd.randint(100000, 900000),
+            submitted_at=submitted + timedelta(minutes=i)
+        ))
+    return records
+
+
+def legacy_entry(benchmark):
+    """改造前排行榜条目的手写转换"""
+    return {
+        "id": benchmark.id,
+        "username": benchmark.username,
+        "avatar_url": benchmark.avatar_url,
+        "cpu_model": benchmark.cpu_model,
+        "cpu_cores": benchmark.cpu_cores,
+        "memory_gb": float(benchmark.memory_gb) if benchmark.memory_gb else None,
+        "phase1_wall_time": float(benchmark.phase1_wall_time) if benchmark.phase1_wall_time else None,
+        "phase2_wall_time": float(benchmark.phase2_wall_time) if benchmark.phase2_wall_time else None,
+        "overall_wall_time": float(benchmark.overall_wall_time) if benchmark.overall_wall_time else None,
+        "device_type": benchmark.device_type.value if benchmark.device_type else "unknown",
+        "device_type_confidence": float(benchmark.device_type_confidence) if benchmark.device_type_confidence else 0.0,
+        "performance_score": float(benchmark.performance_score) if benchmark.performance_score else None,
+        "performance_per_core": float(benchmark.performance_per_core) if benchmark.performance_per_core else None,
+        "throughput_keys_per_sec": benchmark.throughput_keys_per_sec,
+        "submitted_at": benchmark.submitted_at.isoformat() if benchmark.submitted_at else None
+    }
+
+
+def legacy_page(records):
+    leaderboard = [{"rank": rank, **legacy_entry(record)} for rank, record in enumerate(records, start=1)]
+    content = {"success": True, "data": {"leaderboard": leaderboard}}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def current_page(rows):
+    leaderboard = [{"rank": rank, **build_entry(row)} for rank, row in enumerate(rows, start=1)]
+    return dumps({"success": True, "data": {"leaderboard": leaderboard}})
+
+
+def _time_ms(func, arg):
+    """单次调用耗时（毫秒），按首次耗时决定重复次数"""
+    number, _ = timeit.Timer(lambda: func(arg)).autorange()
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=3)) / number * 1000
+
+
+def main():
+    records = build_records(max(PAGE_SIZES))
+    # 按 LEADERBOARD_COLUMNS 查询得到的元组行
+    names = [column.key for column in LEADERBOARD_COLUMNS]
+    rows = [tuple(getattr(record, name) for name in names) for record in records]
+
+    if json.loads(legacy_page(records)) != json.loads(current_page(rows)):
+        print("[ERROR] 两种路径的输出不一致")
+        sys.exit(1)
+    print("一致性校验: 输出一致")
+    print("-" * 60)
+    print(f"{'每页条数':<12}{'旧版(ms)':>12}{'新版(ms)':>12}{'加速比':>10}")
+
+    for size in PAGE_SIZES:
+        legacy = _time_ms(legacy_page, records[:size])
+        current = _time_ms(current_page, rows[:size])
+        print(f"{size:<12}{legacy:>12.3f}{current:>12.3f}{legacy / current:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+接口 SQL 查询预算检查
+
+在临时 SQLite 库中准备数据，依次调用 routes/benchmarks.py、routes/auth.py、routes/health.py
+中的每个接口，用 query_budget（app/services/query_counter.py）断言单次调用执行的 SQL 语句数
+不超过预算；超出时输出执行过的语句，退出码为 1。
+
+- 每次调用前清空用户缓存和排行榜响应缓存，预算按未命中缓存计算
+- 我的记录、我的排名分别用 1 条和 3 条记录的用户调用，预算相同：语句数随记录数增长即为 N+1
+- OAuth 回调用 httpx.MockTransport 模拟 token 端点和用户信息端点，分别覆盖新用户和老用户登录，
+  检查结束后恢复并关闭原客户端
+- 排行榜与我的排名再以排行榜索引未就绪（与 ENABLE_LEADERBOARD_INDEX=false 相同）的状态检查一遍（FALLBACK_BUDGETS），
+  覆盖偏移分页（总数 + 分页）、游标分页（_keyset_page）和窗口函数排名（_my_ranks_query）三条数据库查询路径
+
+接口改动使查询次数变化时同步修改 BUDGETS。
+
+使用方法（在 backend 目录下）:
+    python scripts/check_query_budget.py
+    python scripts/check_query_budget.py --verbose   # 输出每个接口执行的语句
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 必须在导入应用之前设置：临时 SQLite 库、Mock 登录、关闭后台任务
+_DB_DIR = tempfile.mkdtemp(prefix="query-budget-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_DB_DIR, 'budget.db')}",
+    "ENABLE_MOCK_LOGIN": "true",
+    "ENABLE_LEADERBOARD_INDEX": "true",
+    "ENABLE_SNAPSHOT_SCHEDULER": "false",
+    "ENABLE_SLOW_QUERY_LOG": "false",
+    "SETTINGS_REFRESH_SECONDS": "3600",
+    "OAUTH_CLIENT_ID": "budget",
+    "OAUTH_CLIENT_SECRET": "budget",
+    "OAUTH_TOKEN_ENDPOINT": "https://oauth.budget.local/oauth2/token",
+    "OAUTH_USER_ENDPOINT": "https://oauth.budget.local/api/user",
+})
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+import httpx  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.dependencies.database_init import check_database_exists  # noqa: E402
+from app.services.query_counter import query_budget, QueryBudgetExceeded  # noqa: E402
+from app.services.user_cache import user_cache  # noqa: E402
+from app.services.response_cache import leaderboard_cache  # noqa: E402
+from app.services.oauth_client import oauth_http_client  # noqa: E402
+from app.services.leaderboard_index import leaderboard_index  # noqa: E402
+
+API = "/api/v1/benchmarks"
+
+SAMPLE = """=== System Information ===
+  CPU             : AMD Ryzen 7 6800H with Radeon Graphics
+  Cores_logical   : 16
+  Memory          : 7.8 GB
+
+[Phase 1] HMAC brute-force started
+  wall_time       : 64.642 s
+
+[Phase 2] LLL float benchmark
+  wall_time       : 71.761 s
+
+[Overall] total wall_time: 136.405 s
+"""
+
+CPU_MODELS = ["AMD Ryzen 7 6800H with Radeon Graphics", "Intel(R) Xeon(R) Gold 6248R CPU @ 3.00GHz", "AMD EPYC 7742 64-Core Processor"]
+
+# (名称, 用户, 方法, 路径, 请求参数, 预期状态码, 预算)
+# 用户为 None 时不带认证 Cookie；路径中的 {alice_record} / {bob_record} 为准备数据时创建的记录
+BUDGETS = [
+    # health.py
+    ("健康检查", None, "GET", "/health", {}, 200, 1),
+    ("Prometheus 指标", None, "GET", "/metrics", {}, 200, 0),
+    # auth.py
+    ("登录地址", None, "GET", "/api/v1/auth/login", {}, 200, 0),
+    ("OAuth 回调（新用户）", None, "POST", "/api/v1/auth/linuxdo/callback", {"json": {"code": "dave"}}, 302, 3),
+    ("OAuth 回调（老用户）", None, "GET", "/api/v1/auth/linuxdo/callback", {"params": {"code": "dave"}}, 302, 3),
+    ("当前用户", "alice", "GET", "/api/v1/auth/me", {}, 200, 1),
+    ("退出登录", "alice", "POST", "/api/v1/auth/logout", {}, 200, 0),
+    ("Mock 登录（老用户）", None, "POST", "/api/v1/auth/mock-login", {"json": {"username": "alice"}}, 200, 3),
+    ("Mock 登录（新用户）", None, "POST", "/api/v1/auth/mock-login", {"json": {"username": "erin"}}, 200, 3),
+    ("验证令牌", "alice", "GET", "/api/v1/auth/verify-token", {}, 200, 0),
+    # benchmarks.py
+    ("解析", None, "POST", f"{API}/parse", {"json": {"text": SAMPLE}}, 200, 0),
+    ("批量解析", None, "POST", f"{API}/parse/batch", {"content": json.dumps({"text": SAMPLE}) + "\n"}, 200, 0),
+    ("设备类型分类", None, "POST", f"{API}/classify-device-type", {"json": {"cpu_model": CPU_MODELS[0]}}, 200, 0),
+    ("排行榜", None, "GET", f"{API}/leaderboard", {"params": {"limit": 20}}, 200, 0),
+    ("排行榜（设备类型）", None, "GET", f"{API}/leaderboard", {"params": {"device_type": "server", "sort": "score"}}, 200, 0),
+    ("实时推送（参数错误）", None, "GET", f"{API}/stream", {"params": {"device_type": "bad"}}, 400, 0),
+    ("我的记录（1 条）", "bob", "GET", f"{API}/my-result", {}, 200, 2),
+    ("我的记录（3 条）", "alice", "GET", f"{API}/my-result", {}, 200, 2),
+    ("我的排名（1 条）", "bob", "GET", f"{API}/my-ranks", {}, 200, 0),
+    ("我的排名（3 条）", "alice", "GET", f"{API}/my-ranks", {}, 200, 0),
+    ("型号统计", None, "GET", f"{API}/cpu-stats", {}, 200, 0),
+    ("型号统计（指定型号）", None, "GET", f"{API}/cpu-stats", {"params": {"cpu_model": CPU_MODELS[1]}}, 200, 0),
+    ("记录详情", "alice", "GET", f"{API}/{{alice_record}}", {}, 200, 1),
+    ("提交（已有型号）", "carol", "POST", f"{API}/submit", {"json": "submit_known"}, 200, 8),
+    ("提交（新型号）", "carol", "POST", f"{API}/submit", {"json": "submit_new"}, 200, 10),
+    ("更新记录", "alice", "PUT", f"{API}/{{alice_record}}", {"json": {"overall_wall_time": 99.5}}, 200, 9),
+    ("更新记录（改型号）", "alice", "PUT", f"{API}/{{alice_record}}", {"json": {"cpu_model": CPU_MODELS[2]}}, 200, 14),
+    ("删除记录", "bob", "DELETE", f"{API}/{{bob_record}}", {}, 200, 9),
+]
+
+# 排行榜索引未就绪时的数据库查询路径；{cursor} 为第一页响应中的 next_cursor
+FALLBACK_BUDGETS = [
+    ("排行榜（数据库分页）", None, "GET", f"{API}/leaderboard", {"params": {"limit": 2, "page": 2}}, 200, 2),
+    ("排行榜（数据库分页，设备类型）", None, "GET", f"{API}/leaderboard",
+     {"params": {"device_type": "server", "sort": "score"}}, 200, 2),
+    ("排行榜（keyset 游标）", None, "GET", f"{API}/leaderboard?limit=2&cursor={{cursor}}", {}, 200, 1),
+    ("我的排名（数据库，1 条）", "bob", "GET", f"{API}/my-ranks", {}, 200, 1),
+    ("我的排名（数据库，3 条）", "alice", "GET", f"{API}/my-ranks", {}, 200, 1),
+]
+
+
+def submit_body(cpu_model: str, overall: float) -> dict:
+    return {
+        "cpu_model": cpu_model, "cpu_cores": 16, "memory_gb": 32,
+        "phase1_wall_time": overall * 0.45, "phase2_wall_time": overall * 0.55, "overall_wall_time": overall
+    }
+
+
+REQUEST_BODIES = {
+    "submit_known": submit_body(CPU_MODELS[1], 120.0),
+    "submit_new": submit_body("Intel(R) Core(TM) i9-13900K CPU @ 3.00GHz", 80.0),
+}
+
+
+def fake_oauth(request: httpx.Request) -> httpx.Response:
+    """模拟 linux.do：code 即用户名"""
+    if request.url.path.endswith("/token"):
+        code = dict(httpx.QueryParams(request.content.decode()))["code"]
+        return httpx.Response(200, json={"access_token": f"token-{code}"})
+    username = request.headers["authorization"].rsplit("-", 1)[-1]
+    return httpx.Response(200, json={
+        "id": f"oauth-{username}", "username": username,
+        "avatar_template": "https://example.com/{size}.png"
+    })
+
+
+def login(client: TestClient, username: str) -> str:
+    client.cookies.clear()
+    response = client.post("/api/v1/auth/mock-login", json={"username": username})
+    response.raise_for_status()
+    return client.cookies.get("auth_token")
+
+
+def seed(client: TestClient) -> dict:
+    """alice 3 条记录、bob 1 条、carol 0 条"""
+    tokens, records = {}, {}
+    for username, count in (("alice", 3), ("bob", 1), ("carol", 0)):
+        tokens[username] = login(client, username)
+        for index in range(count):
+            response = client.post(f"{API}/submit", json=submit_body(CPU_MODELS[index % 2], 100.0 + index * 10))
+            response.raise_for_status()
+            records.setdefault(f"{username}_record", response.json()["data"]["id"])
+    client.cookies.clear()
+    return {"tokens": tokens, "records": records}
+
+
+def check_budgets(client: TestClient, budgets: list, data: dict, verbose: bool) -> int:
+    """逐个调用接口检查预算，返回未通过的接口数"""
+    failures = 0
+    for name, username, method, path, kwargs, expected_status, budget in budgets:
+        path = path.format(**data["records"])
+        if isinstance(kwargs.get("json"), str):
+            kwargs = {**kwargs, "json": REQUEST_BODIES[kwargs["json"]]}
+        client.cookies.clear()
+        if username:
+            client.cookies.set("auth_token", data["tokens"][username])
+        user_cache.clear()
+        leaderboard_cache.invalidate()
+
+        label = f"{name} {method} {path}"
+        try:
+            with query_budget(budget, label) as counter:
+                response = client.request(method, path, follow_redirects=False, **kwargs)
+        except QueryBudgetExceeded as e:
+            print(f"[ERROR] {e}")
+            failures += 1
+            continue
+
+        if response.status_code != expected_status:
+            print(f"[ERROR] {label}: 状态码 {response.status_code}，预期 {expected_status}: {response.text[:200]}")
+            failures += 1
+            continue
+        print(f"[OK] {label}: {counter.count}/{budget} 条 SQL")
+        if verbose:
+            for statement in counter.statements:
+                print(f"       {' '.join(statement.split())[:160]}")
+    return failures
+
+
+def check_fallback_budgets(client: TestClient, data: dict, verbose: bool) -> int:
+    """以排行榜索引未就绪的状态检查数据库查询路径"""
+    leaderboard_index.ready = False
+    try:
+        client.cookies.clear()
+        leaderboard_cache.invalidate()
+        response = client.get(f"{API}/leaderboard", params={"limit": 2})
+        response.raise_for_status()
+        data["records"]["cursor"] = response.json()["data"]["pagination"]["next_cursor"]
+        return check_budgets(client, FALLBACK_BUDGETS, data, verbose)
+    finally:
+        leaderboard_index.ready = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="接口 SQL 查询预算检查")
+    parser.add_argument("--verbose", action="store_true", help="输出每个接口执行的语句")
+    args = parser.parse_args()
+
+    check_database_exists()
+    import app_main
+
+    with TestClient(app_main.app) as client:
+        # 临时换成模拟 linux.do 的客户端，结束后恢复原客户端（由应用关闭）并关闭模拟客户端
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_oauth))
+        original_client, oauth_http_client._client = oauth_http_client._client, mock_client
+        try:
+            data = seed(client)
+            failures = check_budgets(client, BUDGETS, data, args.verbose)
+            failures += check_fallback_budgets(client, data, args.verbose)
+        finally:
+            oauth_http_client._client = original_client
+            client.portal.call(mock_client.aclose)
+
+    print(f"查询预算检查完成: {failures} 个接口未通过" if failures else "查询预算检查通过")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
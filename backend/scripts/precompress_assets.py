@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+前端构建产物预压缩
+
+为 dist 目录中的文本类文件生成同名 .gz（gzip 9 级）和 .br（brotli 11 级）文件，
+服务端按 Accept-Encoding 直接返回预压缩版本，请求时不再压缩（见 app/services/static_site.py）。
+已存在且比原文件新的压缩文件跳过；压缩后没有变小的文件不生成。
+
+使用方法（前端构建后，在项目根目录下）:
+    python backend/scripts/precompress_assets.py dist
+"""
+import argparse
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    # 未安装 brotli 时只生成 .gz
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".html", ".js", ".mjs", ".css", ".svg", ".json", ".txt", ".xml", ".map", ".ico"}
+
+
+def _compressors():
+    compressors = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def precompress(root: str, min_size: int = 1024) -> dict:
+    """
+    预压缩 root 下的文本类文件
+
+    Returns:
+        dict: files（处理的文件数）, written（生成的压缩文件数）, original / compressed（字节数）
+    """
+    stats = {"files": 0, "written": 0, "original": 0, "compressed": 0}
+    compressors = _compressors()
+
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(directory, filename)
+            source_stat = os.stat(path)
+            if source_stat.st_size < min_size:
+                continue
+
+            stats["files"] += 1
+            with open(path, "rb") as f:
+                data = f.read()
+            for suffix, compress in compressors.items():
+                target = path + suffix
+                if os.path.exists(target) and os.stat(target).st_mtime >= source_stat.st_mtime:
+                    continue
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, "wb") as f:
+                    f.write(compressed)
+                stats["written"] += 1
+                stats["original"] += len(data)
+                stats["compressed"] += len(compressed)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为前端构建产物生成 .gz / .br 预压缩文件")
+    parser.add_argument("root", nargs="?", default="dist", help="构建产物目录")
+    parser.add_argument("--min-size", type=int, default=1024, help="小于该字节数的文件不压缩")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"[ERROR] 目录不存在: {args.root}")
+        raise SystemExit(1)
+
+    result = precompress(args.root, args.min_size)
+    if brotli is None:
+        print("[INFO] 未安装 brotli，只生成 .gz 文件")
+    print(f"[OK] 预压缩完成: {result['files']} 个文件，生成 {result['written']} 个压缩文件，"
+          f"{result['original']} -> {result['compressed']} 字节")
@@ -167,6 +167,15 @@ class ApiService {
     return this.delete(`/benchmarks/${id}`)
   }
 
+  // 订阅排行榜实时变更（Server-Sent Events，浏览器断线后会自动重连）
+  subscribeLeaderboard(deviceType = null) {
+    let url = `${this.baseURL}${API_PREFIX}/benchmarks/stream`
+    if (deviceType) {
+      url += `?device_type=${deviceType}`
+    }
+    return new EventSource(url, { withCredentials: true })
+  }
+
   // 用户相关API
   async getUserProfile() {
     return this.get('/users/profile')